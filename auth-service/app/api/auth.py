@@ -137,3 +137,8 @@ async def update_user_role(
 @router.post("/users/by-ids", response_model=List[schemas.UserResponse])
 async def get_users_by_ids(ids: List[int], db: AsyncSession = Depends(get_db)):
   return await crud.get_users_by_telegram_ids(db, ids)
+
+@router.post("/users/by-uuids", response_model=List[schemas.UserResponse])
+async def get_users_by_uuids(ids: List[UUID], db: AsyncSession = Depends(get_db)):
+  """Пакетное получение пользователей по списку UUID"""
+  return await crud.get_users_by_ids(db, list(set(ids)))
@@ -68,27 +68,20 @@ async def create_role_switch_link(
                 frontend_url = os.getenv("FRONTEND_URL", "https://unseemly-adorable-razorbill.cloudpub.ru")
                 switch_url = f"{frontend_url}/role-switch/{token}"
 
-                # Формируем сообщение
-                title = "🎓 Приглашение стать преподавателем"
-                message = (
-                    f"Здравствуйте, {target_user.full_name}!\n\n"
-                    f"Ваша ссылка для того, чтобы стать преподавателем в нашей студии иностранных языков:\n"
-                    f"{switch_url}\n\n"
-                    f"Ссылка действительна для 1 перехода на страницу.\n"
-                    f"Срок действия: {link_data.expires_in_hours} {'час' if link_data.expires_in_hours == 1 else 'часов'}"
-                )
-
-                # Отправляем уведомление через RabbitMQ
+                # Текст собирает notifications-service по шаблону role_switch
                 notification_data = {
                     "chat_id": target_user.telegram_id,
-                    "title": title,
-                    "message": message,
                     "notification_type": "role_switch",
+                    "params": {
+                        "full_name": target_user.full_name,
+                        "switch_url": switch_url,
+                        "expires_in_hours": link_data.expires_in_hours
+                    },
                     "user_id": str(target_user.id),
                     "telegram_id": target_user.telegram_id
                 }
 
-                await rabbitmq_client.publish_notification(notification_data, routing_key="telegram")
+                await rabbitmq_client.publish_notification(notification_data, routing_key="notifications.templated")
                 logger.info(f"Role switch notification sent to user {target_user.telegram_id}")
         except Exception as e:
             # Логируем ошибку, но не прерываем создание ссылки
@@ -1,15 +1,12 @@
 import aio_pika
 import json
 import asyncio
-from typing import Any, Dict, Optional
+from typing import Any, Dict
 import logging
 import os
-import httpx
 
 logger = logging.getLogger(__name__)
 
-NOTIFICATIONS_SERVICE_URL = os.getenv("NOTIFICATIONS_SERVICE_URL", "http://notifications-service:8007")
-
 class RabbitMQClient:
     def __init__(self):
         self.connection = None
@@ -51,44 +48,11 @@ class RabbitMQClient:
                     logger.error("All connection attempts failed")
                     self.is_connected = False
 
-    async def _check_notification_enabled(self, user_id: Optional[str]) -> bool:
-        """Проверяет, включены ли уведомления для пользователя"""
-        if not user_id:
-            logger.warning(f"Empty user_id provided, skipping notification check")
-            return False
-            
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{NOTIFICATIONS_SERVICE_URL}/notifications/users/{user_id}/settings",
-                    timeout=5
-                )
-                if response.status_code == 200:
-                    settings = response.json()
-                    telegram_enabled = settings.get("telegram_enabled", True)
-                    logger.info(f"Notification check for user {user_id}: telegram_enabled={telegram_enabled}")
-                    return telegram_enabled
-                else:
-                    logger.warning(f"Could not get notification settings for user {user_id}, status={response.status_code}, defaulting to disabled")
-                    return False
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error checking notification settings for user {user_id}: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to check notification settings for user {user_id}: {e}")
-            return False
-
-    async def publish_notification(self, notification_data: Dict[str, Any], routing_key: str = "telegram", check_enabled: bool = True):
-        """Публикация уведомления в очередь с проверкой настроек"""
-        # Проверяем настройки уведомлений перед отправкой
-        if check_enabled:
-            user_id = notification_data.get("user_id")
-            if user_id:
-                notifications_enabled = await self._check_notification_enabled(str(user_id))
-                if not notifications_enabled:
-                    logger.info(f"Notifications disabled for user {user_id}, skipping notification publish")
-                    return False
-
+    async def publish_notification(self, notification_data: Dict[str, Any], routing_key: str = "telegram"):
+        """
+        Публикация уведомления в очередь. Настройки получателя (telegram_enabled) проверяет
+        notifications-service при обработке сообщения — издатель в другие сервисы не ходит
+        """
         if not self.is_connected:
             logger.warning("Cannot publish notification: not connected to RabbitMQ")
             # Пытаемся переподключиться
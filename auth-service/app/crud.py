@@ -5,6 +5,7 @@ from app.schemas import UserCreate
 from app.utils.config import settings
 import httpx
 from typing import List
+from uuid import UUID
 
 
 async def get_user_by_telegram_id(db: AsyncSession, telegram_id: int):
@@ -264,3 +265,12 @@ async def get_users_by_telegram_ids(db: AsyncSession, ids: List[int]) -> List[mo
     select(models.User).where(models.User.telegram_id.in_(ids))
   )
   return result.scalars().all()
+
+async def get_users_by_ids(db: AsyncSession, ids: List[UUID]) -> List[models.User]:
+  """Получить пользователей по списку UUID"""
+  if not ids:
+    return []
+  result = await db.execute(
+    select(models.User).where(models.User.id.in_(ids))
+  )
+  return result.scalars().all()
@@ -1,5 +1,5 @@
 from fastapi import FastAPI
-from app.database import AsyncSessionLocal
+from app.database import AsyncSessionLocal, pool_stats
 from app.api import role_switch, auth
 from app.core.rabbitmq import rabbitmq_client
 import asyncio
@@ -28,3 +28,8 @@ async def shutdown_event():
     """Закрытие соединения с RabbitMQ при остановке"""
     logger.info("Closing RabbitMQ connection...")
     await rabbitmq_client.close()
+
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Состояние пула соединений с базой"""
+    return pool_stats()
@@ -8,6 +8,15 @@ class Settings(BaseSettings):
   POSTGRES_PASSWORD: str
   POSTGRES_DB: str
   DB_HOST: str
+
+  # Пул соединений и логирование SQL (см. app/database.py)
+  DB_POOL_SIZE: int = 10
+  DB_MAX_OVERFLOW: int = 20
+  DB_POOL_PRE_PING: bool = True
+  DB_POOL_RECYCLE: int = 1800  # сек, -1 — не пересоздавать соединения
+  DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 — без ограничения
+  DB_ECHO: bool = False
+  DB_SLOW_QUERY_MS: int = 0  # порог лога медленных запросов, 0 — выключен
   ADMIN_TELEGRAM_IDS: str = ""  # Список telegram_id админов через запятую
 
   @property
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Header
 from app.core.auth import get_current_user
+from app.core.http_client import upstream_clients
 import httpx
 from typing import Optional
 
@@ -20,19 +21,19 @@ async def create_role_switch_link(
 
         token = authorization[7:]  # Убираем "Bearer "
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{AUTH_SERVICE_URL}/role/admin/role-switch-links",
-                json=link_data,
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        client = upstream_clients.get("auth")
+        response = await client.post(
+            f"{AUTH_SERVICE_URL}/role/admin/role-switch-links",
+            json=link_data,
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
-            if response.status_code == 403:
-                raise HTTPException(status_code=403, detail="Only admins can create role switch links")
-            elif response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code == 403:
+            raise HTTPException(status_code=403, detail="Only admins can create role switch links")
+        elif response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-            return response.json()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=502, detail=f"auth-service error: {str(e)}")
 
@@ -47,18 +48,18 @@ async def get_role_switch_links(
 
         token = authorization[7:]  # Убираем "Bearer "
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{AUTH_SERVICE_URL}/role/admin/role-switch-links",
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        client = upstream_clients.get("auth")
+        response = await client.get(
+            f"{AUTH_SERVICE_URL}/role/admin/role-switch-links",
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
-            if response.status_code == 403:
-                raise HTTPException(status_code=403, detail="Only admins can view role switch links")
-            elif response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code == 403:
+            raise HTTPException(status_code=403, detail="Only admins can view role switch links")
+        elif response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-            return response.json()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=502, detail=f"auth-service error: {str(e)}")
 
@@ -74,18 +75,18 @@ async def delete_role_switch_link(
 
         token = authorization[7:]  # Убираем "Bearer "
 
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"{AUTH_SERVICE_URL}/role/admin/role-switch-links/{link_id}",
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        client = upstream_clients.get("auth")
+        response = await client.delete(
+            f"{AUTH_SERVICE_URL}/role/admin/role-switch-links/{link_id}",
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
-            if response.status_code == 403:
-                raise HTTPException(status_code=403, detail="Only admins can delete role switch links")
-            elif response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code == 403:
+            raise HTTPException(status_code=403, detail="Only admins can delete role switch links")
+        elif response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-            return response.json()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=502, detail=f"auth-service error: {str(e)}")
 
@@ -101,18 +102,18 @@ async def deactivate_role_switch_link(
 
         token = authorization[7:]  # Убираем "Bearer "
 
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(
-                f"{AUTH_SERVICE_URL}/role/admin/role-switch-links/{link_id}/deactivate",
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        client = upstream_clients.get("auth")
+        response = await client.patch(
+            f"{AUTH_SERVICE_URL}/role/admin/role-switch-links/{link_id}/deactivate",
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
-            if response.status_code == 403:
-                raise HTTPException(status_code=403, detail="Only admins can deactivate role switch links")
-            elif response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code == 403:
+            raise HTTPException(status_code=403, detail="Only admins can deactivate role switch links")
+        elif response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-            return response.json()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=502, detail=f"auth-service error: {str(e)}")
 
@@ -122,16 +123,16 @@ async def switch_role(
 ):
     """Переключает роль пользователя по токену ссылки"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{AUTH_SERVICE_URL}/role/role-switch",
-                json=switch_data
-            )
+        client = upstream_clients.get("auth")
+        response = await client.post(
+            f"{AUTH_SERVICE_URL}/role/role-switch",
+            json=switch_data
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-            return response.json()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=502, detail=f"auth-service error: {str(e)}")
 
@@ -139,15 +140,15 @@ async def switch_role(
 async def validate_role_switch_link(token: str):
     """Проверяет валидность ссылки для переключения роли"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{AUTH_SERVICE_URL}/role/role-switch/validate/{token}"
-            )
+        client = upstream_clients.get("auth")
+        response = await client.get(
+            f"{AUTH_SERVICE_URL}/role/role-switch/validate/{token}"
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-            return response.json()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=502, detail=f"auth-service error: {str(e)}")
 
@@ -163,18 +164,18 @@ async def switch_user_role(
 
         token = authorization[7:]  # Убираем "Bearer "
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{AUTH_SERVICE_URL}/role/admin/switch-user-role",
-                json=switch_data,
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        client = upstream_clients.get("auth")
+        response = await client.post(
+            f"{AUTH_SERVICE_URL}/role/admin/switch-user-role",
+            json=switch_data,
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
-            if response.status_code == 403:
-                raise HTTPException(status_code=403, detail="Only admins can switch user roles")
-            elif response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code == 403:
+            raise HTTPException(status_code=403, detail="Only admins can switch user roles")
+        elif response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-            return response.json()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=502, detail=f"auth-service error: {str(e)}")
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Header
 from app.core.auth import get_current_user
+from app.core.http_client import upstream_clients
 from app.schemas.telegram import TelegramMiniAppPayload
 from app.services.auth_service import login_or_register, login_user, get_user_by_token, get_user_by_id
 from app.services.student_service import create_student_if_not_exists
@@ -80,24 +81,24 @@ async def get_users(
 
         token = authorization[7:]  # Убираем "Bearer "
 
-        async with httpx.AsyncClient() as client:
-            url = f"{AUTH_SERVICE_URL}/auth/users"
-            if role:
-                url += f"?role={role}"
+        client = upstream_clients.get("auth")
+        url = f"{AUTH_SERVICE_URL}/auth/users"
+        if role:
+            url += f"?role={role}"
 
-            response = await client.get(
-                url,
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        response = await client.get(
+            url,
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
-            if response.status_code == 401:
-                raise HTTPException(status_code=401, detail="Invalid or expired token")
-            elif response.status_code == 403:
-                raise HTTPException(status_code=403, detail="Only admins can view users")
-            elif response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code == 401:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        elif response.status_code == 403:
+            raise HTTPException(status_code=403, detail="Only admins can view users")
+        elif response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-            return response.json()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=502, detail=f"auth-service error: {str(e)}")
     except HTTPException:
@@ -117,19 +118,19 @@ async def update_profile(
 
         token = authorization[7:]  # Убираем "Bearer "
 
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                f"{AUTH_SERVICE_URL}/auth/update-profile",
-                json=profile_data,
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        client = upstream_clients.get("auth")
+        response = await client.put(
+            f"{AUTH_SERVICE_URL}/auth/update-profile",
+            json=profile_data,
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
-            if response.status_code == 401:
-                raise HTTPException(status_code=401, detail="Invalid or expired token")
-            elif response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code == 401:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        elif response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-            return response.json()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=502, detail=f"auth-service error: {str(e)}")
     except HTTPException:
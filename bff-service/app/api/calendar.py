@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from typing import List
 from datetime import date, datetime, timedelta
-from dateutil.parser import isoparse
-from collections import defaultdict
 import httpx
 
 from ..schemas import calendar as schemas
 from ..core.auth import get_current_user_telegram_id
+from ..core.http_client import upstream_clients
+from ..core.aggregation import Branch, gather_branches
+from ..core.calendar_snapshots import calendar_snapshots
+from ..core.calendar_grid import build_calendar_days
 
 router = APIRouter()
 
@@ -15,6 +17,12 @@ LESSONS_SERVICE_URL = "http://lessons-service:8008"
 GROUPS_SERVICE_URL = "http://groups-service:8005"
 AUTH_SERVICE_URL = "http://auth-service:8002"
 
+# Таймауты веток параллельной агрегации (сек)
+UPSTREAM_TIMEOUT = 10
+NAMES_TIMEOUT = 5
+# Сколько дней (end - start) calendary-service /effective-days отдает за один запрос
+EFFECTIVE_DAYS_CHUNK = 62
+
 # ---------- Teacher Weekly Schedule ----------
 @router.post("/teacher-schedule", response_model=schemas.TeacherScheduleResponse)
 async def create_teacher_schedule_bff(
@@ -25,19 +33,20 @@ async def create_teacher_schedule_bff(
     if not current_user_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule",
-                json=schedule.dict(),
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
+    client = upstream_clients.get("calendary")
+    try:
+        response = await client.post(
+            f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule",
+            json=schedule.dict(),
+            timeout=10
+        )
+        response.raise_for_status()
+        await calendar_snapshots.invalidate_weekday(schedule.teacher_telegram_id, schedule.day_of_week)
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
 
 
 @router.get("/teacher-schedule/{teacher_telegram_id}", response_model=List[schemas.TeacherScheduleResponse])
@@ -49,18 +58,18 @@ async def get_teacher_schedules_bff(
     if not current_user_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule/{teacher_telegram_id}",
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
+    client = upstream_clients.get("calendary")
+    try:
+        response = await client.get(
+            f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule/{teacher_telegram_id}",
+            timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
 
 
 @router.get("/teacher-schedule/{teacher_telegram_id}/{day_of_week}", response_model=schemas.TeacherScheduleResponse)
@@ -73,20 +82,20 @@ async def get_teacher_schedule_bff(
     if not current_user_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule/{teacher_telegram_id}/{day_of_week}",
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Schedule not found")
-            raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
+    client = upstream_clients.get("calendary")
+    try:
+        response = await client.get(
+            f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule/{teacher_telegram_id}/{day_of_week}",
+            timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
 
 
 @router.put("/teacher-schedule/{teacher_telegram_id}/{day_of_week}", response_model=schemas.TeacherScheduleResponse)
@@ -100,21 +109,22 @@ async def update_teacher_schedule_bff(
     if not current_user_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.put(
-                f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule/{teacher_telegram_id}/{day_of_week}",
-                json=schedule_update.dict(exclude_unset=True),
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Schedule not found")
-            raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
+    client = upstream_clients.get("calendary")
+    try:
+        response = await client.put(
+            f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule/{teacher_telegram_id}/{day_of_week}",
+            json=schedule_update.dict(exclude_unset=True),
+            timeout=10
+        )
+        response.raise_for_status()
+        await calendar_snapshots.invalidate_weekday(teacher_telegram_id, day_of_week)
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
 
 
 # ---------- Teacher Special Day ----------
@@ -131,19 +141,20 @@ async def create_teacher_special_day_bff(
     if isinstance(payload.get("date"), (date, datetime)):
         payload["date"] = payload["date"].isoformat()
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{CALENDARY_SERVICE_URL}/calendary/teacher-special-day",
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
+    client = upstream_clients.get("calendary")
+    try:
+        response = await client.post(
+            f"{CALENDARY_SERVICE_URL}/calendary/teacher-special-day",
+            json=payload,
+            timeout=10
+        )
+        response.raise_for_status()
+        await calendar_snapshots.invalidate_days(special_day.teacher_telegram_id, [special_day.date])
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
 
 
 @router.get("/teacher-special-day/{teacher_telegram_id}", response_model=List[schemas.TeacherSpecialDayResponse])
@@ -157,22 +168,56 @@ async def get_teacher_special_days_bff(
     if not current_user_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{CALENDARY_SERVICE_URL}/calendary/teacher-special-day/{teacher_telegram_id}",
-                params={"start": start, "end": end},
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
+    client = upstream_clients.get("calendary")
+    try:
+        response = await client.get(
+            f"{CALENDARY_SERVICE_URL}/calendary/teacher-special-day/{teacher_telegram_id}",
+            params={"start": start, "end": end},
+            timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
 
 
 # ---------- Full Schedule ----------
+async def _fetch_student_names(client: httpx.AsyncClient, student_ids: set) -> dict:
+    """Имена студентов одним запросом к auth-service: {uuid: full_name}"""
+    if not student_ids:
+        return {}
+    try:
+        resp = await client.post(
+            f"{AUTH_SERVICE_URL}/auth/users/by-uuids",
+            json=list(student_ids),
+            timeout=5
+        )
+        if resp.status_code != 200:
+            return {}
+        return {str(u["id"]): u.get("full_name") or "" for u in resp.json()}
+    except Exception:
+        return {}
+
+
+async def _fetch_group_names(client: httpx.AsyncClient, group_ids: set) -> dict:
+    """Названия групп одним запросом к groups-service: {group_id: name}"""
+    if not group_ids:
+        return {}
+    try:
+        resp = await client.post(
+            f"{GROUPS_SERVICE_URL}/groups/by-ids",
+            json=[int(g) for g in group_ids],
+            timeout=5
+        )
+        if resp.status_code != 200:
+            return {}
+        return {str(g["id"]): g.get("name") or "" for g in resp.json()}
+    except Exception:
+        return {}
+
+
 @router.post("/teacher-schedule/{teacher_telegram_id}/full", response_model=schemas.CalendarResponse)
 async def get_teacher_full_schedule_bff(
     teacher_telegram_id: str,
@@ -183,172 +228,127 @@ async def get_teacher_full_schedule_bff(
     if not current_user_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    async with httpx.AsyncClient() as client:
-        # --- 1. Календарь из calendary-service ---
+    teacher_id = int(teacher_telegram_id)
+
+    # Готовые дни — одним чтением из снимков, собираем только недостающий отрезок
+    dates = [(req.start + timedelta(days=i)).isoformat() for i in range((req.end - req.start).days + 1)]
+    snapshot = await calendar_snapshots.get_range(teacher_id, req.start, req.end)
+    days_by_date = snapshot["days"]
+    missing = [d for d in dates if d not in days_by_date]
+    if missing:
+        built = await _build_calendar_days(teacher_id, date.fromisoformat(missing[0]), date.fromisoformat(missing[-1]))
+        await calendar_snapshots.put_days(teacher_id, built, snapshot["generation"])
+        days_by_date.update({day["date"].isoformat(): day for day in built})
+
+    return schemas.CalendarResponse(
+        teacher_telegram_id=teacher_id,
+        days=[days_by_date[d] for d in dates]
+    )
+
+
+async def _build_calendar_days(teacher_telegram_id: int, start: date, end: date) -> list:
+    """Собирает дни календаря из calendary-service и lessons-service"""
+    calendary_client = upstream_clients.get("calendary")
+    lessons_client = upstream_clients.get("lessons")
+    auth_client = upstream_clients.get("auth")
+    groups_client = upstream_clients.get("groups")
+
+    # --- 1. Рабочие окна по дням из calendary-service (разовые дни и недоступность учтены там) ---
+    async def fetch_effective_days(chunk_start: date, chunk_end: date):
         try:
-            response = await client.post(
-                f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule/{teacher_telegram_id}/full",
-                json={"start": req.start.isoformat(), "end": req.end.isoformat()},
+            response = await calendary_client.get(
+                f"{CALENDARY_SERVICE_URL}/calendary/teacher/{teacher_telegram_id}/effective-days",
+                params={"start": chunk_start.isoformat(), "end": chunk_end.isoformat()},
                 timeout=10
             )
             response.raise_for_status()
-            data = response.json()
+            return response.json()
         except httpx.HTTPStatusError as e:
             raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
         except Exception as e:
             raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
 
-        # --- 2. Сессии из lessons-service ---
+    async def fetch_calendar():
+        # calendary-service отдает не больше EFFECTIVE_DAYS_CHUNK дней за запрос — длинный диапазон по частям
+        chunks = []
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=EFFECTIVE_DAYS_CHUNK), end)
+            chunks.append(Branch(chunk_start.isoformat(), fetch_effective_days(chunk_start, chunk_end)))
+            chunk_start = chunk_end + timedelta(days=1)
+        parts = await gather_branches(*chunks)
+        return [day for part in parts.values() for day in part]
+
+    # --- 2. Сессии из lessons-service ---
+    async def fetch_sessions():
         try:
-            lessons_resp = await client.post(
+            lessons_resp = await lessons_client.post(
                 f"{LESSONS_SERVICE_URL}/lessons/sessions/by-teacher",
                 json={
-                    "teacher_telegram_id": int(teacher_telegram_id),
-                    "start": req.start.isoformat(),
-                    "end": req.end.isoformat()
+                    "teacher_telegram_id": teacher_telegram_id,
+                    "start": start.isoformat(),
+                    "end": end.isoformat()
                 },
                 timeout=10
             )
             lessons_resp.raise_for_status()
-            sessions = lessons_resp.json()
+            return lessons_resp.json()
         except httpx.HTTPStatusError as e:
             raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
         except Exception as e:
             raise HTTPException(status_code=502, detail=f"Lessons service error: {str(e)}")
 
-        # --- 3. Подтягиваем имена студентов / групп ---
-        for s in sessions:
-            booked_by = s.get("booked_by")
-            if not booked_by:
-                continue
-
-            try:
-                if booked_by.get("type") == "student" and booked_by.get("id"):
-                    resp = await client.get(f"{AUTH_SERVICE_URL}/auth/user-by-uuid/{booked_by['id']}", timeout=5)
-                    if resp.status_code == 200:
-                        student = resp.json()
-                        s["booked_by"]["name"] = student.get("full_name")
-                    else:
-                        s["booked_by"]["name"] = ""
-
-                elif booked_by.get("type") == "group" and booked_by.get("id"):
-                    resp = await client.get(f"{GROUPS_SERVICE_URL}/groups/{booked_by['id']}", timeout=5)
-                    if resp.status_code == 200:
-                        group = resp.json()
-                        s["booked_by"]["name"] = group.get("group_name")
-                    else:
-                        s["booked_by"]["name"] = ""
-            except Exception as e:
-                s["booked_by"]["name"] = ""
-
-    # --- 4. Сортируем и собираем по дням ---
-    sessions_by_date: dict[str, list] = defaultdict(list)
+    # Календарь и сессии независимы — запрашиваем параллельно
+    results = await gather_branches(
+        Branch("calendary", fetch_calendar(), timeout=UPSTREAM_TIMEOUT),
+        Branch("lessons", fetch_sessions(), timeout=UPSTREAM_TIMEOUT),
+    )
+    effective_days = results["calendary"]
+    sessions = results["lessons"]
+
+    # --- 3. Подтягиваем имена студентов / групп (два пакетных запроса) ---
+    student_ids = set()
+    group_ids = set()
     for s in sessions:
-        if not s.get("start_time"):
-            continue
-        try:
-            start_dt = isoparse(s["start_time"])
-        except Exception:
+        booked_by = s.get("booked_by")
+        if not booked_by or not booked_by.get("id"):
             continue
-        day_key = start_dt.date().isoformat()
-
-        session_obj = {
-            "id": s.get("id"),
-            "lesson_id": s.get("lesson_id"),
-            "start_time": s.get("start_time"),
-            "end_time": s.get("end_time"),
-            "status": s.get("status"),
-            "booked": s.get("booked", False),
-            "booked_by": s.get("booked_by"),
-            "lesson": s.get("lesson"),
-        }
-        sessions_by_date[day_key].append(session_obj)
-
-    for dk in sessions_by_date:
-        sessions_by_date[dk].sort(key=lambda x: isoparse(x["start_time"]))
-
-    # --- 5. Генерим календарь по дням ---
-    days = []
-    start_date = req.start
-    end_date = req.end
-    delta = end_date - start_date
-
-    weekly_schedules = data.get("weekly_schedules", [])
-    special_days = {sd["date"]: sd for sd in data.get("special_days", [])}
-    unavailable_periods = data.get("unavailable_periods", [])
-
-    for i in range(delta.days + 1):
-        day_date = start_date + timedelta(days=i)
-        day_iso = day_date.isoformat()
-        day_of_week = day_date.weekday()
-
-        if day_iso in special_days:
-            sd = special_days[day_iso]
-            is_active = bool(sd.get("is_active", True))
-            start_time = sd.get("start_time")
-            end_time = sd.get("end_time")
-        else:
-            schedule_for_weekday = next((s for s in weekly_schedules if s["day_of_week"] == day_of_week), None)
-            if schedule_for_weekday:
-                is_active = bool(schedule_for_weekday.get("is_available", False))
-                start_time = schedule_for_weekday.get("start_time")
-                end_time = schedule_for_weekday.get("end_time")
-            else:
-                is_active = False
-                start_time = None
-                end_time = None
-
-        for up in unavailable_periods:
-            try:
-                up_start = isoparse(up["start_time"]).date()
-                up_end = isoparse(up["end_time"]).date()
-                if up_start <= day_date <= up_end:
-                    is_active = False
-            except Exception:
-                continue
-
-        lessons: list = []
-
-        # special days with booked/unavailable
-        if day_iso in special_days:
-            for b in special_days[day_iso].get("booked_slots", []):
-                if isinstance(b, dict):
-                    lessons.append(b)
-                elif isinstance(b, str):
-                    try:
-                        start_str, end_str = b.split("-")
-                        start_iso = f"{day_iso}T{start_str}:00+00:00"
-                        end_iso = f"{day_iso}T{end_str}:00+00:00"
-                        placeholder = {
-                            "id": None,
-                            "lesson_id": None,
-                            "start_time": start_iso,
-                            "end_time": end_iso,
-                            "status": "UNAVAILABLE",
-                            "lesson": None
-                        }
-                        lessons.append(placeholder)
-                    except Exception:
-                        continue
-
-        if day_iso in sessions_by_date:
-            lessons.extend(sessions_by_date[day_iso])
-
-        days.append({
-            "date": day_date,
-            "is_active": is_active,
-            "start_time": start_time,
-            "end_time": end_time,
-            "lessons": lessons
-        })
-    print(days)
-    return schemas.CalendarResponse(
-        teacher_telegram_id=int(teacher_telegram_id),
-        days=days
+        if booked_by.get("type") == "student":
+            student_ids.add(str(booked_by["id"]))
+        elif booked_by.get("type") == "group":
+            group_ids.add(str(booked_by["id"]))
+
+    names = await gather_branches(
+        Branch("students", _fetch_student_names(auth_client, student_ids),
+               timeout=NAMES_TIMEOUT, required=False, default={}),
+        Branch("groups", _fetch_group_names(groups_client, group_ids),
+               timeout=NAMES_TIMEOUT, required=False, default={}),
     )
+    student_names = names["students"]
+    group_names = names["groups"]
+
+    for s in sessions:
+        booked_by = s.get("booked_by")
+        if not booked_by:
+            continue
+        if booked_by.get("type") == "student":
+            booked_by["name"] = student_names.get(str(booked_by.get("id")), "")
+        elif booked_by.get("type") == "group":
+            booked_by["name"] = group_names.get(str(booked_by.get("id")), "")
+
+    # --- 4. Собираем дни календаря ---
+    return build_calendar_days(start, end, effective_days, sessions)
 
 
 # ---------- Teacher Special Day (update, delete) ----------
+async def _invalidate_special_day(special_day: dict):
+    """Сбрасывает снимок дня по ответу calendary-service (teacher_telegram_id и date)"""
+    if special_day.get("teacher_telegram_id") and special_day.get("date"):
+        await calendar_snapshots.invalidate_days(
+            int(special_day["teacher_telegram_id"]), [date.fromisoformat(str(special_day["date"]))]
+        )
+
+
 @router.put("/teacher-special-day/{special_day_id}", response_model=schemas.TeacherSpecialDayResponse)
 async def update_teacher_special_day_bff(
     special_day_id: int,
@@ -359,21 +359,23 @@ async def update_teacher_special_day_bff(
     if not current_user_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.put(
-                f"{CALENDARY_SERVICE_URL}/calendary/teacher-special-day/{special_day_id}",
-                json=special_day_update.dict(exclude_unset=True),
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Special day not found")
-            raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
+    client = upstream_clients.get("calendary")
+    try:
+        response = await client.put(
+            f"{CALENDARY_SERVICE_URL}/calendary/teacher-special-day/{special_day_id}",
+            json=special_day_update.dict(exclude_unset=True),
+            timeout=10
+        )
+        response.raise_for_status()
+        result = response.json()
+        await _invalidate_special_day(result)
+        return result
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Special day not found")
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
 
 
 @router.delete("/teacher-special-day/{special_day_id}", response_model=dict)
@@ -385,17 +387,19 @@ async def delete_teacher_special_day_bff(
     if not current_user_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.delete(
-                f"{CALENDARY_SERVICE_URL}/calendary/teacher-special-day/{special_day_id}",
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Special day not found")
-            raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
+    client = upstream_clients.get("calendary")
+    try:
+        response = await client.delete(
+            f"{CALENDARY_SERVICE_URL}/calendary/teacher-special-day/{special_day_id}",
+            timeout=10
+        )
+        response.raise_for_status()
+        result = response.json()
+        await _invalidate_special_day(result)
+        return result
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Special day not found")
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Calendar service error: {str(e)}")
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from app.core.auth import get_current_user
+from app.core.http_client import upstream_clients
 from app.schemas.language import StudioLanguageCreate, StudioLanguageUpdate, StudioLanguageRead
 from typing import List
 import httpx
@@ -14,16 +15,16 @@ async def get_languages(
 ):
   """Получить список языков студии"""
   try:
-    async with httpx.AsyncClient() as client:
-      response = await client.get(
-        f"{TEACHERS_SERVICE_URL}",
-        params={"active_only": active_only},
-        timeout=10
-      )
-      if response.status_code != 200:
-        error_text = response.text
-        raise HTTPException(status_code=response.status_code, detail=error_text)
-      return response.json()
+    client = upstream_clients.get("teachers")
+    response = await client.get(
+      f"{TEACHERS_SERVICE_URL}",
+      params={"active_only": active_only},
+      timeout=10
+    )
+    if response.status_code != 200:
+      error_text = response.text
+      raise HTTPException(status_code=response.status_code, detail=error_text)
+    return response.json()
   except Exception as e:
     raise HTTPException(status_code=502, detail=f"teachers-service error: {str(e)}")
 
@@ -31,13 +32,13 @@ async def get_languages(
 async def get_language(language_id: int):
   """Получить язык по ID"""
   try:
-    async with httpx.AsyncClient() as client:
-      response = await client.get(
-        f"{TEACHERS_SERVICE_URL}/{language_id}",
-        timeout=10
-      )
-      response.raise_for_status()
-      return response.json()
+    client = upstream_clients.get("teachers")
+    response = await client.get(
+      f"{TEACHERS_SERVICE_URL}/{language_id}",
+      timeout=10
+    )
+    response.raise_for_status()
+    return response.json()
   except httpx.HTTPStatusError as e:
     try:
       error_data = e.response.json()
@@ -62,16 +63,16 @@ async def create_language(
 ):
   """Создать новый язык (доступно всем авторизованным пользователям)"""
   try:
-    async with httpx.AsyncClient() as client:
-      response = await client.post(
-        f"{TEACHERS_SERVICE_URL}",
-        json=language.dict(),
-        timeout=10
-      )
-      if response.status_code != 201:
-        error_text = response.text
-        raise HTTPException(status_code=response.status_code, detail=error_text)
-      return response.json()
+    client = upstream_clients.get("teachers")
+    response = await client.post(
+      f"{TEACHERS_SERVICE_URL}",
+      json=language.dict(),
+      timeout=10
+    )
+    if response.status_code != 201:
+      error_text = response.text
+      raise HTTPException(status_code=response.status_code, detail=error_text)
+    return response.json()
   except Exception as e:
     raise HTTPException(status_code=502, detail=f"teachers-service error: {str(e)}")
 
@@ -87,16 +88,16 @@ async def update_language(
     raise HTTPException(status_code=403, detail="Недостаточно прав для обновления языка")
 
   try:
-    async with httpx.AsyncClient() as client:
-      response = await client.put(
-        f"{TEACHERS_SERVICE_URL}/{language_id}",
-        json=language_update.dict(exclude_unset=True),
-        timeout=10
-      )
-      if response.status_code != 200:
-        error_text = response.text
-        raise HTTPException(status_code=response.status_code, detail=error_text)
-      return response.json()
+    client = upstream_clients.get("teachers")
+    response = await client.put(
+      f"{TEACHERS_SERVICE_URL}/{language_id}",
+      json=language_update.dict(exclude_unset=True),
+      timeout=10
+    )
+    if response.status_code != 200:
+      error_text = response.text
+      raise HTTPException(status_code=response.status_code, detail=error_text)
+    return response.json()
   except Exception as e:
     raise HTTPException(status_code=502, detail=f"teachers-service error: {str(e)}")
 
@@ -111,15 +112,15 @@ async def delete_language(
     raise HTTPException(status_code=403, detail="Недостаточно прав для удаления языка")
 
   try:
-    async with httpx.AsyncClient() as client:
-      response = await client.delete(
-        f"{TEACHERS_SERVICE_URL}/{language_id}",
-        timeout=10
-      )
-      if response.status_code != 204:
-        error_text = response.text
-        raise HTTPException(status_code=response.status_code, detail=error_text)
-      return None
+    client = upstream_clients.get("teachers")
+    response = await client.delete(
+      f"{TEACHERS_SERVICE_URL}/{language_id}",
+      timeout=10
+    )
+    if response.status_code != 204:
+      error_text = response.text
+      raise HTTPException(status_code=response.status_code, detail=error_text)
+    return None
   except Exception as e:
     raise HTTPException(status_code=502, detail=f"teachers-service error: {str(e)}")
 
@@ -7,6 +7,7 @@ from uuid import UUID
 
 from ..schemas import lessons
 from ..core.auth import get_current_user_telegram_id
+from ..core.http_client import upstream_clients
 
 router = APIRouter()
 LESSONS_SERVICE_URL = "http://lessons-service:8008"
@@ -21,42 +22,92 @@ async def create_lesson_bff(lesson: lessons.LessonCreate, authorization: str = H
   if lesson.teacher_telegram_id != teacher_id:
     raise HTTPException(403, "Can only create lessons for yourself")
 
-  async with httpx.AsyncClient() as client:
-    resp = await client.post(f"{LESSONS_SERVICE_URL}/lessons", json=lesson.dict(), timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.post(f"{LESSONS_SERVICE_URL}/lessons", json=lesson.dict(), timeout=10)
+  resp.raise_for_status()
+  return resp.json()
+
+
+# ---------------- FREE SLOTS ----------------
+# Объявлен до "/{lesson_id}", иначе путь перехватывается роутом урока
+@router.get("/free-slots", response_model=lessons.FreeSlotsResponse)
+async def free_slots_bff(
+  teacher_telegram_id: int,
+  the_date: Optional[date] = Query(None),
+  date_from: Optional[date] = Query(None, alias="from"),
+  date_to: Optional[date] = Query(None, alias="to"),
+  slot_minutes: Optional[int] = Query(None),
+  step_minutes: Optional[int] = Query(None),
+  buffer_minutes: Optional[int] = Query(None),
+  authorization: str = Header(None)
+):
+  await get_current_user_telegram_id(authorization)
+  params = {
+    "teacher_telegram_id": teacher_telegram_id,
+    "the_date": the_date.isoformat() if the_date else None,
+    "from": date_from.isoformat() if date_from else None,
+    "to": date_to.isoformat() if date_to else None,
+    "slot_minutes": slot_minutes,
+    "step_minutes": step_minutes,
+    "buffer_minutes": buffer_minutes,
+  }
+  client = upstream_clients.get("lessons")
+  resp = await client.get(
+    f"{LESSONS_SERVICE_URL}/lessons/free-slots",
+    params={k: v for k, v in params.items() if v is not None},
+    timeout=10
+  )
+  if resp.status_code == 400:
+    raise HTTPException(400, resp.json().get("detail"))
+  resp.raise_for_status()
+  return resp.json()
+
+
+@router.post("/availability/search", response_model=List[lessons.TeacherAvailability])
+async def search_availability_bff(req: lessons.AvailabilitySearchRequest, authorization: str = Header(None)):
+  await get_current_user_telegram_id(authorization)
+  client = upstream_clients.get("lessons")
+  resp = await client.post(
+    f"{LESSONS_SERVICE_URL}/lessons/availability/search",
+    json=jsonable_encoder(req, exclude_none=True),
+    timeout=20
+  )
+  if resp.status_code in (400, 422):
+    raise HTTPException(resp.status_code, resp.json().get("detail"))
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.get("/{lesson_id}", response_model=lessons.LessonResponse)
 async def get_lesson_bff(lesson_id: int, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    try:
-      resp = await client.get(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}", timeout=10)
-      resp.raise_for_status()
-      return resp.json()
-    except httpx.HTTPStatusError as e:
-      if e.response.status_code == 404:
-        raise HTTPException(404, "Lesson not found")
-      raise HTTPException(e.response.status_code, e.response.text)
+  client = upstream_clients.get("lessons")
+  try:
+    resp = await client.get(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}", timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+  except httpx.HTTPStatusError as e:
+    if e.response.status_code == 404:
+      raise HTTPException(404, "Lesson not found")
+    raise HTTPException(e.response.status_code, e.response.text)
 
 
 @router.put("/{lesson_id}", response_model=lessons.LessonResponse)
 async def update_lesson_bff(lesson_id: int, lesson_update: lessons.LessonUpdate, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.put(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}", json=lesson_update.dict(exclude_unset=True), timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.put(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}", json=lesson_update.dict(exclude_unset=True), timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.delete("/{lesson_id}", response_model=dict)
 async def delete_lesson_bff(lesson_id: int, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.delete(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}", timeout=10)
-    resp.raise_for_status()
-    return {"detail": "Lesson deleted"}
+  client = upstream_clients.get("lessons")
+  resp = await client.delete(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}", timeout=10)
+  resp.raise_for_status()
+  return {"detail": "Lesson deleted"}
 
 
 @router.get("", response_model=List[lessons.LessonResponse])
@@ -68,29 +119,29 @@ async def list_lessons_bff(
 ):
   await get_current_user_telegram_id(authorization)
   params = {k: v for k, v in {"language": language, "level": level, "teacher_id": teacher_id}.items() if v is not None}
-  async with httpx.AsyncClient() as client:
-    resp = await client.get(f"{LESSONS_SERVICE_URL}/lessons", params=params, timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.get(f"{LESSONS_SERVICE_URL}/lessons", params=params, timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 # ---------------- LESSON SESSIONS ----------------
 @router.post("/sessions", response_model=lessons.LessonSessionResponse)
 async def create_session_bff(session: lessons.LessonSessionCreate, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.post(f"{LESSONS_SERVICE_URL}/sessions", json=session.dict(), timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.post(f"{LESSONS_SERVICE_URL}/sessions", json=session.dict(), timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.get("/sessions/{session_id}", response_model=lessons.LessonSessionResponse)
 async def get_session_bff(session_id: int, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.get(f"{LESSONS_SERVICE_URL}/sessions/{session_id}", timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.get(f"{LESSONS_SERVICE_URL}/sessions/{session_id}", timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.get("/sessions/by-teacher", response_model=List[lessons.LessonSessionResponse])
@@ -102,93 +153,75 @@ async def list_sessions_by_teacher_bff(
 ):
   await get_current_user_telegram_id(authorization)
   params = {"teacher_telegram_id": teacher_telegram_id, "start": start.isoformat(), "end": end.isoformat()}
-  async with httpx.AsyncClient() as client:
-    resp = await client.get(f"{LESSONS_SERVICE_URL}/sessions/by-teacher", params=params, timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.get(f"{LESSONS_SERVICE_URL}/sessions/by-teacher", params=params, timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.put("/sessions/{session_id}", response_model=lessons.LessonSessionResponse)
 async def update_session_bff(session_id: int, session_update: lessons.LessonSessionUpdate, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.put(f"{LESSONS_SERVICE_URL}/sessions/{session_id}", json=session_update.dict(exclude_unset=True), timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.put(f"{LESSONS_SERVICE_URL}/sessions/{session_id}", json=session_update.dict(exclude_unset=True), timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.delete("/sessions/{session_id}", status_code=204)
 async def delete_session_bff(session_id: int, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.delete(f"{LESSONS_SERVICE_URL}/sessions/{session_id}", timeout=10)
-    resp.raise_for_status()
-    return None
+  client = upstream_clients.get("lessons")
+  resp = await client.delete(f"{LESSONS_SERVICE_URL}/sessions/{session_id}", timeout=10)
+  resp.raise_for_status()
+  return None
 
 
 # ---------------- PARTICIPANTS ----------------
 @router.post("/participants", response_model=lessons.LessonParticipantResponse)
 async def add_participant_bff(payload: lessons.LessonParticipantCreate, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.post(f"{LESSONS_SERVICE_URL}/participants", json=payload.dict(), timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.post(f"{LESSONS_SERVICE_URL}/participants", json=payload.dict(), timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.put("/participants/{participant_id}", response_model=lessons.LessonParticipantResponse)
 async def set_participant_confirmation_bff(participant_id: int, confirmed: bool, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.put(f"{LESSONS_SERVICE_URL}/participants/{participant_id}?confirmed={confirmed}", timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.put(f"{LESSONS_SERVICE_URL}/participants/{participant_id}?confirmed={confirmed}", timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.delete("/participants/{participant_id}", status_code=204)
 async def remove_participant_bff(participant_id: int, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.delete(f"{LESSONS_SERVICE_URL}/participants/{participant_id}", timeout=10)
-    resp.raise_for_status()
-    return None
+  client = upstream_clients.get("lessons")
+  resp = await client.delete(f"{LESSONS_SERVICE_URL}/participants/{participant_id}", timeout=10)
+  resp.raise_for_status()
+  return None
 
 
 # ---------------- ATTENDANCE ----------------
 @router.post("/attendance", response_model=lessons.LessonAttendanceResponse)
 async def add_attendance_bff(payload: lessons.LessonAttendanceCreate, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.post(f"{LESSONS_SERVICE_URL}/attendance", json=payload.dict(), timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.post(f"{LESSONS_SERVICE_URL}/attendance", json=payload.dict(), timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.get("/attendance/{lesson_id}", response_model=List[lessons.LessonAttendanceResponse])
 async def list_attendance_bff(lesson_id: int, authorization: str = Header(None)):
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.get(f"{LESSONS_SERVICE_URL}/attendance/{lesson_id}", timeout=10)
-    resp.raise_for_status()
-    return resp.json()
-
-
-# ---------------- FREE SLOTS ----------------
-@router.get("/free-slots", response_model=lessons.FreeSlotsResponse)
-async def free_slots_bff(
-  teacher_telegram_id: int,
-  the_date: date = Query(...),
-  authorization: str = Header(None)
-):
-  await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    resp = await client.get(
-      f"{LESSONS_SERVICE_URL}/free-slots",
-      params={"teacher_telegram_id": teacher_telegram_id, "the_date": the_date.isoformat()},
-      timeout=10
-    )
-    resp.raise_for_status()
-    return resp.json()
+  client = upstream_clients.get("lessons")
+  resp = await client.get(f"{LESSONS_SERVICE_URL}/attendance/{lesson_id}", timeout=10)
+  resp.raise_for_status()
+  return resp.json()
 
 
 @router.post("/create-full-lesson", response_model=lessons.LessonSessionResponse)
@@ -199,20 +232,20 @@ async def create_full_lesson_bff(payload: lessons.CreateFullLessonPayload, autho
   if payload.teacher_telegram_id != teacher_id:
     raise HTTPException(403, "Can only create lessons for yourself")
 
-  async with httpx.AsyncClient() as client:
-    # 1. Создаем Lesson
-    lesson_data = jsonable_encoder(payload.lesson)
-    lesson_resp = await client.post(f"{LESSONS_SERVICE_URL}/lessons", json=lesson_data)
-    lesson_resp.raise_for_status()
-    lesson = lesson_resp.json()
-
-    # 2. Создаем Session
-    session_data = jsonable_encoder(payload.session)
-    session_data["lesson_id"] = lesson["id"]
-    print(session_data)
-    session_resp = await client.post(f"{LESSONS_SERVICE_URL}/lessons/sessions", json=session_data)
-    session_resp.raise_for_status()
-    return session_resp.json()
+  client = upstream_clients.get("lessons")
+  # 1. Создаем Lesson
+  lesson_data = jsonable_encoder(payload.lesson)
+  lesson_resp = await client.post(f"{LESSONS_SERVICE_URL}/lessons", json=lesson_data)
+  lesson_resp.raise_for_status()
+  lesson = lesson_resp.json()
+
+  # 2. Создаем Session
+  session_data = jsonable_encoder(payload.session)
+  session_data["lesson_id"] = lesson["id"]
+  print(session_data)
+  session_resp = await client.post(f"{LESSONS_SERVICE_URL}/lessons/sessions", json=session_data)
+  session_resp.raise_for_status()
+  return session_resp.json()
 
 @router.delete("/delete-full-lesson/{lesson_id}", status_code=204)
 async def delete_full_lesson_bff(
@@ -223,33 +256,33 @@ async def delete_full_lesson_bff(
   if not teacher_id:
     raise HTTPException(401, "Unauthorized")
 
-  async with httpx.AsyncClient() as client:
-    lesson_resp = await client.get(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}")
-    if lesson_resp.status_code == 404:
-      raise HTTPException(404, "Lesson not found")
+  client = upstream_clients.get("lessons")
+  lesson_resp = await client.get(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}")
+  if lesson_resp.status_code == 404:
+    raise HTTPException(404, "Lesson not found")
 
-    lesson = lesson_resp.json()
+  lesson = lesson_resp.json()
 
-    if lesson["teacher_telegram_id"] != teacher_id:
-      raise HTTPException(403, "You can delete only your own lessons")
+  if lesson["teacher_telegram_id"] != teacher_id:
+    raise HTTPException(403, "You can delete only your own lessons")
 
-    sessions_resp = await client.post(
-      f"{LESSONS_SERVICE_URL}/lessons/sessions/by-teacher",
-      json={
-        "teacher_telegram_id": teacher_id,
-        "start": "1970-01-01T00:00:00Z",
-        "end": "2100-01-01T00:00:00Z"
-      }
-    )
-    sessions_resp.raise_for_status()
-    sessions = sessions_resp.json()
+  sessions_resp = await client.post(
+    f"{LESSONS_SERVICE_URL}/lessons/sessions/by-teacher",
+    json={
+      "teacher_telegram_id": teacher_id,
+      "start": "1970-01-01T00:00:00Z",
+      "end": "2100-01-01T00:00:00Z"
+    }
+  )
+  sessions_resp.raise_for_status()
+  sessions = sessions_resp.json()
 
-    for s in sessions:
-      if s["lesson_id"] == lesson_id:
-        await client.delete(f"{LESSONS_SERVICE_URL}/lessons/sessions/{s['id']}")
+  for s in sessions:
+    if s["lesson_id"] == lesson_id:
+      await client.delete(f"{LESSONS_SERVICE_URL}/lessons/sessions/{s['id']}")
 
-    del_resp = await client.delete(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}")
-    del_resp.raise_for_status()
+  del_resp = await client.delete(f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}")
+  del_resp.raise_for_status()
 
   return None
 
@@ -263,19 +296,19 @@ async def enroll_to_lesson_bff(
   Записать студента или группу на занятие
   """
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    try:
-      resp = await client.post(
-        f"{LESSONS_SERVICE_URL}/lessons/enroll",
-        json=jsonable_encoder(payload),
-        timeout=10
-      )
-      resp.raise_for_status()
-      return resp.json()
-    except httpx.HTTPStatusError as e:
-      if e.response.status_code == 400:
-        raise HTTPException(400, e.response.json().get("detail", "Bad request"))
-      raise HTTPException(e.response.status_code, e.response.text)
+  client = upstream_clients.get("lessons")
+  try:
+    resp = await client.post(
+      f"{LESSONS_SERVICE_URL}/lessons/enroll",
+      json=jsonable_encoder(payload),
+      timeout=10
+    )
+    resp.raise_for_status()
+    return resp.json()
+  except httpx.HTTPStatusError as e:
+    if e.response.status_code == 400:
+      raise HTTPException(400, e.response.json().get("detail", "Bad request"))
+    raise HTTPException(e.response.status_code, e.response.text)
 
 @router.get("/{lesson_id}/participants", response_model=List[lessons.LessonParticipantResponse])
 async def get_lesson_participants_bff(
@@ -286,18 +319,18 @@ async def get_lesson_participants_bff(
   Получить список участников занятия
   """
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    try:
-      resp = await client.get(
-        f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}/participants",
-        timeout=10
-      )
-      resp.raise_for_status()
-      return resp.json()
-    except httpx.HTTPStatusError as e:
-      if e.response.status_code == 404:
-        raise HTTPException(404, "No participants found for this lesson")
-      raise HTTPException(e.response.status_code, e.response.text)
+  client = upstream_clients.get("lessons")
+  try:
+    resp = await client.get(
+      f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}/participants",
+      timeout=10
+    )
+    resp.raise_for_status()
+    return resp.json()
+  except httpx.HTTPStatusError as e:
+    if e.response.status_code == 404:
+      raise HTTPException(404, "No participants found for this lesson")
+    raise HTTPException(e.response.status_code, e.response.text)
 
 @router.delete("/{lesson_id}/participants/{student_id}", status_code=204)
 async def remove_student_from_lesson_bff(
@@ -309,20 +342,20 @@ async def remove_student_from_lesson_bff(
   Отписать студента от занятия
   """
   current_user_telegram_id = await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    try:
-      # Передаем telegram_id текущего пользователя в query параметре
-      resp = await client.delete(
-        f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}/participants/{student_id}",
-        params={"cancelled_by_telegram_id": current_user_telegram_id},
-        timeout=10
-      )
-      resp.raise_for_status()
-      return None
-    except httpx.HTTPStatusError as e:
-      if e.response.status_code == 404:
-        raise HTTPException(404, "Student not found in this lesson")
-      raise HTTPException(e.response.status_code, e.response.text)
+  client = upstream_clients.get("lessons")
+  try:
+    # Передаем telegram_id текущего пользователя в query параметре
+    resp = await client.delete(
+      f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}/participants/{student_id}",
+      params={"cancelled_by_telegram_id": current_user_telegram_id},
+      timeout=10
+    )
+    resp.raise_for_status()
+    return None
+  except httpx.HTTPStatusError as e:
+    if e.response.status_code == 404:
+      raise HTTPException(404, "Student not found in this lesson")
+    raise HTTPException(e.response.status_code, e.response.text)
 
 @router.delete("/{lesson_id}/participants/group/{group_id}", status_code=204)
 async def remove_group_from_lesson_bff(
@@ -334,18 +367,18 @@ async def remove_group_from_lesson_bff(
   Отписать группу от занятия
   """
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    try:
-      resp = await client.delete(
-        f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}/participants/group/{group_id}",
-        timeout=10
-      )
-      resp.raise_for_status()
-      return None
-    except httpx.HTTPStatusError as e:
-      if e.response.status_code == 404:
-        raise HTTPException(404, "Group not found in this lesson")
-      raise HTTPException(e.response.status_code, e.response.text)
+  client = upstream_clients.get("lessons")
+  try:
+    resp = await client.delete(
+      f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}/participants/group/{group_id}",
+      timeout=10
+    )
+    resp.raise_for_status()
+    return None
+  except httpx.HTTPStatusError as e:
+    if e.response.status_code == 404:
+      raise HTTPException(404, "Group not found in this lesson")
+    raise HTTPException(e.response.status_code, e.response.text)
 
 @router.post("/{lesson_id}/enroll-bulk", response_model=List[lessons.LessonParticipantResponse])
 async def bulk_enroll_students_to_lesson_bff(
@@ -357,16 +390,16 @@ async def bulk_enroll_students_to_lesson_bff(
   Массовая запись студентов на занятие
   """
   await get_current_user_telegram_id(authorization)
-  async with httpx.AsyncClient() as client:
-    try:
-      resp = await client.post(
-        f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}/enroll-bulk",
-        json=jsonable_encoder({"student_ids": student_ids}),
-        timeout=10
-      )
-      resp.raise_for_status()
-      return resp.json()
-    except httpx.HTTPStatusError as e:
-      if e.response.status_code == 400:
-        raise HTTPException(400, e.response.json().get("detail", "Bad request"))
-      raise HTTPException(e.response.status_code, e.response.text)
+  client = upstream_clients.get("lessons")
+  try:
+    resp = await client.post(
+      f"{LESSONS_SERVICE_URL}/lessons/{lesson_id}/enroll-bulk",
+      json=jsonable_encoder({"student_ids": student_ids}),
+      timeout=10
+    )
+    resp.raise_for_status()
+    return resp.json()
+  except httpx.HTTPStatusError as e:
+    if e.response.status_code == 400:
+      raise HTTPException(400, e.response.json().get("detail", "Bad request"))
+    raise HTTPException(e.response.status_code, e.response.text)
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, Optional
+import asyncio
+import logging
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Branch:
+  """
+  Один независимый запрос к upstream-сервису в рамках агрегации.
+
+  required=True  — ошибка или таймаут ветки прерывает весь запрос (остальные ветки отменяются);
+  required=False — ошибка логируется, вместо результата подставляется default.
+  """
+  name: str
+  call: Awaitable
+  timeout: Optional[float] = None
+  required: bool = True
+  default: Any = None
+
+
+async def _run_branch(branch: Branch):
+  try:
+    if branch.timeout is None:
+      return await branch.call
+    return await asyncio.wait_for(branch.call, timeout=branch.timeout)
+  except asyncio.TimeoutError:
+    if branch.required:
+      raise HTTPException(status_code=504, detail=f"{branch.name} timed out")
+    logger.warning(f"Aggregation branch '{branch.name}' timed out after {branch.timeout}s, using default")
+    return branch.default
+  except Exception as e:
+    if branch.required:
+      raise
+    logger.warning(f"Aggregation branch '{branch.name}' failed: {e!r}, using default")
+    return branch.default
+
+
+async def gather_branches(*branches: Branch) -> Dict[str, Any]:
+  """
+  Параллельно выполняет ветки и возвращает {имя ветки: результат}.
+  Первая упавшая обязательная ветка отменяет остальные, её исключение пробрасывается наружу.
+  """
+  if not branches:
+    return {}
+
+  tasks = {
+    asyncio.ensure_future(_run_branch(branch)): branch.name
+    for branch in branches
+  }
+  try:
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+  except asyncio.CancelledError:
+    # Клиент отключился — не оставляем висящие запросы к upstream
+    for task in tasks:
+      task.cancel()
+    raise
+
+  errors = [task.exception() for task in done if task.exception() is not None]
+  if errors:
+    for task in pending:
+      task.cancel()
+    if pending:
+      await asyncio.gather(*pending, return_exceptions=True)
+    raise errors[0]
+
+  return {name: task.result() for task, name in tasks.items()}
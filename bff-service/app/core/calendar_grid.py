@@ -0,0 +1,61 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List
+
+from dateutil.parser import isoparse
+
+
+def _sessions_by_date(sessions: List[dict]) -> Dict[str, List[dict]]:
+  """Сессии по дням, отсортированные по началу; время каждой сессии парсится один раз"""
+  parsed = defaultdict(list)
+  for s in sessions:
+    if not s.get("start_time"):
+      continue
+    try:
+      start_dt = isoparse(s["start_time"])
+    except Exception:
+      continue
+
+    parsed[start_dt.date().isoformat()].append((start_dt, {
+      "id": s.get("id"),
+      "lesson_id": s.get("lesson_id"),
+      "start_time": s.get("start_time"),
+      "end_time": s.get("end_time"),
+      "status": s.get("status"),
+      "booked": s.get("booked", False),
+      "booked_by": s.get("booked_by"),
+      "participants_count": s.get("participants_count", 0),
+      "lesson": s.get("lesson"),
+    }))
+
+  return {
+    day: [session for _, session in sorted(items, key=lambda item: item[0])]
+    for day, items in parsed.items()
+  }
+
+
+def build_calendar_days(start: date, end: date, effective_days: List[dict], sessions: List[dict]) -> List[dict]:
+  """
+  Дни календаря преподавателя за [start, end]: рабочее окно и занятия дня.
+  effective_days — ответ calendary-service /effective-days (окно уже с учетом разовых дней,
+  свободные интервалы — за вычетом периодов недоступности), sessions — сессии из lessons-service.
+  Дня, которого нет в effective_days, считаем нерабочим. Работает за O(дней + событий)
+  """
+  windows = {str(day["date"]): day for day in effective_days}
+  sessions_by_date = _sessions_by_date(sessions)
+
+  days = []
+  for i in range((end - start).days + 1):
+    day_date = start + timedelta(days=i)
+    day_iso = day_date.isoformat()
+    window = windows.get(day_iso) or {}
+
+    days.append({
+      "date": day_date,
+      "is_active": bool(window.get("is_active", False)),
+      "start_time": window.get("start_time"),
+      "end_time": window.get("end_time"),
+      "intervals": window.get("intervals") or [],
+      "lessons": list(sessions_by_date.get(day_iso, []))
+    })
+  return days
@@ -0,0 +1,134 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import logging
+import os
+
+import redis.asyncio as aioredis
+from redis.exceptions import WatchError
+
+logger = logging.getLogger(__name__)
+
+
+class CalendarSnapshotStore:
+  """
+  Снимки календаря преподавателя по дням в Redis: calendar:{teacher}:{YYYY-MM-DD} -> JSON дня
+  (рабочее окно и занятия). Диапазон читается одним MGET, недостающие дни достраиваются и
+  дописываются. Снимки сбрасываются точечно по событиям (день, день недели, список дней);
+  счетчик поколения calendar:{teacher}:gen не дает перезаписать сброшенный день данными,
+  собранными до сброса.
+
+  Настройки: REDIS_URL, CALENDAR_SNAPSHOT_TTL (сек, 0 — снимки выключены).
+  Если Redis недоступен, календарь просто собирается каждый раз заново.
+  """
+
+  def __init__(self):
+    self.url = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    self.ttl = int(os.getenv("CALENDAR_SNAPSHOT_TTL", "86400"))
+    self._redis = None
+
+  @property
+  def enabled(self) -> bool:
+    return self.ttl > 0
+
+  def _client(self):
+    if self._redis is None:
+      self._redis = aioredis.from_url(self.url, decode_responses=True)
+    return self._redis
+
+  @staticmethod
+  def _day_key(teacher_telegram_id: int, day: str) -> str:
+    return f"calendar:{teacher_telegram_id}:{day}"
+
+  @staticmethod
+  def _index_key(teacher_telegram_id: int) -> str:
+    # Какие дни преподавателя сейчас лежат в снимках — для сброса по дню недели
+    return f"calendar:{teacher_telegram_id}:days"
+
+  @staticmethod
+  def _generation_key(teacher_telegram_id: int) -> str:
+    return f"calendar:{teacher_telegram_id}:gen"
+
+  async def get_range(self, teacher_telegram_id: int, start: date, end: date) -> Dict[str, Any]:
+    """
+    Возвращает {"generation": N, "days": {YYYY-MM-DD: день}} — только найденные дни.
+    generation нужно передать в put_days вместе с достроенными днями
+    """
+    if not self.enabled:
+      return {"generation": None, "days": {}}
+
+    day_keys = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+    try:
+      values = await self._client().mget(
+        [self._generation_key(teacher_telegram_id)]
+        + [self._day_key(teacher_telegram_id, d) for d in day_keys]
+      )
+    except Exception as e:
+      logger.warning(f"Calendar snapshot lookup failed: {e!r}")
+      return {"generation": None, "days": {}}
+
+    days = {d: json.loads(v) for d, v in zip(day_keys, values[1:]) if v is not None}
+    return {"generation": int(values[0] or 0), "days": days}
+
+  async def put_days(self, teacher_telegram_id: int, days: List[dict], generation: Optional[int]) -> None:
+    """Сохраняет собранные дни, если с момента чтения снимки преподавателя не сбрасывались"""
+    if not self.enabled or generation is None or not days:
+      return
+
+    generation_key = self._generation_key(teacher_telegram_id)
+    index_key = self._index_key(teacher_telegram_id)
+    try:
+      async with self._client().pipeline() as pipe:
+        await pipe.watch(generation_key)
+        if int(await pipe.get(generation_key) or 0) != generation:
+          return
+        pipe.multi()
+        for day in days:
+          day_iso = str(day["date"])
+          pipe.set(self._day_key(teacher_telegram_id, day_iso), json.dumps(day, default=str), ex=self.ttl)
+          pipe.zadd(index_key, {day_iso: date.fromisoformat(day_iso).toordinal()})
+        pipe.expire(index_key, self.ttl)
+        await pipe.execute()
+    except WatchError:
+      logger.info(f"Calendar snapshots of teacher {teacher_telegram_id} changed while building, not stored")
+    except Exception as e:
+      logger.warning(f"Failed to store calendar snapshots: {e!r}")
+
+  async def invalidate_days(self, teacher_telegram_id: int, days: Iterable[date]) -> None:
+    """Сбрасывает снимки конкретных дней"""
+    if not self.enabled:
+      return
+    day_isos = sorted({d.isoformat() for d in days})
+    try:
+      async with self._client().pipeline(transaction=True) as pipe:
+        # Поколение растет даже без удаленных дней: сборка, идущая прямо сейчас, не сохранится
+        pipe.incr(self._generation_key(teacher_telegram_id))
+        if day_isos:
+          pipe.delete(*[self._day_key(teacher_telegram_id, d) for d in day_isos])
+          pipe.zrem(self._index_key(teacher_telegram_id), *day_isos)
+        await pipe.execute()
+    except Exception as e:
+      logger.warning(f"Failed to invalidate calendar snapshots: {e!r}")
+
+  async def invalidate_weekday(self, teacher_telegram_id: int, day_of_week: int) -> None:
+    """Сбрасывает снимки всех сохраненных дней с этим днем недели (изменилось недельное расписание)"""
+    if not self.enabled:
+      return
+    try:
+      stored = await self._client().zrange(self._index_key(teacher_telegram_id), 0, -1)
+    except Exception as e:
+      logger.warning(f"Failed to read calendar snapshot index: {e!r}")
+      return
+    await self.invalidate_days(
+      teacher_telegram_id,
+      [d for d in map(date.fromisoformat, stored) if d.weekday() == day_of_week]
+    )
+
+  async def close(self):
+    if self._redis is not None:
+      await self._redis.close()
+      self._redis = None
+
+
+# Глобальный экземпляр
+calendar_snapshots = CalendarSnapshotStore()
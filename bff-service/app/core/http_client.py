@@ -0,0 +1,89 @@
+from typing import Dict
+import logging
+import os
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Сервисы, к которым ходит BFF. На каждый — свой пул соединений с keep-alive
+UPSTREAMS = ("auth", "lessons", "groups", "calendary", "students", "teachers", "notifications")
+
+
+def _env_int(name: str, default: int) -> int:
+  value = os.getenv(name)
+  return int(value) if value else default
+
+def _env_float(name: str, default: float) -> float:
+  value = os.getenv(name)
+  return float(value) if value else default
+
+def _env_bool(name: str, default: bool = False) -> bool:
+  value = os.getenv(name)
+  if value is None:
+    return default
+  return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class UpstreamClients:
+  """
+  Реестр HTTP-клиентов BFF: один httpx.AsyncClient (пул соединений) на upstream.
+  Лимиты задаются через переменные окружения:
+    BFF_HTTP_MAX_CONNECTIONS, BFF_HTTP_MAX_KEEPALIVE, BFF_HTTP_KEEPALIVE_EXPIRY, BFF_HTTP_TIMEOUT, BFF_HTTP2
+  и переопределяются для конкретного сервиса, например BFF_HTTP_CALENDARY_MAX_CONNECTIONS.
+  """
+
+  def __init__(self):
+    self._clients: Dict[str, httpx.AsyncClient] = {}
+
+  def _setting(self, name: str, key: str, default):
+    reader = _env_float if isinstance(default, float) else _env_int
+    return reader(f"BFF_HTTP_{name.upper()}_{key}", reader(f"BFF_HTTP_{key}", default))
+
+  def _build(self, name: str) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+      max_connections=self._setting(name, "MAX_CONNECTIONS", 100),
+      max_keepalive_connections=self._setting(name, "MAX_KEEPALIVE", 20),
+      keepalive_expiry=self._setting(name, "KEEPALIVE_EXPIRY", 30.0),
+    )
+
+    http2 = _env_bool("BFF_HTTP2")
+    if http2:
+      try:
+        import h2  # noqa: F401
+      except ImportError:
+        logger.warning("BFF_HTTP2 is enabled but 'h2' package is not installed, falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+      limits=limits,
+      timeout=httpx.Timeout(self._setting(name, "TIMEOUT", 10.0)),
+      http2=http2,
+    )
+
+  def start(self):
+    """Создает пулы для всех upstream-сервисов (вызывается из lifespan приложения)"""
+    for name in UPSTREAMS:
+      self.get(name)
+    logger.info(f"HTTP client pools initialized: {', '.join(UPSTREAMS)}")
+
+  def get(self, name: str) -> httpx.AsyncClient:
+    """Возвращает общий клиент для upstream-сервиса"""
+    if name not in UPSTREAMS:
+      raise KeyError(f"Unknown upstream: {name}")
+
+    client = self._clients.get(name)
+    if client is None or client.is_closed:
+      client = self._build(name)
+      self._clients[name] = client
+    return client
+
+  async def close(self):
+    """Закрывает все пулы соединений"""
+    for client in self._clients.values():
+      await client.aclose()
+    self._clients.clear()
+
+
+# Глобальный реестр клиентов
+upstream_clients = UpstreamClients()
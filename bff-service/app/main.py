@@ -1,9 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import auth, students, teachers, admin, calendar, groups, lessons, notification, languages
+from app.core.http_client import upstream_clients
+from app.core.calendar_snapshots import calendar_snapshots
+from app.core.calendar_events import calendar_events_consumer
+import asyncio
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  # Пулы соединений к сервисам живут все время работы приложения
+  upstream_clients.start()
+  # Снимки календаря сбрасываются по событиям lessons-service
+  asyncio.create_task(calendar_events_consumer.start())
+  yield
+  await calendar_events_consumer.close()
+  await calendar_snapshots.close()
+  await upstream_clients.close()
 
 app = FastAPI(
   title="BFF Server",
+  lifespan=lifespan,
   root_path="/api",
   servers=[{"url": "/api", "description": "API Server"}],
   openapi_url="/openapi.json",
@@ -45,17 +45,24 @@ class LessonShortInCalendar(BaseModel):
     end_time: datetime
     status: str
     booked: bool
+    participants_count: int = 0
     lesson: Optional[dict] = None
     booked_by: Optional[BookedByShort] = None
 
     class Config:
         orm_mode = True
 
+class WorkingInterval(BaseModel):
+    start: datetime
+    end: datetime
+
 class CalendarDayResponse(BaseModel):
     date: date
     is_active: bool
     start_time: Optional[str] = None
     end_time: Optional[str] = None
+    # Рабочее окно за вычетом периодов недоступности
+    intervals: List[WorkingInterval] = Field(default_factory=list)
     lessons: List[LessonShortInCalendar] = Field(default_factory=list)
 
 class CalendarResponse(BaseModel):
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, date, time
 from typing import Optional, List
 from pydantic import BaseModel, field_validator, model_validator
 from enum import Enum
@@ -123,6 +123,27 @@ class TimeSlot(BaseModel):
 class FreeSlotsResponse(BaseModel):
   teacher_telegram_id: int
   date: str
+  date_to: Optional[str] = None
+  slots: List[TimeSlot]
+
+class AvailabilitySearchRequest(BaseModel):
+  language: Optional[str] = None
+  level: Optional[str] = None
+  teacher_telegram_ids: Optional[List[int]] = None
+  date_from: date
+  date_to: date
+  time_from: Optional[time] = None
+  time_to: Optional[time] = None
+  weekdays: Optional[List[int]] = None
+  slot_minutes: Optional[int] = None
+  step_minutes: Optional[int] = None
+  buffer_minutes: Optional[int] = None
+  limit: int = 20
+
+class TeacherAvailability(BaseModel):
+  teacher_telegram_id: int
+  free_slots_count: int
+  first_slot: Optional[datetime] = None
   slots: List[TimeSlot]
 
 class CreateFullLessonPayload(BaseModel):
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, Any
 from uuid import UUID
@@ -15,6 +15,7 @@ class NotificationType(enum.Enum):
   GRADE_RECEIVED = "grade_received"
   SYSTEM_MESSAGE = "system_message"
   TEACHER_MESSAGE = "teacher_message"
+  DIGEST = "digest"
 
 class NotificationStatus(enum.Enum):
   PENDING = "pending"
@@ -67,6 +68,8 @@ class UserNotificationSettingsBase(BaseModel):
     marketing_messages: Optional[bool] = None
     quiet_hours_start: Optional[str] = None
     quiet_hours_end: Optional[str] = None
+    digest_enabled: Optional[bool] = None
+    digest_window_minutes: Optional[int] = Field(None, ge=1, le=1440)
 
 class UserNotificationSettingsCreate(BaseModel):
     user_id: UUID
@@ -0,0 +1,69 @@
+"""
+Бенчмарк build_calendar_days на годовом диапазоне.
+Запуск из bff-service: python -m tests.bench_calendar_grid
+"""
+import random
+import timeit
+from datetime import date, datetime, time, timedelta, timezone
+
+from app.core.calendar_grid import build_calendar_days
+
+START = date(2025, 1, 1)
+END = date(2025, 12, 31)
+SESSIONS_PER_DAY = 8
+REPEAT = 20
+
+
+def make_effective_days(rng: random.Random) -> list:
+  """Ответ /effective-days: будни активны, ~5% дней закрыты недоступностью, ~15% — урезаны"""
+  days = []
+  for i in range((END - START).days + 1):
+    day = START + timedelta(days=i)
+    window = [(datetime.combine(day, time(9), tzinfo=timezone.utc), datetime.combine(day, time(18), tzinfo=timezone.utc))]
+    roll = rng.random()
+    if day.weekday() >= 5 or roll < 0.05:
+      window = []
+    elif roll < 0.2:
+      window = [(window[0][0], window[0][0] + timedelta(hours=3)), (window[0][0] + timedelta(hours=4), window[0][1])]
+    days.append({
+      "date": day.isoformat(),
+      "is_active": bool(window),
+      "start_time": "09:00",
+      "end_time": "18:00",
+      "intervals": [{"start": s.isoformat(), "end": e.isoformat()} for s, e in window],
+    })
+  return days
+
+
+def make_sessions(rng: random.Random) -> list:
+  """SESSIONS_PER_DAY сессий в каждый день диапазона, в случайном порядке"""
+  sessions = []
+  for i in range((END - START).days + 1):
+    day = START + timedelta(days=i)
+    for hour in range(9, 9 + SESSIONS_PER_DAY):
+      start_dt = datetime.combine(day, time(hour), tzinfo=timezone.utc)
+      sessions.append({
+        "id": len(sessions) + 1,
+        "lesson_id": len(sessions) % 50 + 1,
+        "start_time": start_dt.isoformat(),
+        "end_time": (start_dt + timedelta(minutes=50)).isoformat(),
+        "status": "SCHEDULED",
+        "participants_count": 1,
+      })
+  rng.shuffle(sessions)
+  return sessions
+
+
+def main():
+  rng = random.Random(42)
+  effective_days = make_effective_days(rng)
+  sessions = make_sessions(rng)
+
+  build = lambda: build_calendar_days(START, END, effective_days, sessions)
+  days = build()
+  best = min(timeit.repeat(build, number=1, repeat=REPEAT))
+  print(f"{len(days)} days, {len(sessions)} sessions: best of {REPEAT} — {best * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+  main()
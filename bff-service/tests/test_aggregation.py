@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core.aggregation import Branch, gather_branches
+
+
+def _client(cancelled: list) -> httpx.AsyncClient:
+  """
+  Клиент с подменным транспортом вместо upstream-сервисов:
+  /fast — сразу 200, /fail — 500, /slow — отвечает через 10 с (отмена записывается в cancelled)
+  """
+  async def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/fail":
+      return httpx.Response(500, json={"detail": "upstream error"})
+    if request.url.path == "/slow":
+      try:
+        await asyncio.sleep(10)
+      except asyncio.CancelledError:
+        cancelled.append(request.url.path)
+        raise
+    return httpx.Response(200, json={"path": request.url.path})
+
+  return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream")
+
+
+async def _fetch(client: httpx.AsyncClient, path: str):
+  response = await client.get(path)
+  response.raise_for_status()
+  return response.json()
+
+
+def test_required_branch_failure_cancels_other_branches():
+  cancelled = []
+
+  async def scenario():
+    async with _client(cancelled) as client:
+      return await gather_branches(
+        Branch("calendar", _fetch(client, "/fail")),
+        Branch("sessions", _fetch(client, "/slow")),
+      )
+
+  started = time.monotonic()
+  with pytest.raises(httpx.HTTPStatusError):
+    asyncio.run(scenario())
+
+  assert time.monotonic() - started < 1
+  assert cancelled == ["/slow"]
+
+
+def test_optional_branch_timeout_returns_default():
+  cancelled = []
+
+  async def scenario():
+    async with _client(cancelled) as client:
+      return await gather_branches(
+        Branch("calendar", _fetch(client, "/fast")),
+        Branch("names", _fetch(client, "/slow"), timeout=0.05, required=False, default={}),
+      )
+
+  result = asyncio.run(scenario())
+
+  assert result == {"calendar": {"path": "/fast"}, "names": {}}
+  assert cancelled == ["/slow"]
+
+
+def test_optional_branch_failure_returns_default():
+  async def scenario():
+    async with _client([]) as client:
+      return await gather_branches(
+        Branch("calendar", _fetch(client, "/fast")),
+        Branch("names", _fetch(client, "/fail"), required=False, default=[]),
+      )
+
+  assert asyncio.run(scenario()) == {"calendar": {"path": "/fast"}, "names": []}
+
+
+def test_required_branch_timeout_returns_504():
+  cancelled = []
+
+  async def scenario():
+    async with _client(cancelled) as client:
+      return await gather_branches(
+        Branch("calendar", _fetch(client, "/slow"), timeout=0.05),
+        Branch("names", _fetch(client, "/fast")),
+      )
+
+  with pytest.raises(HTTPException) as exc_info:
+    asyncio.run(scenario())
+
+  assert exc_info.value.status_code == 504
+  assert exc_info.value.detail == "calendar timed out"
@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+from app.core.calendar_grid import build_calendar_days
+
+
+def _session(session_id: int, start_time: str, end_time: str) -> dict:
+  return {"id": session_id, "lesson_id": 1, "start_time": start_time, "end_time": end_time, "status": "SCHEDULED"}
+
+
+def _day(day: str, is_active: bool, start_time=None, end_time=None, intervals=None) -> dict:
+  """День в формате ответа calendary-service /effective-days"""
+  return {"date": day, "is_active": is_active, "start_time": start_time, "end_time": end_time, "intervals": intervals or []}
+
+
+def test_effective_days_are_used_as_is():
+  clipped = [
+    {"start": "2025-03-04T10:00:00+00:00", "end": "2025-03-04T12:00:00+00:00"},
+    {"start": "2025-03-04T12:30:00+00:00", "end": "2025-03-04T14:00:00+00:00"},
+  ]
+  effective_days = [
+    _day("2025-03-03", True, "09:00", "18:00", [{"start": "2025-03-03T09:00:00+00:00", "end": "2025-03-03T18:00:00+00:00"}]),
+    # Окно урезано периодом недоступности 12:00–12:30
+    _day("2025-03-04", True, "10:00", "14:00", clipped),
+    # Окно целиком закрыто недоступностью
+    _day("2025-03-05", False, "09:00", "18:00"),
+  ]
+
+  days = build_calendar_days(date(2025, 3, 3), date(2025, 3, 5), effective_days, [])
+
+  assert [(d["date"], d["is_active"], d["start_time"], d["end_time"]) for d in days] == [
+    (date(2025, 3, 3), True, "09:00", "18:00"),
+    (date(2025, 3, 4), True, "10:00", "14:00"),
+    (date(2025, 3, 5), False, "09:00", "18:00"),
+  ]
+  assert days[1]["intervals"] == clipped
+  assert days[2]["intervals"] == []
+
+
+def test_days_missing_from_effective_days_are_inactive():
+  days = build_calendar_days(date(2025, 3, 3), date(2025, 3, 4), [_day("2025-03-04", True, "09:00", "10:00")], [])
+
+  assert days[0] == {
+    "date": date(2025, 3, 3),
+    "is_active": False,
+    "start_time": None,
+    "end_time": None,
+    "intervals": [],
+    "lessons": [],
+  }
+  assert days[1]["is_active"] is True
+
+
+def test_sessions_on_boundary_days_are_included():
+  sessions = [
+    _session(3, "2025-03-05T12:00:00+00:00", "2025-03-05T13:00:00+00:00"),
+    _session(1, "2025-03-01T00:00:00+00:00", "2025-03-01T01:00:00+00:00"),
+    _session(4, "2025-03-07T23:00:00+00:00", "2025-03-08T00:00:00+00:00"),
+    _session(2, "2025-03-05T09:00:00+00:00", "2025-03-05T10:00:00+00:00"),
+    # Вне диапазона и без времени начала
+    _session(5, "2025-02-28T23:00:00+00:00", "2025-03-01T00:00:00+00:00"),
+    _session(6, "2025-03-08T00:00:00+00:00", "2025-03-08T01:00:00+00:00"),
+    {"id": 7, "start_time": None},
+  ]
+
+  days = build_calendar_days(date(2025, 3, 1), date(2025, 3, 7), [], sessions)
+
+  assert days[0]["date"] == date(2025, 3, 1) and days[-1]["date"] == date(2025, 3, 7)
+  lessons = {day["date"].isoformat(): [s["id"] for s in day["lessons"]] for day in days if day["lessons"]}
+  # Внутри дня — по времени начала
+  assert lessons == {"2025-03-01": [1], "2025-03-05": [2, 3], "2025-03-07": [4]}
+
+
+def test_one_year_range():
+  start = date(2025, 1, 1)
+  effective_days = [
+    _day((start + timedelta(days=i)).isoformat(), (start + timedelta(days=i)).weekday() < 5, "09:00", "18:00")
+    for i in range(365)
+  ]
+
+  days = build_calendar_days(start, date(2025, 12, 31), effective_days, [])
+
+  assert len(days) == 365
+  assert sum(day["is_active"] for day in days) == 261
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.core.http_client import UPSTREAMS, UpstreamClients
+
+
+def test_one_client_per_upstream():
+  clients = UpstreamClients()
+  clients.start()
+
+  assert {name: clients.get(name) for name in UPSTREAMS} == clients._clients
+  assert clients.get("lessons") is clients.get("lessons")
+  assert clients.get("lessons") is not clients.get("groups")
+
+  asyncio.run(clients.close())
+
+
+def test_unknown_upstream():
+  with pytest.raises(KeyError):
+    UpstreamClients().get("payments")
+
+
+def test_limits_from_env_with_per_service_override(monkeypatch):
+  monkeypatch.setenv("BFF_HTTP_MAX_CONNECTIONS", "40")
+  monkeypatch.setenv("BFF_HTTP_CALENDARY_MAX_CONNECTIONS", "7")
+  monkeypatch.setenv("BFF_HTTP_TIMEOUT", "2.5")
+  clients = UpstreamClients()
+
+  assert clients._setting("lessons", "MAX_CONNECTIONS", 100) == 40
+  assert clients._setting("calendary", "MAX_CONNECTIONS", 100) == 7
+  assert clients._setting("calendary", "MAX_KEEPALIVE", 20) == 20
+  assert clients.get("calendary").timeout.read == 2.5
+
+
+def test_closed_client_is_recreated():
+  clients = UpstreamClients()
+  first = clients.get("auth")
+
+  asyncio.run(clients.close())
+
+  assert first.is_closed
+  second = clients.get("auth")
+  assert second is not first and not second.is_closed
+  asyncio.run(clients.close())
@@ -1,5 +1,5 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select, text
 from typing import List, Optional
 from datetime import date, datetime, timedelta
 import json
@@ -7,33 +7,39 @@ import json
 from . import models, schemas
 
 # CRUD для TeacherSchedule (недельное расписание)
-def get_teacher_schedule(db: Session, teacher_telegram_id: int, day_of_week: int) -> Optional[models.TeacherSchedule]:
-    return db.query(models.TeacherSchedule).filter(
-        and_(
-            models.TeacherSchedule.teacher_telegram_id == teacher_telegram_id,
-            models.TeacherSchedule.day_of_week == day_of_week
+async def get_teacher_schedule(db: AsyncSession, teacher_telegram_id: int, day_of_week: int) -> Optional[models.TeacherSchedule]:
+    result = await db.execute(
+        select(models.TeacherSchedule).where(
+            and_(
+                models.TeacherSchedule.teacher_telegram_id == teacher_telegram_id,
+                models.TeacherSchedule.day_of_week == day_of_week
+            )
         )
-    ).first()
+    )
+    return result.scalars().first()
 
-def get_teacher_schedules(db: Session, teacher_telegram_id: int) -> List[models.TeacherSchedule]:
-    return db.query(models.TeacherSchedule).filter(
-        models.TeacherSchedule.teacher_telegram_id == teacher_telegram_id
-    ).all()
+async def get_teacher_schedules(db: AsyncSession, teacher_telegram_id: int) -> List[models.TeacherSchedule]:
+    result = await db.execute(
+        select(models.TeacherSchedule).where(
+            models.TeacherSchedule.teacher_telegram_id == teacher_telegram_id
+        )
+    )
+    return result.scalars().all()
 
-def create_teacher_schedule(db: Session, schedule: schemas.TeacherScheduleCreate) -> models.TeacherSchedule:
+async def create_teacher_schedule(db: AsyncSession, schedule: schemas.TeacherScheduleCreate) -> models.TeacherSchedule:
     db_schedule = models.TeacherSchedule(**schedule.dict())
     db.add(db_schedule)
-    db.commit()
-    db.refresh(db_schedule)
+    await db.commit()
+    await db.refresh(db_schedule)
     return db_schedule
 
-def update_teacher_schedule(
-    db: Session,
+async def update_teacher_schedule(
+    db: AsyncSession,
     teacher_telegram_id: int,
     day_of_week: int,
     schedule_update: schemas.TeacherScheduleUpdate
 ) -> Optional[models.TeacherSchedule]:
-    db_schedule = get_teacher_schedule(db, teacher_telegram_id, day_of_week)
+    db_schedule = await get_teacher_schedule(db, teacher_telegram_id, day_of_week)
     if not db_schedule:
         return None
 
@@ -42,8 +48,8 @@ def update_teacher_schedule(
         setattr(db_schedule, field, value)
 
     db_schedule.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_schedule)
+    await db.commit()
+    await db.refresh(db_schedule)
     return db_schedule
 
 def generate_time_slots(
@@ -74,24 +80,27 @@ def generate_time_slots(
 
     return slots
 
-def create_teacher_special_day(db: Session, special_day: schemas.TeacherSpecialDayCreate):
+async def create_teacher_special_day(db: AsyncSession, special_day: schemas.TeacherSpecialDayCreate):
     db_day = models.TeacherSpecialDay(**special_day.dict())
     db.add(db_day)
-    db.commit()
-    db.refresh(db_day)
+    await db.commit()
+    await db.refresh(db_day)
     return db_day
 
-def get_teacher_special_days(db: Session, teacher_telegram_id: int, start: date, end: date):
-    return db.query(models.TeacherSpecialDay).filter(
-        models.TeacherSpecialDay.teacher_telegram_id == teacher_telegram_id,
-        models.TeacherSpecialDay.date >= start,
-        models.TeacherSpecialDay.date <= end
-    ).all()
+async def get_teacher_special_days(db: AsyncSession, teacher_telegram_id: int, start: date, end: date):
+    result = await db.execute(
+        select(models.TeacherSpecialDay).where(
+            models.TeacherSpecialDay.teacher_telegram_id == teacher_telegram_id,
+            models.TeacherSpecialDay.date >= start,
+            models.TeacherSpecialDay.date <= end
+        )
+    )
+    return result.scalars().all()
 
-def update_teacher_special_day(
-    db: Session, special_day_id: int, special_day_update: schemas.TeacherSpecialDayUpdate
+async def update_teacher_special_day(
+    db: AsyncSession, special_day_id: int, special_day_update: schemas.TeacherSpecialDayUpdate
 ):
-    db_day = db.query(models.TeacherDaySchedule).filter(models.TeacherDaySchedule.id == special_day_id).first()
+    db_day = await db.get(models.TeacherSpecialDay, special_day_id)
     if not db_day:
         return None
 
@@ -99,47 +108,52 @@ def update_teacher_special_day(
         db_day.start_time = special_day_update.start_time
     if special_day_update.end_time is not None:
         db_day.end_time = special_day_update.end_time
-    if special_day_update.is_active is not None:
-        db_day.is_active = special_day_update.is_active
 
-    db.commit()
-    db.refresh(db_day)
+    await db.commit()
+    await db.refresh(db_day)
     return db_day
 
 
-def delete_teacher_special_day(db: Session, special_day_id: int):
-    db_day = db.query(models.TeacherDaySchedule).filter(models.TeacherDaySchedule.id == special_day_id).first()
+async def delete_teacher_special_day(db: AsyncSession, special_day_id: int) -> Optional[models.TeacherSpecialDay]:
+    """Удаляет разовый день и возвращает его (или None) — по нему BFF сбрасывает снимок календаря"""
+    db_day = await db.get(models.TeacherSpecialDay, special_day_id)
     if not db_day:
-        return False
+        return None
 
-    db.delete(db_day)
-    db.commit()
-    return True
+    await db.delete(db_day)
+    await db.commit()
+    return db_day
 
-def get_teacher_full_schedule(
-    db: Session,
+async def get_teacher_full_schedule(
+    db: AsyncSession,
     teacher_telegram_id: int,
     start: date,
     end: date
 ) -> dict:
     # 1. Недельное расписание
-    weekly_schedules = db.query(models.TeacherSchedule).filter(
-        models.TeacherSchedule.teacher_telegram_id == teacher_telegram_id
-    ).all()
+    weekly_schedules = (await db.execute(
+        select(models.TeacherSchedule).where(
+            models.TeacherSchedule.teacher_telegram_id == teacher_telegram_id
+        )
+    )).scalars().all()
 
     # 2. Разовые рабочие дни
-    special_days = db.query(models.TeacherSpecialDay).filter(
-        models.TeacherSpecialDay.teacher_telegram_id == teacher_telegram_id,
-        models.TeacherSpecialDay.date >= start,
-        models.TeacherSpecialDay.date <= end
-    ).all()
+    special_days = (await db.execute(
+        select(models.TeacherSpecialDay).where(
+            models.TeacherSpecialDay.teacher_telegram_id == teacher_telegram_id,
+            models.TeacherSpecialDay.date >= start,
+            models.TeacherSpecialDay.date <= end
+        )
+    )).scalars().all()
 
     # 3. Не рабочие периоды
-    unavailable_periods = db.query(models.TeacherUnavailable).filter(
-        models.TeacherUnavailable.teacher_telegram_id == teacher_telegram_id,
-        models.TeacherUnavailable.end_time >= start,
-        models.TeacherUnavailable.start_time <= end
-    ).all()
+    unavailable_periods = (await db.execute(
+        select(models.TeacherUnavailable).where(
+            models.TeacherUnavailable.teacher_telegram_id == teacher_telegram_id,
+            models.TeacherUnavailable.end_time >= start,
+            models.TeacherUnavailable.start_time <= end
+        )
+    )).scalars().all()
 
     return {
         "weekly_schedules": weekly_schedules,
@@ -147,3 +161,130 @@ def get_teacher_full_schedule(
         "unavailable_periods": unavailable_periods
     }
 
+async def get_teachers_full_schedules(
+    db: AsyncSession,
+    teacher_telegram_ids: List[int],
+    start: date,
+    end: date
+) -> List[dict]:
+    """Полное расписание сразу для нескольких учителей: три запроса на всех вместо трех на каждого"""
+    if not teacher_telegram_ids:
+        return []
+
+    weekly_schedules = (await db.execute(
+        select(models.TeacherSchedule).where(
+            models.TeacherSchedule.teacher_telegram_id.in_(teacher_telegram_ids)
+        )
+    )).scalars().all()
+
+    special_days = (await db.execute(
+        select(models.TeacherSpecialDay).where(
+            models.TeacherSpecialDay.teacher_telegram_id.in_(teacher_telegram_ids),
+            models.TeacherSpecialDay.date >= start,
+            models.TeacherSpecialDay.date <= end
+        )
+    )).scalars().all()
+
+    unavailable_periods = (await db.execute(
+        select(models.TeacherUnavailable).where(
+            models.TeacherUnavailable.teacher_telegram_id.in_(teacher_telegram_ids),
+            models.TeacherUnavailable.end_time >= start,
+            models.TeacherUnavailable.start_time <= end
+        )
+    )).scalars().all()
+
+    by_teacher = {
+        teacher_id: {
+            "teacher_telegram_id": teacher_id,
+            "weekly_schedules": [],
+            "special_days": [],
+            "unavailable_periods": []
+        }
+        for teacher_id in teacher_telegram_ids
+    }
+    for ws in weekly_schedules:
+        by_teacher[ws.teacher_telegram_id]["weekly_schedules"].append(ws)
+    for sd in special_days:
+        by_teacher[sd.teacher_telegram_id]["special_days"].append(sd)
+    for up in unavailable_periods:
+        by_teacher[up.teacher_telegram_id]["unavailable_periods"].append(up)
+
+    return list(by_teacher.values())
+
+# Рабочее окно по дням одним запросом: generate_series дает дни диапазона, разовый день важнее
+# недельного расписания (при дублях — первое недельное и последнее разовое), из окна дня
+# (время в UTC) вычитаются пересекающие его периоды недоступности — остаются свободные интервалы
+EFFECTIVE_DAYS_SQL = text("""
+    SELECT
+        w.day AS date,
+        w.start_time,
+        w.end_time,
+        ARRAY(SELECT lower(r) FROM unnest(w.free) AS r ORDER BY 1) AS interval_starts,
+        ARRAY(SELECT upper(r) FROM unnest(w.free) AS r ORDER BY 1) AS interval_ends
+    FROM (
+        SELECT
+            d.day,
+            COALESCE(sd.start_time, ws.start_time) AS start_time,
+            COALESCE(sd.end_time, ws.end_time) AS end_time,
+            CASE
+                WHEN win.r IS NULL OR isempty(win.r) THEN '{}'::tstzmultirange
+                ELSE tstzmultirange(win.r) - COALESCE(u.busy, '{}'::tstzmultirange)
+            END AS free
+        FROM (
+            SELECT g::date AS day
+            FROM generate_series(CAST(:start AS date), CAST(:end AS date), INTERVAL '1 day') AS g
+        ) AS d
+        LEFT JOIN LATERAL (
+            SELECT id, start_time, end_time FROM teacher_special_days
+            WHERE teacher_telegram_id = :teacher_telegram_id AND date = d.day
+            ORDER BY id DESC LIMIT 1
+        ) AS sd ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT start_time, end_time, is_available FROM teacher_schedules
+            WHERE teacher_telegram_id = :teacher_telegram_id
+              AND day_of_week = EXTRACT(ISODOW FROM d.day)::int - 1
+            ORDER BY id LIMIT 1
+        ) AS ws ON TRUE
+        CROSS JOIN LATERAL (
+            SELECT CASE
+                WHEN (sd.id IS NOT NULL OR COALESCE(ws.is_available, FALSE))
+                    AND COALESCE(sd.start_time, ws.start_time)::time < COALESCE(sd.end_time, ws.end_time)::time
+                THEN tstzrange(
+                    (d.day + COALESCE(sd.start_time, ws.start_time)::time) AT TIME ZONE 'UTC',
+                    (d.day + COALESCE(sd.end_time, ws.end_time)::time) AT TIME ZONE 'UTC',
+                    '[)'
+                )
+            END AS r
+        ) AS win
+        LEFT JOIN LATERAL (
+            SELECT range_agg(tstzrange(u.start_time, u.end_time, '[)')) AS busy
+            FROM teacher_unavailable u
+            WHERE u.teacher_telegram_id = :teacher_telegram_id
+              AND tstzrange(u.start_time, u.end_time, '[)') && win.r
+        ) AS u ON TRUE
+    ) AS w
+    ORDER BY w.day
+""")
+
+async def get_teacher_effective_days(
+    db: AsyncSession,
+    teacher_telegram_id: int,
+    start: date,
+    end: date
+) -> List[dict]:
+    result = await db.execute(
+        EFFECTIVE_DAYS_SQL,
+        {"teacher_telegram_id": teacher_telegram_id, "start": start, "end": end}
+    )
+    days = []
+    for row in result.mappings().all():
+        intervals = [{"start": s, "end": e} for s, e in zip(row["interval_starts"], row["interval_ends"])]
+        days.append({
+            "date": row["date"],
+            # День активен, если после вычета недоступности от окна что-то осталось
+            "is_active": bool(intervals),
+            "start_time": row["start_time"],
+            "end_time": row["end_time"],
+            "intervals": intervals
+        })
+    return days
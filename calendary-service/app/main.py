@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from app.api.calendary import router as api_router
+from app.database import pool_stats
 
 app = FastAPI(
     title="calendary-service",
@@ -26,5 +27,10 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "calendar-service"}
 
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Состояние пула соединений с базой"""
+    return pool_stats()
+
 # Подключаем API роутеры
 app.include_router(api_router)
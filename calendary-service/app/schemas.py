@@ -52,6 +52,23 @@ class CalendarResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class EffectiveInterval(BaseModel):
+    start: datetime
+    end: datetime
+
+class EffectiveDayResponse(BaseModel):
+    """
+    Рабочее окно дня (разовый день важнее недельного расписания) и свободные интервалы —
+    окно за вычетом периодов недоступности
+    """
+    date: date
+    is_active: bool
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    intervals: List[EffectiveInterval] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
 # Схемы для временных слотов
 class TimeSlotResponse(BaseModel):
     time: str
@@ -101,3 +118,15 @@ class TeacherScheduleFullResponse(BaseModel):
     unavailable_periods: List[TeacherUnavailableResponse]
 
     model_config = ConfigDict(from_attributes=True)
+
+class TeachersFullScheduleRequest(BaseModel):
+    teacher_telegram_ids: List[int] = Field(..., max_length=500)
+    start: date
+    end: date
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TeacherScheduleFullBatchItem(TeacherScheduleFullResponse):
+    teacher_telegram_id: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,83 @@
+import inspect
+from datetime import date, datetime, timezone
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.database import engine, get_db, pool_stats
+from app.main import app
+
+
+class FakeMappings:
+  def __init__(self, rows: list):
+    self._rows = rows
+
+  def all(self) -> list:
+    return self._rows
+
+
+class FakeResult:
+  def __init__(self, rows: list):
+    self._rows = rows
+
+  def mappings(self) -> FakeMappings:
+    return FakeMappings(self._rows)
+
+
+class FakeAsyncSession:
+  """Асинхронная сессия без базы: execute — корутина, как у AsyncSession"""
+
+  def __init__(self, rows: list):
+    self.rows = rows
+    self.executed = []
+
+  async def execute(self, stmt, params=None):
+    self.executed.append(params)
+    return FakeResult(self.rows)
+
+
+def test_all_endpoints_are_coroutines():
+  routes = [route for route in app.routes if isinstance(route, APIRoute)]
+
+  assert routes
+  # Синхронный обработчик FastAPI унес бы в threadpool, где он держал бы поток на время запроса к БД
+  assert [route.path for route in routes if not inspect.iscoroutinefunction(route.endpoint)] == []
+  assert inspect.isasyncgenfunction(get_db)
+
+
+def test_engine_is_async_with_configured_pool():
+  assert isinstance(engine, AsyncEngine)
+  assert engine.dialect.driver == "asyncpg"
+  assert engine.pool.size() == settings.DB_POOL_SIZE
+  assert engine.pool._max_overflow == settings.DB_MAX_OVERFLOW
+  assert pool_stats() == {"size": settings.DB_POOL_SIZE, "checked_in": 0, "checked_out": 0, "overflow": -settings.DB_POOL_SIZE}
+
+
+def test_effective_days_endpoint_awaits_session():
+  day = date(2025, 3, 3)
+  session = FakeAsyncSession([{
+    "date": day,
+    "start_time": "09:00",
+    "end_time": "18:00",
+    "interval_starts": [datetime(2025, 3, 3, 9, tzinfo=timezone.utc), datetime(2025, 3, 3, 13, tzinfo=timezone.utc)],
+    "interval_ends": [datetime(2025, 3, 3, 12, tzinfo=timezone.utc), datetime(2025, 3, 3, 18, tzinfo=timezone.utc)],
+  }])
+
+  async def override_get_db():
+    yield session
+
+  app.dependency_overrides[get_db] = override_get_db
+  try:
+    client = TestClient(app)
+    response = client.get("/calendary/teacher/7/effective-days", params={"start": "2025-03-03", "end": "2025-03-03"})
+    too_long = client.get("/calendary/teacher/7/effective-days", params={"start": "2025-01-01", "end": "2025-12-31"})
+  finally:
+    app.dependency_overrides.clear()
+
+  assert response.status_code == 200
+  assert session.executed == [{"teacher_telegram_id": 7, "start": day, "end": day}]
+  body = response.json()
+  assert [(d["date"], d["is_active"], len(d["intervals"])) for d in body] == [("2025-03-03", True, 2)]
+  assert too_long.status_code == 400
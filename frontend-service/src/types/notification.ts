@@ -12,6 +12,8 @@ export interface NotificationSettings {
   marketing_messages: boolean;
   quiet_hours_start: string | null;
   quiet_hours_end: string | null;
+  digest_enabled: boolean;
+  digest_window_minutes: number | null;
   created_at: string;
   updated_at: string | null;
 }
@@ -60,6 +60,11 @@ async def get_student_groups(db: AsyncSession = Depends(get_db), current_user=De
   groups = await crud.get_groups_by_student(db, telegram_id)
   return groups
 
+@router.post("/by-ids", response_model=List[GetGroup])
+async def get_groups_by_ids(group_ids: List[int], db: AsyncSession = Depends(get_db)):
+  """Пакетное получение групп по списку id"""
+  return await crud.get_groups_by_ids(db, list(set(group_ids)))
+
 @router.get("/{group_id}", response_model=GetGroup)
 async def get_group_by_id(group_id: int, db: AsyncSession = Depends(get_db)):
   group = await crud.get_group(db, group_id)
@@ -134,27 +139,22 @@ async def remove_member(
       except Exception as e:
         logger.error(f"Failed to get student data from auth-service: {e}")
 
-    title = "❌ Вас удалили из группы"
-    message = (
-      f"Здравствуйте, {student_name}!\n\n"
-      f"Вас удалили из группы:\n"
-      f"📚 <b>Группа:</b> {group.name}\n"
-      f"🌐 <b>Язык:</b> {group.language}\n"
-      f"📊 <b>Уровень:</b> {group.level}"
-    )
-
     notification_data = {
       "chat_id": student_telegram_id,
-      "title": title,
-      "message": message,
       "notification_type": "group_member_removed",
+      "params": {
+        "student_name": student_name,
+        "group_name": group.name,
+        "language": group.language,
+        "level": group.level
+      },
       "user_id": student_user_id,
       "telegram_id": student_telegram_id,
       "group_id": group.id,
       "group_name": group.name
     }
 
-    await rabbitmq_client.publish_notification(notification_data, routing_key="telegram")
+    await rabbitmq_client.publish_notification(notification_data, routing_key="notifications.templated")
     logger.info(f"Group member removed notification sent to student {student_telegram_id}")
   except Exception as e:
     logger.error(f"Failed to send group member removed notification: {e}")
@@ -222,27 +222,17 @@ async def create_invitation(data: InvitationCreateRequest, db: AsyncSession = De
       frontend_url = os.getenv("FRONTEND_URL", "https://unseemly-adorable-razorbill.cloudpub.ru")
       invite_url = f"{frontend_url}/groups/invite/{invitation.invite_token}"
 
-      title = "📩 Приглашение в группу"
-      message_parts = [
-        f"Здравствуйте, {student_name}!\n\n",
-        f"Вас приглашают присоединиться к группе:\n",
-        f"📚 <b>Группа:</b> {group.name}\n",
-        f"🌐 <b>Язык:</b> {group.language}\n",
-        f"📊 <b>Уровень:</b> {group.level}\n"
-      ]
-      
-      if data.message:
-        message_parts.append(f"\n💬 <b>Сообщение:</b>\n{data.message}\n")
-      
-      message_parts.append(f"\n🔗 <b>Ссылка для присоединения:</b>\n{invite_url}")
-      
-      message = "".join(message_parts)
-
       notification_data = {
         "chat_id": data.student_telegram_id,
-        "title": title,
-        "message": message,
         "notification_type": "group_invitation",
+        "params": {
+          "student_name": student_name,
+          "group_name": group.name,
+          "language": group.language,
+          "level": group.level,
+          "invitation_message": data.message,
+          "invite_url": invite_url
+        },
         "user_id": student_user_id,
         "telegram_id": data.student_telegram_id,
         "group_id": group.id,
@@ -250,7 +240,7 @@ async def create_invitation(data: InvitationCreateRequest, db: AsyncSession = De
         "invite_token": invitation.invite_token
       }
 
-      await rabbitmq_client.publish_notification(notification_data, routing_key="telegram")
+      await rabbitmq_client.publish_notification(notification_data, routing_key="notifications.templated")
       logger.info(f"Group invitation notification sent to student {data.student_telegram_id}")
     except Exception as e:
       logger.error(f"Failed to send group invitation notification: {e}")
@@ -309,34 +299,25 @@ async def accept_invitation(
         except Exception as e:
           logger.error(f"Failed to get student data from auth-service: {e}")
 
-      title = "✅ Вы присоединились к группе"
-      message_parts = [
-        f"Поздравляем, {student_name}!\n\n",
-        f"Вы успешно присоединились к группе:\n",
-        f"📚 <b>Группа:</b> {group.name}\n",
-        f"🌐 <b>Язык:</b> {group.language}\n",
-        f"📊 <b>Уровень:</b> {group.level}\n",
-        f"👥 <b>Участников:</b> {group.current_students}/{group.max_students}"
-      ]
-      
-      # Добавляем сообщение из приглашения, если оно есть
-      if invitation.message:
-        message_parts.append(f"\n💬 <b>Сообщение от преподавателя:</b>\n{invitation.message}")
-      
-      message = "".join(message_parts)
-
       notification_data = {
         "chat_id": invitation.student_telegram_id,
-        "title": title,
-        "message": message,
         "notification_type": "group_invitation_accepted",
+        "params": {
+          "student_name": student_name,
+          "group_name": group.name,
+          "language": group.language,
+          "level": group.level,
+          "current_students": group.current_students,
+          "max_students": group.max_students,
+          "invitation_message": invitation.message
+        },
         "user_id": student_user_id,
         "telegram_id": invitation.student_telegram_id,
         "group_id": group.id,
         "group_name": group.name
       }
 
-      await rabbitmq_client.publish_notification(notification_data, routing_key="telegram")
+      await rabbitmq_client.publish_notification(notification_data, routing_key="notifications.templated")
       logger.info(f"Group invitation accepted notification sent to student {invitation.student_telegram_id}")
     except Exception as e:
       logger.error(f"Failed to send group invitation accepted notification: {e}")
@@ -6,6 +6,19 @@ class Settings(BaseSettings):
   POSTGRES_DB: str
   DB_HOST: str
 
+  # Пул соединений и логирование SQL (см. app/database.py)
+  DB_POOL_SIZE: int = 10
+  DB_MAX_OVERFLOW: int = 20
+  DB_POOL_PRE_PING: bool = True
+  DB_POOL_RECYCLE: int = 1800  # сек, -1 — не пересоздавать соединения
+  DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 — без ограничения
+  DB_ECHO: bool = False
+  DB_SLOW_QUERY_MS: int = 0  # порог лога медленных запросов, 0 — выключен
+
+  # Проверка JWT локально — тот же секрет, что и в auth-service
+  SECRET_KEY: str = "your-secret-key-here"
+  ALGORITHM: str = "HS256"
+
   @property
   def DATABASE_URL(self) -> str:
     return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.DB_HOST}:5432/{self.POSTGRES_DB}"
@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.models import Group, GroupMember, GroupInvitation
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timedelta
 import uuid
 
@@ -52,6 +52,12 @@ async def get_group(db: AsyncSession, group_id: int) -> Optional[Group]:
     result = await db.execute(select(Group).filter(Group.id == group_id))
     return result.scalars().first()
 
+async def get_groups_by_ids(db: AsyncSession, group_ids: List[int]) -> List[Group]:
+    if not group_ids:
+        return []
+    result = await db.execute(select(Group).filter(Group.id.in_(group_ids)))
+    return result.scalars().all()
+
 async def add_member(db: AsyncSession, group: Group, student_telegram_id: int):
     existing_member = await db.execute(
         select(GroupMember).filter(
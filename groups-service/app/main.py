@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import groups
 from app.core.rabbitmq import rabbitmq_client
+from app.database import pool_stats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,6 +30,11 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "groups-service"}
 
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Состояние пула соединений с базой"""
+    return pool_stats()
+
 # Подключаем роутеры
 app.include_router(groups.router, prefix="/groups", tags=["groups"])
 
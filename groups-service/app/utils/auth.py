@@ -1,33 +1,36 @@
-from fastapi import Header, HTTPException, status, Depends
+from fastapi import Header, HTTPException, status
 from typing import Optional
-import httpx
+import jwt
 
-AUTH_SERVICE_URL = "http://auth-service:8002/auth/user"
+from app.config import settings
 
-async def get_current_user(
-  authorization: Optional[str] = Header(None)
-):
+def _extract_token(authorization: Optional[str]) -> str:
   if not authorization or not authorization.startswith("Bearer "):
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authorization header required")
+  return authorization[7:]  # убираем "Bearer "
 
-  token = authorization[7:]  # убираем "Bearer "
-
-  async with httpx.AsyncClient() as client:
-    try:
-      response = await client.get(
-        AUTH_SERVICE_URL,
-        headers={"Authorization": f"Bearer {token}"}
-      )
-    except httpx.RequestError as e:
-      raise HTTPException(status_code=502, detail=f"Auth service request error: {str(e)}")
+async def get_current_user(
+  authorization: Optional[str] = Header(None)
+):
+  """
+  Пользователь из claims JWT — токен проверяется локально (HS256, общий SECRET_KEY),
+  без запроса в auth-service на каждый вызов
+  """
+  token = _extract_token(authorization)
 
-  if response.status_code == 401:
+  try:
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+  except jwt.ExpiredSignatureError:
+    raise HTTPException(status_code=401, detail="Token has expired")
+  except jwt.InvalidTokenError:
     raise HTTPException(status_code=401, detail="Invalid or expired token")
-  elif response.status_code != 200:
-    raise HTTPException(status_code=response.status_code, detail="Auth service error")
 
-  user_data = response.json()
-  if not user_data.get("id"):
+  if not payload.get("sub") or payload.get("telegram_id") is None or not payload.get("role"):
     raise HTTPException(status_code=401, detail="Invalid user data received")
 
-  return user_data
+  return {
+    "id": payload["sub"],
+    "telegram_id": payload["telegram_id"],
+    "role": payload["role"],
+    "token": token,
+  }
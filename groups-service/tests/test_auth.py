@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.utils.auth import get_current_user
+
+
+def _token(claims: dict, expires_in: timedelta = timedelta(minutes=30), secret: str = None) -> str:
+  payload = {"exp": datetime.now(timezone.utc) + expires_in, **claims}
+  return jwt.encode(payload, secret or settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def _current_user(authorization):
+  return asyncio.run(get_current_user(authorization))
+
+
+def test_valid_token_is_decoded_locally():
+  token = _token({"sub": "42", "telegram_id": 1001, "role": "teacher"})
+
+  assert _current_user(f"Bearer {token}") == {"id": "42", "telegram_id": 1001, "role": "teacher", "token": token}
+
+
+def test_expired_token():
+  token = _token({"sub": "42", "telegram_id": 1001, "role": "teacher"}, expires_in=timedelta(seconds=-1))
+
+  with pytest.raises(HTTPException) as exc:
+    _current_user(f"Bearer {token}")
+  assert exc.value.status_code == 401
+  assert exc.value.detail == "Token has expired"
+
+
+@pytest.mark.parametrize("claims", [
+  {"sub": "42", "role": "teacher"},
+  {"sub": "42", "telegram_id": 1001},
+  {"telegram_id": 1001, "role": "teacher"},
+])
+def test_token_without_required_claims(claims):
+  with pytest.raises(HTTPException) as exc:
+    _current_user(f"Bearer {_token(claims)}")
+  assert exc.value.status_code == 401
+  assert exc.value.detail == "Invalid user data received"
+
+
+@pytest.mark.parametrize("authorization", [None, "Token abc", "Bearer not-a-jwt"])
+def test_missing_or_malformed_token(authorization):
+  with pytest.raises(HTTPException) as exc:
+    _current_user(authorization)
+  assert exc.value.status_code == 401
+
+
+def test_token_signed_with_other_secret():
+  token = _token({"sub": "42", "telegram_id": 1001, "role": "teacher"}, secret="other-secret")
+
+  with pytest.raises(HTTPException) as exc:
+    _current_user(f"Bearer {token}")
+  assert exc.value.detail == "Invalid or expired token"
@@ -0,0 +1,31 @@
+"""add range query indexes
+
+Revision ID: 5c1e7a9d2b34
+Revises: 04f6f29a8ba1
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d2b34'
+down_revision: Union[str, None] = '04f6f29a8ba1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_lessons_teacher_telegram_id'), 'lessons', ['teacher_telegram_id'], unique=False)
+    op.create_index('ix_lesson_sessions_lesson_id_start_time', 'lesson_sessions', ['lesson_id', 'start_time'], unique=False)
+    op.create_index('ix_lesson_participants_lesson_id_student_id', 'lesson_participants', ['lesson_id', 'student_id'], unique=False)
+    op.create_index('ix_lesson_participants_lesson_id_group_id', 'lesson_participants', ['lesson_id', 'group_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lesson_participants_lesson_id_group_id', table_name='lesson_participants')
+    op.drop_index('ix_lesson_participants_lesson_id_student_id', table_name='lesson_participants')
+    op.drop_index('ix_lesson_sessions_lesson_id_start_time', table_name='lesson_sessions')
+    op.drop_index(op.f('ix_lessons_teacher_telegram_id'), table_name='lessons')
@@ -0,0 +1,58 @@
+"""add session overlap exclusion constraint
+
+Revision ID: 9e4b2f6a8c17
+Revises: 5c1e7a9d2b34
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b2f6a8c17'
+down_revision: Union[str, None] = '5c1e7a9d2b34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # btree_gist нужен для оператора "=" по BIGINT внутри GiST-индекса
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.add_column('lesson_sessions', sa.Column('teacher_telegram_id', sa.BigInteger(), nullable=True))
+    op.execute(
+        "UPDATE lesson_sessions AS s SET teacher_telegram_id = l.teacher_telegram_id "
+        "FROM lessons AS l WHERE l.id = s.lesson_id"
+    )
+    op.alter_column('lesson_sessions', 'teacher_telegram_id', nullable=False)
+    # Выборка сессий преподавателя по диапазону дат: равенство по преподавателю + диапазон по start_time
+    op.create_index('ix_lesson_sessions_teacher_telegram_id_start_time', 'lesson_sessions', ['teacher_telegram_id', 'start_time'], unique=False)
+
+    op.add_column('lesson_sessions', sa.Column(
+        'time_range',
+        postgresql.TSTZRANGE(),
+        sa.Computed("tstzrange(start_time, end_time, '[)')", persisted=True),
+        nullable=True
+    ))
+
+    # Упадет, если в данных уже есть пересекающиеся сессии — их нужно разобрать вручную.
+    # Отмененные сессии слот не занимают (так же их считает расчет свободных слотов)
+    op.create_exclude_constraint(
+        'excl_lesson_sessions_teacher_overlap',
+        'lesson_sessions',
+        ('teacher_telegram_id', '='),
+        ('time_range', '&&'),
+        using='gist',
+        where="status <> 'CANCELLED'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('excl_lesson_sessions_teacher_overlap', 'lesson_sessions', type_='exclude')
+    op.drop_column('lesson_sessions', 'time_range')
+    op.drop_index('ix_lesson_sessions_teacher_telegram_id_start_time', table_name='lesson_sessions')
+    op.drop_column('lesson_sessions', 'teacher_telegram_id')
@@ -0,0 +1,39 @@
+"""add outbox events
+
+Revision ID: a3f6d8b2c914
+Revises: 9e4b2f6a8c17
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f6d8b2c914'
+down_revision: Union[str, None] = '9e4b2f6a8c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('routing_key', sa.String(length=100), nullable=False),
+        sa.Column('aggregate_id', sa.BigInteger(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_events_aggregate_id_id', 'outbox_events', ['aggregate_id', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_events_aggregate_id_id', table_name='outbox_events')
+    op.drop_table('outbox_events')
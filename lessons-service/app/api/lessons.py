@@ -1,20 +1,104 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta, timezone
 from typing import List, Optional
 
 from ..database import get_async_db
 from .. import crud, schemas
-from ..services.availability import compute_free_slots
+from ..services.availability import compute_free_slots, search_availability
 
 router = APIRouter()
 
+# Максимальная длина диапазона для /free-slots (дней)
+MAX_FREE_SLOTS_DAYS = 62
+# Максимум преподавателей в одном поиске свободных слотов
+MAX_SEARCH_TEACHERS = 500
+
 # ---- LESSON ----
 @router.post("", response_model=schemas.LessonResponse)
 async def create_lesson(payload: schemas.LessonCreate, db: AsyncSession = Depends(get_async_db)):
   return await crud.create_lesson(db, payload)
 
+
+# ---- FREE SLOTS ----
+# Объявлен до "/{lesson_id}", иначе путь перехватывается роутом урока
+@router.get("/free-slots", response_model=schemas.FreeSlotsResponse)
+async def free_slots(
+  teacher_telegram_id: int,
+  the_date: Optional[date] = Query(None, description="YYYY-MM-DD (один день)"),
+  date_from: Optional[date] = Query(None, alias="from", description="YYYY-MM-DD, начало диапазона"),
+  date_to: Optional[date] = Query(None, alias="to", description="YYYY-MM-DD, конец диапазона включительно"),
+  slot_minutes: Optional[int] = Query(None, gt=0),
+  step_minutes: Optional[int] = Query(None, gt=0),
+  buffer_minutes: Optional[int] = Query(None, ge=0),
+  db: AsyncSession = Depends(get_async_db)
+):
+  date_from = date_from or the_date
+  if not date_from:
+    raise HTTPException(400, "Provide the_date or from")
+  date_to = date_to or date_from
+  if date_to < date_from:
+    raise HTTPException(400, "'to' must not be earlier than 'from'")
+  if (date_to - date_from).days > MAX_FREE_SLOTS_DAYS:
+    raise HTTPException(400, f"Range is limited to {MAX_FREE_SLOTS_DAYS} days")
+
+  range_start = datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+  range_end = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+  existing = await crud.list_busy_intervals(db, teacher_telegram_id, range_start, range_end)
+
+  slots = await compute_free_slots(
+    teacher_telegram_id=teacher_telegram_id,
+    date_from=date_from,
+    date_to=date_to,
+    existing_sessions=existing,
+    slot_minutes=slot_minutes,
+    step_minutes=step_minutes,
+    buffer_minutes=buffer_minutes
+  )
+  return schemas.FreeSlotsResponse(
+    teacher_telegram_id=teacher_telegram_id,
+    date=date_from.isoformat(),
+    date_to=date_to.isoformat(),
+    slots=slots
+  )
+
+
+@router.post("/availability/search", response_model=List[schemas.TeacherAvailability])
+async def search_free_teachers(
+  req: schemas.AvailabilitySearchRequest,
+  db: AsyncSession = Depends(get_async_db)
+):
+  """
+  Поиск свободных преподавателей: кто из преподавателей языка/уровня свободен в заданное окно.
+  Диапазон, шаг, длина слота и limit проверяются в схеме запроса
+  """
+  if req.teacher_telegram_ids:
+    teacher_ids = list(dict.fromkeys(req.teacher_telegram_ids))
+  else:
+    teacher_ids = await crud.list_teacher_ids(db, req.language, req.level)
+  if len(teacher_ids) > MAX_SEARCH_TEACHERS:
+    raise HTTPException(400, f"Search is limited to {MAX_SEARCH_TEACHERS} teachers")
+
+  range_start = datetime.combine(req.date_from, time.min, tzinfo=timezone.utc)
+  range_end = datetime.combine(req.date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+  busy = await crud.list_busy_intervals_by_teachers(db, teacher_ids, range_start, range_end)
+
+  return await search_availability(
+    teacher_telegram_ids=teacher_ids,
+    date_from=req.date_from,
+    date_to=req.date_to,
+    busy_by_teacher=busy,
+    time_from=req.time_from,
+    time_to=req.time_to,
+    weekdays=req.weekdays,
+    slot_minutes=req.slot_minutes,
+    step_minutes=req.step_minutes,
+    buffer_minutes=req.buffer_minutes,
+    limit=req.limit
+  )
+
+
 @router.get("/{lesson_id}", response_model=schemas.LessonResponse)
 async def get_lesson(lesson_id: int, db: AsyncSession = Depends(get_async_db)):
   obj = await crud.get_lesson(db, lesson_id)
@@ -72,7 +156,10 @@ async def update_session(session_id: int, payload: schemas.LessonSessionUpdate,
   obj = await crud.get_session(db, session_id)
   if not obj:
     raise HTTPException(404, "Session not found")
-  return await crud.update_session(db, obj, payload)
+  try:
+    return await crud.update_session(db, obj, payload)
+  except ValueError as e:
+    raise HTTPException(400, str(e))
 
 @router.delete("/sessions/{session_id}", status_code=204)
 async def delete_session(session_id: int, db: AsyncSession = Depends(get_async_db)):
@@ -117,31 +204,6 @@ async def list_attendance(lesson_id: int, db: AsyncSession = Depends(get_async_d
   return await crud.list_attendance(db, lesson_id)
 
 
-# ---- FREE SLOTS ----
-@router.get("/free-slots", response_model=schemas.FreeSlotsResponse)
-async def free_slots(
-  teacher_telegram_id: int,
-  the_date: date = Query(..., description="YYYY-MM-DD"),
-  db: AsyncSession = Depends(get_async_db)
-):
-  day_start = datetime(the_date.year, the_date.month, the_date.day, 0, 0, 0)
-  day_end = datetime(the_date.year, the_date.month, the_date.day, 23, 59, 59)
-
-  sessions = await crud.list_sessions_by_teacher_and_range(db, teacher_telegram_id, day_start, day_end)
-  existing = [(s.start_time, s.end_time) for s in sessions]
-
-  slots = await compute_free_slots(
-    teacher_telegram_id=teacher_telegram_id,
-    the_date=the_date,
-    existing_sessions=existing
-  )
-  return schemas.FreeSlotsResponse(
-    teacher_telegram_id=teacher_telegram_id,
-    date=the_date.isoformat(),
-    slots=slots
-  )
-
-
 # ---- ENROLLMENT ----
 @router.post("/enroll", response_model=schemas.LessonParticipantResponse)
 async def enroll_to_lesson(
@@ -6,6 +6,30 @@ class Settings(BaseSettings):
   POSTGRES_DB: str
   DB_HOST: str
 
+  # Пул соединений и логирование SQL (см. app/database.py)
+  DB_POOL_SIZE: int = 10
+  DB_MAX_OVERFLOW: int = 20
+  DB_POOL_PRE_PING: bool = True
+  DB_POOL_RECYCLE: int = 1800  # сек, -1 — не пересоздавать соединения
+  DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 — без ограничения
+  DB_ECHO: bool = False
+  DB_SLOW_QUERY_MS: int = 0  # порог лога медленных запросов, 0 — выключен
+
+  CALENDARY_SERVICE_URL: str = "http://calendary-service:8006"
+
+  # Параметры расчета свободных слотов (минуты)
+  AVAILABILITY_SLOT_MINUTES: int = 60
+  AVAILABILITY_STEP_MINUTES: int = 60
+  AVAILABILITY_BUFFER_MINUTES: int = 0
+
+  # Relay transactional outbox: размер пачки, интервал опроса (сек), число попыток публикации
+  # и экспоненциальная пауза между попытками (сек)
+  OUTBOX_BATCH_SIZE: int = 100
+  OUTBOX_POLL_INTERVAL: float = 1.0
+  OUTBOX_MAX_ATTEMPTS: int = 10
+  OUTBOX_RETRY_BASE_DELAY: float = 2.0
+  OUTBOX_RETRY_MAX_DELAY: float = 300.0
+
   @property
   def DATABASE_URL(self) -> str:
     return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.DB_HOST}:5432/{self.POSTGRES_DB}"
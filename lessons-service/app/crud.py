@@ -1,20 +1,27 @@
 # app/crud.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, exists, or_
+from sqlalchemy import select, and_, func, true
+from sqlalchemy.exc import DataError, IntegrityError
 from datetime import datetime, timezone, date as date_cls
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
-from sqlalchemy.orm import aliased, selectinload
-import httpx
-import os
+from sqlalchemy.orm import aliased, contains_eager
 import logging
 
 from . import models, schemas
-from .core.rabbitmq import rabbitmq_client
+from .services.outbox import outbox_relay
 
 logger = logging.getLogger(__name__)
 
-AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://auth-service:8002")
+# Exclusion constraint на пересечение сессий преподавателя (см. models.LessonSession)
+SESSION_OVERLAP_CONSTRAINT = "excl_lesson_sessions_teacher_overlap"
+
+# События для notifications-service: пишутся в outbox в транзакции изменения
+SESSION_CHANGED_ROUTING_KEY = "lesson.session.changed"
+PARTICIPANTS_CHANGED_ROUTING_KEY = "lesson.participants.changed"
+LESSON_BOOKED_ROUTING_KEY = "lesson.booked"
+LESSON_CANCELLED_ROUTING_KEY = "lesson.cancelled"
+LESSON_UPDATED_ROUTING_KEY = "lesson.updated"
 
 # -------- LESSON --------
 async def create_lesson(db: AsyncSession, data: schemas.LessonCreate) -> models.Lesson:
@@ -35,10 +42,35 @@ async def list_lessons(db: AsyncSession, teacher_telegram_id: Optional[int] = No
   result = await db.execute(stmt)
   return result.scalars().all()
 
+async def list_teacher_ids(
+  db: AsyncSession, language: Optional[str] = None, level: Optional[str] = None
+) -> List[int]:
+  """Преподаватели, у которых есть уроки с указанным языком/уровнем"""
+  stmt = select(models.Lesson.teacher_telegram_id).distinct()
+  if language:
+    stmt = stmt.where(func.lower(models.Lesson.language) == language.lower())
+  if level:
+    stmt = stmt.where(func.lower(models.Lesson.level) == level.lower())
+  result = await db.execute(stmt)
+  return list(result.scalars().all())
+
 async def update_lesson(db: AsyncSession, lesson: models.Lesson, data: schemas.LessonUpdate) -> models.Lesson:
-  for k, v in data.dict(exclude_unset=True).items():
+  changes = data.dict(exclude_unset=True)
+  for k, v in changes.items():
     setattr(lesson, k, v)
+  if changes:
+    # Название и описание урока видны в календаре — BFF сбросит снимки дней его сессий
+    sessions = await _lesson_session_times(db, lesson.id)
+    await _add_outbox_event(db, LESSON_UPDATED_ROUTING_KEY, {
+      "lesson_id": lesson.id,
+      "teacher_telegram_id": lesson.teacher_telegram_id,
+      "changed_fields": sorted(changes),
+      "session_start_times": [row.start_time.isoformat() for row in sessions],
+      "occurred_at": datetime.now(timezone.utc).isoformat()
+    })
   await db.commit()
+  if changes:
+    outbox_relay.notify()
   await db.refresh(lesson)
   return lesson
 
@@ -53,26 +85,16 @@ async def create_session(db: AsyncSession, data: schemas.LessonSessionCreate) ->
   if not lesson:
     raise ValueError("Lesson not found")
 
-  stmt = select(models.LessonSession).join(models.Lesson).where(
-    and_(
-      models.Lesson.teacher_telegram_id == lesson.teacher_telegram_id,
-      models.LessonSession.start_time < data.end_time,
-      models.LessonSession.end_time > data.start_time
-    )
-  )
-  result = await db.execute(stmt)
-  overlap = result.scalar_one_or_none()
-  if overlap:
-    raise ValueError("Teacher already has a session in this time range")
-
   obj = models.LessonSession(
     lesson_id=data.lesson_id,
+    teacher_telegram_id=lesson.teacher_telegram_id,
     start_time=data.start_time,
     end_time=data.end_time,
     status=data.status or schemas.LessonStatus.scheduled
   )
   db.add(obj)
-  await db.commit()
+  # Пересечение проверяет exclusion constraint в БД — атомарно, без отдельного SELECT
+  await _commit_session(db, obj, "created")
 
   await db.refresh(obj, attribute_names=["lesson"])
 
@@ -95,6 +117,29 @@ async def create_session(db: AsyncSession, data: schemas.LessonSessionCreate) ->
     } if obj.lesson else None
   )
 
+async def _commit_session(
+  db: AsyncSession, session: models.LessonSession, event: str, previous_start_time: Optional[datetime] = None
+) -> None:
+  try:
+    # flush до события: у новой сессии появляется id, а пересечение ловится до коммита
+    await db.flush()
+    await _add_outbox_event(
+      db, SESSION_CHANGED_ROUTING_KEY, await _session_event(db, session, event, previous_start_time)
+    )
+    await db.commit()
+    outbox_relay.notify()
+  except IntegrityError as e:
+    await db.rollback()
+    if SESSION_OVERLAP_CONSTRAINT in str(e.orig):
+      raise ValueError("Teacher already has a session in this time range")
+    raise
+  except DataError as e:
+    # tstzrange(start_time, end_time) не строится, если конец раньше начала
+    await db.rollback()
+    if "range lower bound must be less than or equal to range upper bound" in str(e.orig):
+      raise ValueError("end_time must be later than start_time")
+    raise
+
 async def get_session(db: AsyncSession, session_id: int) -> Optional[models.LessonSession]:
   result = await db.execute(select(models.LessonSession).where(models.LessonSession.id == session_id))
   return result.scalar_one_or_none()
@@ -115,48 +160,48 @@ async def list_sessions_by_teacher_and_range(
 
     LP = aliased(models.LessonParticipant)
 
-    # Подзапрос: есть ли бронирование
-    booked_exists = (
-        select(1)
-        .where(
-            and_(
-                LP.lesson_id == models.LessonSession.lesson_id,
-                or_(LP.student_id.isnot(None), LP.group_id.isnot(None)),
-            )
+    # Агрегат по участникам урока сессии (количество + первый записавшийся), чтобы групповое
+    # занятие с N участниками не размножало строки сессий. LATERAL считается только для
+    # попавших в диапазон сессий по индексу (lesson_id, ...), а не по всей lesson_participants
+    participants_agg = (
+        select(
+            func.count(models.LessonParticipant.id).label("participants_count"),
+            func.min(models.LessonParticipant.id).label("first_participant_id"),
         )
-        .limit(1)
-        .correlate(models.LessonSession)
+        .where(models.LessonParticipant.lesson_id == models.LessonSession.lesson_id)
+        .lateral("participants_agg")
     )
 
-    # Основной запрос
+    # Основной запрос: ровно одна строка на сессию
     stmt = (
         select(
             models.LessonSession,
-            exists(booked_exists).label("booked"),
+            participants_agg.c.participants_count,
             LP.student_id,
             LP.group_id,
         )
         .join(models.Lesson, models.Lesson.id == models.LessonSession.lesson_id)
-        .outerjoin(LP, LP.lesson_id == models.LessonSession.lesson_id)
-        .options(selectinload(models.LessonSession.lesson))
+        .join(participants_agg, true())
+        .outerjoin(LP, LP.id == participants_agg.c.first_participant_id)
+        .options(contains_eager(models.LessonSession.lesson))
         .where(
+            models.LessonSession.teacher_telegram_id == teacher_telegram_id,
             models.LessonSession.start_time < end_dt,
             models.LessonSession.end_time > start_dt,
-            models.Lesson.teacher_telegram_id == teacher_telegram_id,
         )
+        .order_by(models.LessonSession.start_time)
     )
 
     result = await db.execute(stmt)
     rows = result.all()
 
     sessions = []
-    for session, booked, student_id, group_id in rows:
+    for session, participants_count, student_id, group_id in rows:
         booked_by = None
-        if booked:
-            if student_id is not None:
-                booked_by = {"type": "student", "id": str(student_id)}
-            elif group_id is not None:
-                booked_by = {"type": "group", "id": group_id}
+        if student_id is not None:
+            booked_by = {"type": "student", "id": str(student_id)}
+        elif group_id is not None:
+            booked_by = {"type": "group", "id": str(group_id)}
 
         sessions.append({
             "id": session.id,
@@ -164,8 +209,9 @@ async def list_sessions_by_teacher_and_range(
             "start_time": session.start_time.isoformat(),
             "end_time": session.end_time.isoformat(),
             "status": session.status.value,
-            "booked": booked,
+            "booked": participants_count > 0,
             "booked_by": booked_by,
+            "participants_count": participants_count,
             "lesson": {
                 "id": session.lesson.id,
                 "title": session.lesson.title,
@@ -179,16 +225,65 @@ async def list_sessions_by_teacher_and_range(
 
     return sessions
 
+async def list_busy_intervals(
+    db: AsyncSession, teacher_telegram_id: int, start_dt: datetime, end_dt: datetime
+) -> List[tuple]:
+    """
+    Интервалы (start_time, end_time) неотмененных сессий преподавателя — только то,
+    что нужно для расчета свободных слотов, без join с уроками и участниками
+    """
+    stmt = (
+        select(models.LessonSession.start_time, models.LessonSession.end_time)
+        .where(
+            models.LessonSession.teacher_telegram_id == teacher_telegram_id,
+            models.LessonSession.start_time < end_dt,
+            models.LessonSession.end_time > start_dt,
+            models.LessonSession.status != models.LessonStatus.CANCELLED,
+        )
+        .order_by(models.LessonSession.start_time)
+    )
+    result = await db.execute(stmt)
+    return [(row.start_time, row.end_time) for row in result.all()]
+
+async def list_busy_intervals_by_teachers(
+    db: AsyncSession, teacher_telegram_ids: List[int], start_dt: datetime, end_dt: datetime
+) -> Dict[int, List[tuple]]:
+    """То же, что list_busy_intervals, но для многих преподавателей одним запросом"""
+    busy: Dict[int, List[tuple]] = {teacher_id: [] for teacher_id in teacher_telegram_ids}
+    if not teacher_telegram_ids:
+        return busy
+
+    stmt = (
+        select(
+            models.LessonSession.teacher_telegram_id,
+            models.LessonSession.start_time,
+            models.LessonSession.end_time,
+        )
+        .where(
+            models.LessonSession.teacher_telegram_id.in_(teacher_telegram_ids),
+            models.LessonSession.start_time < end_dt,
+            models.LessonSession.end_time > start_dt,
+            models.LessonSession.status != models.LessonStatus.CANCELLED,
+        )
+    )
+    result = await db.execute(stmt)
+    for row in result.all():
+        busy[row.teacher_telegram_id].append((row.start_time, row.end_time))
+    return busy
+
 async def update_session(db: AsyncSession, session: models.LessonSession, data: schemas.LessonSessionUpdate) -> models.LessonSession:
+  previous_start_time = session.start_time
   for k, v in data.dict(exclude_unset=True).items():
     setattr(session, k, v)
-  await db.commit()
+  await _commit_session(db, session, "updated", previous_start_time)
   await db.refresh(session)
   return session
 
 async def delete_session(db: AsyncSession, session: models.LessonSession) -> None:
+  await _add_outbox_event(db, SESSION_CHANGED_ROUTING_KEY, await _session_event(db, session, "deleted"))
   await db.delete(session)
   await db.commit()
+  outbox_relay.notify()
 
 
 # -------- PARTICIPANT --------
@@ -204,7 +299,10 @@ async def add_participant(db: AsyncSession, data: schemas.LessonParticipantCreat
     confirmation_date=datetime.utcnow() if data.is_confirmed else None
   )
   db.add(obj)
+  await db.flush()
+  await _add_participants_changed(db, obj.lesson_id)
   await db.commit()
+  outbox_relay.notify()
   await db.refresh(obj)
   return obj
 
@@ -216,182 +314,22 @@ async def set_participant_confirmed(db: AsyncSession, participant: models.Lesson
   return participant
 
 async def remove_participant(db: AsyncSession, participant: models.LessonParticipant, cancelled_by_telegram_id: Optional[int] = None) -> None:
-  # Получаем данные урока и участника перед удалением
-  lesson = await get_lesson(db, participant.lesson_id)
+  lesson_id = participant.lesson_id
   student_id = participant.student_id
 
   await db.delete(participant)
+  await db.flush()
+  await _add_participants_changed(db, lesson_id)
+  # Уведомление об отмене отправит relay outbox — не в запросе
+  if student_id:
+    await _add_outbox_event(db, LESSON_CANCELLED_ROUTING_KEY, {
+      "lesson_id": lesson_id,
+      "student_id": str(student_id),
+      "cancelled_by_telegram_id": cancelled_by_telegram_id,
+      "occurred_at": datetime.now(timezone.utc).isoformat()
+    })
   await db.commit()
-
-  # Отправляем уведомление только тому, кто НЕ отменял запись
-  if lesson and student_id:
-    try:
-      # Получаем первую сессию урока для даты и времени
-      sessions_stmt = select(models.LessonSession).where(
-        models.LessonSession.lesson_id == lesson.id
-      ).order_by(models.LessonSession.start_time)
-      sessions_result = await db.execute(sessions_stmt)
-      first_session = sessions_result.scalars().first()
-
-      # Получаем данные студента из auth-service
-      student_telegram_id = None
-      student_name = "Студент"
-      async with httpx.AsyncClient() as client:
-        try:
-          user_response = await client.get(
-            f"{AUTH_SERVICE_URL}/auth/user-by-uuid/{student_id}",
-            timeout=10
-          )
-          if user_response.status_code == 200:
-            student_data = user_response.json()
-            student_name = student_data.get("full_name", "Студент")
-            student_telegram_id = student_data.get("telegram_id")
-        except Exception as e:
-          logger.error(f"Failed to get student data from auth-service: {e}")
-
-      # Формируем информацию о дате и времени
-      if first_session:
-        session_date = first_session.start_time.strftime("%d.%m.%Y")
-        session_time = first_session.start_time.strftime("%H:%M")
-        date_time_info = f"{session_date} в {session_time}"
-      else:
-        date_time_info = "дата и время уточняются"
-
-      # Определяем, кто отменяет запись (студент или учитель)
-      is_cancelled_by_teacher = cancelled_by_telegram_id and cancelled_by_telegram_id == lesson.teacher_telegram_id
-      is_cancelled_by_student = cancelled_by_telegram_id and student_telegram_id and cancelled_by_telegram_id == student_telegram_id
-
-      # Отправляем уведомление только тому, кто НЕ отменял запись
-      # Если отменяет учитель - уведомляем студента
-      # Если отменяет студент - уведомляем учителя
-
-      if is_cancelled_by_teacher:
-        # Учитель отменяет - уведомляем студента
-        if student_telegram_id:
-          student_title = "❌ Запись отменена"
-          student_message = (
-            f"Ваша запись на занятие была отменена преподавателем.\n\n"
-            f"📖 <b>Урок:</b> {lesson.title}\n"
-            f"📅 <b>Дата и время:</b> {date_time_info}\n"
-            f"🌐 <b>Язык:</b> {lesson.language}\n"
-            f"📊 <b>Уровень:</b> {lesson.level}"
-          )
-
-          student_notification = {
-            "chat_id": student_telegram_id,
-            "title": student_title,
-            "message": student_message,
-            "notification_type": "lesson_cancellation",
-            "user_id": str(student_id),
-            "telegram_id": student_telegram_id
-          }
-
-          await rabbitmq_client.publish_notification(student_notification, routing_key="telegram")
-          logger.info(f"Cancellation notification sent to student {student_telegram_id} (cancelled by teacher)")
-      elif is_cancelled_by_student:
-        # Студент отменяет - уведомляем учителя
-        # Получаем user_id преподавателя из auth-service
-        teacher_user_id = None
-        async with httpx.AsyncClient() as client:
-          try:
-            teacher_response = await client.get(
-              f"{AUTH_SERVICE_URL}/auth/user-by-telegram/{lesson.teacher_telegram_id}",
-              timeout=10
-            )
-            if teacher_response.status_code == 200:
-              teacher_data = teacher_response.json()
-              teacher_user_id = str(teacher_data.get("id"))
-              logger.info(f"Got teacher user_id: {teacher_user_id} for telegram_id: {lesson.teacher_telegram_id}")
-          except Exception as e:
-            logger.error(f"Failed to get teacher user_id: {e}")
-
-        if teacher_user_id:
-          teacher_title = "❌ Отмена записи на занятие"
-          teacher_message = (
-            f"Студент отменил запись на занятие.\n\n"
-            f"👤 <b>Студент:</b> {student_name}\n"
-            f"📖 <b>Урок:</b> {lesson.title}\n"
-            f"📅 <b>Дата и время:</b> {date_time_info}\n"
-            f"🌐 <b>Язык:</b> {lesson.language}\n"
-            f"📊 <b>Уровень:</b> {lesson.level}"
-          )
-
-          teacher_notification = {
-            "chat_id": lesson.teacher_telegram_id,
-            "title": teacher_title,
-            "message": teacher_message,
-            "notification_type": "lesson_cancellation",
-            "user_id": teacher_user_id,
-            "teacher_telegram_id": lesson.teacher_telegram_id
-          }
-
-          await rabbitmq_client.publish_notification(teacher_notification, routing_key="telegram")
-          logger.info(f"Cancellation notification sent to teacher {lesson.teacher_telegram_id} (cancelled by student)")
-      else:
-        # Если не удалось определить, кто отменяет, отправляем уведомления обоим (fallback)
-        logger.warning(f"Could not determine who cancelled the booking. cancelled_by_telegram_id={cancelled_by_telegram_id}, teacher_telegram_id={lesson.teacher_telegram_id}, student_telegram_id={student_telegram_id}")
-
-        # Получаем user_id преподавателя из auth-service
-        teacher_user_id = None
-        async with httpx.AsyncClient() as client:
-          try:
-            teacher_response = await client.get(
-              f"{AUTH_SERVICE_URL}/auth/user-by-telegram/{lesson.teacher_telegram_id}",
-              timeout=10
-            )
-            if teacher_response.status_code == 200:
-              teacher_data = teacher_response.json()
-              teacher_user_id = str(teacher_data.get("id"))
-          except Exception as e:
-            logger.error(f"Failed to get teacher user_id: {e}")
-
-        # Уведомление преподавателю
-        if teacher_user_id:
-          teacher_title = "❌ Отмена записи на занятие"
-          teacher_message = (
-            f"Запись на занятие была отменена.\n\n"
-            f"👤 <b>Студент:</b> {student_name}\n"
-            f"📖 <b>Урок:</b> {lesson.title}\n"
-            f"📅 <b>Дата и время:</b> {date_time_info}\n"
-            f"🌐 <b>Язык:</b> {lesson.language}\n"
-            f"📊 <b>Уровень:</b> {lesson.level}"
-          )
-
-          teacher_notification = {
-            "chat_id": lesson.teacher_telegram_id,
-            "title": teacher_title,
-            "message": teacher_message,
-            "notification_type": "lesson_cancellation",
-            "user_id": teacher_user_id,
-            "teacher_telegram_id": lesson.teacher_telegram_id
-          }
-
-          await rabbitmq_client.publish_notification(teacher_notification, routing_key="telegram")
-
-        # Уведомление студенту
-        if student_telegram_id:
-          student_title = "❌ Запись отменена"
-          student_message = (
-            f"Ваша запись на занятие была отменена.\n\n"
-            f"📖 <b>Урок:</b> {lesson.title}\n"
-            f"📅 <b>Дата и время:</b> {date_time_info}\n"
-            f"🌐 <b>Язык:</b> {lesson.language}\n"
-            f"📊 <b>Уровень:</b> {lesson.level}"
-          )
-
-          student_notification = {
-            "chat_id": student_telegram_id,
-            "title": student_title,
-            "message": student_message,
-            "notification_type": "lesson_cancellation",
-            "user_id": str(student_id),
-            "telegram_id": student_telegram_id
-          }
-
-          await rabbitmq_client.publish_notification(student_notification, routing_key="telegram")
-    except Exception as e:
-      # Логируем ошибку, но не прерываем процесс удаления
-      logger.error(f"Failed to send cancellation notifications: {e}")
+  outbox_relay.notify()
 
 async def get_participant(db: AsyncSession, participant_id: int) -> Optional[models.LessonParticipant]:
   result = await db.execute(select(models.LessonParticipant).where(models.LessonParticipant.id == participant_id))
@@ -454,92 +392,20 @@ async def enroll_participant(db: AsyncSession, data: schemas.EnrollmentCreate) -
     )
 
     db.add(obj)
+    await db.flush()
+    await _add_participants_changed(db, obj.lesson_id)
+    # Уведомление преподавателю отправит relay outbox — не в запросе
+    if data.student_id:
+        await _add_outbox_event(db, LESSON_BOOKED_ROUTING_KEY, {
+            "lesson_id": obj.lesson_id,
+            "participant_id": obj.id,
+            "student_id": str(data.student_id),
+            "occurred_at": datetime.now(timezone.utc).isoformat()
+        })
     await db.commit()
+    outbox_relay.notify()
     await db.refresh(obj)
 
-    # Отправляем уведомление преподавателю, если записался студент
-    if data.student_id:
-        try:
-            # Получаем первую сессию урока для даты и времени
-            sessions_stmt = select(models.LessonSession).where(
-                models.LessonSession.lesson_id == data.lesson_id
-            ).order_by(models.LessonSession.start_time)
-            sessions_result = await db.execute(sessions_stmt)
-            first_session = sessions_result.scalars().first()
-
-            # Получаем данные студента из auth-service
-            async with httpx.AsyncClient() as client:
-                try:
-                    user_response = await client.get(
-                        f"{AUTH_SERVICE_URL}/auth/user-by-uuid/{data.student_id}",
-                        timeout=10
-                    )
-                    if user_response.status_code == 200:
-                        student_data = user_response.json()
-                        student_name = student_data.get("full_name", "Студент")
-                        student_telegram_id = student_data.get("telegram_id")
-                    else:
-                        student_name = "Студент"
-                        student_telegram_id = None
-                except Exception as e:
-                    logger.error(f"Failed to get student data from auth-service: {e}")
-                    student_name = "Студент"
-                    student_telegram_id = None
-
-            # Формируем сообщение для преподавателя
-            if first_session:
-                session_date = first_session.start_time.strftime("%d.%m.%Y")
-                session_time = first_session.start_time.strftime("%H:%M")
-                date_time_info = f"{session_date} в {session_time}"
-            else:
-                date_time_info = "дата и время уточняются"
-
-            frontend_url = os.getenv("FRONTEND_URL", "https://unseemly-adorable-razorbill.cloudpub.ru")
-            calendar_url = f"{frontend_url}/calendar"
-
-            title = "📚 Новая запись на занятие"
-            message = (
-                f"К вам записался студент на занятие!\n\n"
-                f"👤 <b>Студент:</b> {student_name}\n"
-                f"📖 <b>Урок:</b> {lesson.title}\n"
-                f"📅 <b>Дата и время:</b> {date_time_info}\n"
-                f"🌐 <b>Язык:</b> {lesson.language}\n"
-                f"📊 <b>Уровень:</b> {lesson.level}\n\n"
-                f"Вы можете просмотреть более детальную информацию в календаре"
-            )
-
-            # Проверяем, включены ли уведомления для преподавателя
-            # Получаем user_id преподавателя из auth-service
-            teacher_user_id = None
-            async with httpx.AsyncClient() as client:
-                try:
-                    teacher_response = await client.get(
-                        f"{AUTH_SERVICE_URL}/auth/user-by-telegram/{lesson.teacher_telegram_id}",
-                        timeout=10
-                    )
-                    if teacher_response.status_code == 200:
-                        teacher_data = teacher_response.json()
-                        teacher_user_id = str(teacher_data.get("id"))
-                except Exception as e:
-                    logger.error(f"Failed to get teacher user_id: {e}")
-
-            # Отправляем уведомление преподавателю
-            if teacher_user_id:
-                notification_data = {
-                    "chat_id": lesson.teacher_telegram_id,
-                    "title": title,
-                    "message": message,
-                    "notification_type": "lesson_booking",
-                    "user_id": teacher_user_id,
-                    "teacher_telegram_id": lesson.teacher_telegram_id
-                }
-
-                await rabbitmq_client.publish_notification(notification_data, routing_key="telegram")
-                logger.info(f"Booking notification sent to teacher {lesson.teacher_telegram_id}")
-        except Exception as e:
-            # Логируем ошибку, но не прерываем процесс записи
-            logger.error(f"Failed to send booking notification: {e}")
-
     # Возвращаем через схему ответа с конвертацией UUID в строку
     return schemas.LessonParticipantResponse(
         id=obj.id,
@@ -593,3 +459,58 @@ async def get_participant_by_lesson_and_group(
     )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
+
+
+# -------- EVENTS --------
+async def _lesson_student_ids(db: AsyncSession, lesson_id: int) -> List[str]:
+  result = await db.execute(
+    select(models.LessonParticipant.student_id).where(
+      models.LessonParticipant.lesson_id == lesson_id,
+      models.LessonParticipant.student_id.is_not(None)
+    )
+  )
+  return [str(student_id) for student_id in result.scalars().all()]
+
+async def _session_event(
+  db: AsyncSession, session: models.LessonSession, event: str, previous_start_time: Optional[datetime] = None
+) -> Dict:
+  """
+  Снимок сессии для планировщика напоминаний и снимков календаря в BFF (created / updated / deleted).
+  previous_start_time — время до переноса, чтобы BFF сбросил и старый день
+  """
+  lesson = await get_lesson(db, session.lesson_id)
+  return {
+    "event": event,
+    "session_id": session.id,
+    "lesson_id": session.lesson_id,
+    "lesson_title": lesson.title if lesson else None,
+    "teacher_telegram_id": session.teacher_telegram_id,
+    "start_time": session.start_time.isoformat(),
+    "end_time": session.end_time.isoformat(),
+    "previous_start_time": previous_start_time.isoformat() if previous_start_time else None,
+    "status": getattr(session.status, "value", session.status),
+    "student_ids": await _lesson_student_ids(db, session.lesson_id),
+    "occurred_at": datetime.now(timezone.utc).isoformat()
+  }
+
+async def _lesson_session_times(db: AsyncSession, lesson_id: int) -> List:
+  """Преподаватель и время сессий урока — чтобы BFF сбросил снимки календаря только за затронутые дни"""
+  result = await db.execute(
+    select(models.LessonSession.teacher_telegram_id, models.LessonSession.start_time)
+    .where(models.LessonSession.lesson_id == lesson_id)
+  )
+  return result.all()
+
+async def _add_participants_changed(db: AsyncSession, lesson_id: int) -> None:
+  sessions = await _lesson_session_times(db, lesson_id)
+  await _add_outbox_event(db, PARTICIPANTS_CHANGED_ROUTING_KEY, {
+    "lesson_id": lesson_id,
+    "teacher_telegram_id": sessions[0].teacher_telegram_id if sessions else None,
+    "session_start_times": [row.start_time.isoformat() for row in sessions],
+    "student_ids": await _lesson_student_ids(db, lesson_id),
+    "occurred_at": datetime.now(timezone.utc).isoformat()
+  })
+
+async def _add_outbox_event(db: AsyncSession, routing_key: str, payload: Dict) -> None:
+  """Событие попадает в outbox в текущей транзакции и публикуется relay после коммита"""
+  db.add(models.OutboxEvent(routing_key=routing_key, aggregate_id=payload.get("lesson_id"), payload=payload))
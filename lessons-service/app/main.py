@@ -2,6 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import lessons
 from app.core.rabbitmq import rabbitmq_client
+from app.services.outbox import outbox_relay
+from app.database import pool_stats
 import asyncio
 import logging
 
@@ -29,11 +31,14 @@ async def startup_event():
     """Инициализация RabbitMQ при запуске приложения"""
     logger.info("Starting RabbitMQ connection...")
     asyncio.create_task(rabbitmq_client.connect())
+    # События из outbox публикуются в фоне, когда RabbitMQ доступен
+    outbox_relay.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Закрытие соединения с RabbitMQ при остановке"""
     logger.info("Closing RabbitMQ connection...")
+    await outbox_relay.close()
     await rabbitmq_client.close()
 
 @app.get("/")
@@ -44,6 +49,11 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "lossons-service"}
 
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Состояние пула соединений с базой"""
+    return pool_stats()
+
 
 # Подключаем роутеры
 app.include_router(lessons.router, prefix="/lessons", tags=["lessons"])
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, BigInteger, DateTime, Boolean, Text, Enum, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, String, BigInteger, DateTime, Boolean, Text, Enum, ForeignKey, CheckConstraint, Index, Computed, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSTZRANGE, ExcludeConstraint
 import uuid
 from app.database import Base
 
@@ -26,7 +26,7 @@ class Lesson(Base):
   lesson_type = Column(Enum(LessonType, name="lessontype", native_enum=False), nullable=False)
   language = Column(String(50), nullable=False)
   level = Column(String(20), nullable=False)
-  teacher_telegram_id = Column(BigInteger, nullable=False)
+  teacher_telegram_id = Column(BigInteger, nullable=False, index=True)
 
   sessions = relationship("LessonSession", back_populates="lesson")
   participants = relationship("LessonParticipant", back_populates="lesson")
@@ -41,11 +41,31 @@ class LessonSession(Base):
   end_time = Column(DateTime(timezone=True), nullable=False)
   status = Column(Enum(LessonStatus), default=LessonStatus.SCHEDULED)
 
+  # Денормализовано из lessons: пересечения сессий преподавателя проверяет сама БД
+  teacher_telegram_id = Column(BigInteger, nullable=False)
+  time_range = Column(TSTZRANGE, Computed("tstzrange(start_time, end_time, '[)')", persisted=True))
+
   created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
   updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
   lesson = relationship("Lesson", back_populates="sessions")
 
+  __table_args__ = (
+    # Сессии урока по времени (join с lessons, поиск первой сессии урока)
+    Index("ix_lesson_sessions_lesson_id_start_time", "lesson_id", "start_time"),
+    # Сессии преподавателя по диапазону дат (календарь, свободные слоты): равенство по преподавателю
+    # + диапазон по start_time; btree по (start_time, end_time) для условий пересечения почти не помогал
+    Index("ix_lesson_sessions_teacher_telegram_id_start_time", "teacher_telegram_id", "start_time"),
+    # У преподавателя не может быть двух пересекающихся по времени сессий; отмененные слот не занимают
+    ExcludeConstraint(
+      ("teacher_telegram_id", "="),
+      ("time_range", "&&"),
+      name="excl_lesson_sessions_teacher_overlap",
+      using="gist",
+      where="status <> 'CANCELLED'",
+    ),
+  )
+
 class LessonParticipant(Base):
   __tablename__ = "lesson_participants"
 
@@ -67,6 +87,9 @@ class LessonParticipant(Base):
       "NOT (student_id IS NOT NULL AND group_id IS NOT NULL)",
       name="check_student_and_group_mutually_exclusive"
     ),
+    # Проверка дубликата записи и поиск участника урока
+    Index("ix_lesson_participants_lesson_id_student_id", "lesson_id", "student_id"),
+    Index("ix_lesson_participants_lesson_id_group_id", "lesson_id", "group_id"),
   )
 
 class LessonAttendance(Base):
@@ -83,3 +106,25 @@ class LessonAttendance(Base):
   created_at = Column(DateTime(timezone=True), server_default=func.now())
 
   lesson = relationship("Lesson", back_populates="attendance")
+
+class OutboxEvent(Base):
+  """
+  Transactional outbox: событие пишется в той же транзакции, что и изменение данных,
+  а фоновый relay (app/services/outbox.py) публикует его в RabbitMQ и удаляет.
+  aggregate_id (урок) задает порядок: события одного урока публикуются строго по id
+  """
+  __tablename__ = "outbox_events"
+  __table_args__ = (
+    Index("ix_outbox_events_aggregate_id_id", "aggregate_id", "id"),
+  )
+
+  id = Column(BigInteger, primary_key=True)
+  routing_key = Column(String(100), nullable=False)
+  aggregate_id = Column(BigInteger, nullable=True)
+  payload = Column(JSON, nullable=False)
+
+  attempts = Column(Integer, nullable=False, default=0)
+  next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+  last_error = Column(Text, nullable=True)
+
+  created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,6 +1,6 @@
-from datetime import date, datetime
+from datetime import date, datetime, time
 from typing import Optional, List
-from pydantic import BaseModel, model_validator, field_validator
+from pydantic import BaseModel, Field, model_validator, field_validator
 from enum import Enum
 from uuid import UUID
 
@@ -48,11 +48,24 @@ class LessonSessionBase(BaseModel):
 class LessonSessionCreate(LessonSessionBase):
   status: Optional[LessonStatus] = LessonStatus.scheduled
 
+  @model_validator(mode='after')
+  def validate_time_range(self):
+    if self.end_time <= self.start_time:
+      raise ValueError('end_time must be later than start_time')
+    return self
+
 class LessonSessionUpdate(BaseModel):
   start_time: Optional[datetime] = None
   end_time: Optional[datetime] = None
   status: Optional[LessonStatus] = None
 
+  @model_validator(mode='after')
+  def validate_time_range(self):
+    # Если меняется только одна граница, порядок проверит БД (см. crud._commit_session)
+    if self.start_time and self.end_time and self.end_time <= self.start_time:
+      raise ValueError('end_time must be later than start_time')
+    return self
+
 class BookedBy(BaseModel):
   type: str
   id: str
@@ -74,6 +87,7 @@ class LessonSessionResponse(LessonSessionBase):
   status: LessonStatus
   booked: bool
   booked_by: Optional[BookedBy] = None
+  participants_count: int = 0
   lesson: Optional[LessonShort] = None
 
   class Config:
@@ -141,6 +155,50 @@ class TimeSlot(BaseModel):
 class FreeSlotsResponse(BaseModel):
   teacher_telegram_id: int
   date: str
+  date_to: Optional[str] = None
+  slots: List[TimeSlot]
+
+# Ограничения поиска свободных преподавателей: длина диапазона (дней) и число преподавателей в ответе
+MAX_AVAILABILITY_SEARCH_DAYS = 62
+MAX_AVAILABILITY_SEARCH_LIMIT = 100
+
+class AvailabilitySearchRequest(BaseModel):
+  language: Optional[str] = None
+  level: Optional[str] = None
+  teacher_telegram_ids: Optional[List[int]] = None  # явный список вместо поиска по language/level
+  date_from: date
+  date_to: date
+  time_from: Optional[time] = None  # окно внутри дня (UTC), например 18:00
+  time_to: Optional[time] = None    # например 20:00
+  weekdays: Optional[List[int]] = None  # 0-6 (пн-вс)
+  slot_minutes: Optional[int] = Field(None, gt=0)
+  step_minutes: Optional[int] = Field(None, gt=0)
+  buffer_minutes: Optional[int] = Field(None, ge=0)
+  limit: int = Field(20, gt=0, le=MAX_AVAILABILITY_SEARCH_LIMIT)
+
+  @field_validator('weekdays')
+  @classmethod
+  def validate_weekdays(cls, v):
+    if v and any(d < 0 or d > 6 for d in v):
+      raise ValueError('weekdays must be in range 0-6')
+    return v
+
+  @model_validator(mode='after')
+  def validate_ranges(self):
+    if self.date_to < self.date_from:
+      raise ValueError('date_to must not be earlier than date_from')
+    if (self.date_to - self.date_from).days > MAX_AVAILABILITY_SEARCH_DAYS:
+      raise ValueError(f'Range is limited to {MAX_AVAILABILITY_SEARCH_DAYS} days')
+    if self.time_from and self.time_to and self.time_to <= self.time_from:
+      raise ValueError('time_to must be later than time_from')
+    if not (self.language or self.level or self.teacher_telegram_ids):
+      raise ValueError('Provide language, level or teacher_telegram_ids')
+    return self
+
+class TeacherAvailability(BaseModel):
+  teacher_telegram_id: int
+  free_slots_count: int
+  first_slot: Optional[datetime] = None
   slots: List[TimeSlot]
 
 class TeacherSessionsRequest(BaseModel):
@@ -1,87 +1,221 @@
 # app/services/availability.py
-from datetime import datetime, timedelta, date
-from typing import List, Tuple
+from datetime import datetime, timedelta, date, time, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 import httpx
-from ..schemas import TimeSlot
+from ..config import settings
+from ..schemas import TimeSlot, TeacherAvailability
 
-CALENDARY_SERVICE_URL = "http://calendary-service:8006"
+CALENDARY_SERVICE_URL = settings.CALENDARY_SERVICE_URL
 
-async def get_week_schedule(self, teacher_telegram_id: int, day_of_week: int):
-  url = f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule/{teacher_telegram_id}/{day_of_week}"
+Interval = Tuple[datetime, datetime]
+
+
+async def get_full_schedule(teacher_telegram_id: int, date_from: date, date_to: date) -> dict:
+  """
+  Недельное расписание, разовые дни и недоступности преподавателя за диапазон —
+  одним запросом к calendary-service вместо пары запросов на каждый день
+  """
+  url = f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedule/{teacher_telegram_id}/full"
   async with httpx.AsyncClient(timeout=5.0) as client:
-    r = await client.get(url)
-    if r.status_code == 404:
-      return None
+    r = await client.post(url, json={"start": date_from.isoformat(), "end": date_to.isoformat()})
     r.raise_for_status()
-    return r.json()  # {start_time: "09:00", end_time: "18:00", is_available: true}
-
-async def get_unavailable(self, teacher_telegram_id: int, day_start: datetime, day_end: datetime):
-  # реализуй у себя ручку в calendary-service: /unavailable?from=&to=&teacher=
-  url = f"{CALENDARY_SERVICE_URL}/calendary/unavailable"
-  params = {
-  "teacher_telegram_id": teacher_telegram_id,
-  "from_ts": day_start.isoformat(),
-  "to_ts": day_end.isoformat(),
+    return r.json()  # {weekly_schedules: [...], special_days: [...], unavailable_periods: [...]}
+
+
+async def get_full_schedules(teacher_telegram_ids: List[int], date_from: date, date_to: date) -> Dict[int, dict]:
+  """Полные расписания многих преподавателей одним запросом: {teacher_telegram_id: schedule}"""
+  if not teacher_telegram_ids:
+    return {}
+  url = f"{CALENDARY_SERVICE_URL}/calendary/teacher-schedules/full"
+  payload = {
+    "teacher_telegram_ids": teacher_telegram_ids,
+    "start": date_from.isoformat(),
+    "end": date_to.isoformat(),
   }
-  async with httpx.AsyncClient(timeout=5.0) as client:
-    r = await client.get(url, params=params)
+  async with httpx.AsyncClient(timeout=10.0) as client:
+    r = await client.post(url, json=payload)
     r.raise_for_status()
-    return r.json()  # список интервалов [{start_time, end_time, ...}]
+    return {item["teacher_telegram_id"]: item for item in r.json()}
+
 
-def _hours_range(start_hm: str, end_hm: str, the_date: date) -> Tuple[datetime, datetime]:
+def _parse_ts(value: str) -> datetime:
+  ts = datetime.fromisoformat(value)
+  return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+def _hours_range(start_hm: str, end_hm: str, the_date: date) -> Interval:
   sh, sm = map(int, start_hm.split(":"))
   eh, em = map(int, end_hm.split(":"))
-  start = datetime(the_date.year, the_date.month, the_date.day, sh, sm)
-  end = datetime(the_date.year, the_date.month, the_date.day, eh, em)
+  start = datetime.combine(the_date, time(sh, sm), tzinfo=timezone.utc)
+  end = datetime.combine(the_date, time(eh, em), tzinfo=timezone.utc)
   return start, end
 
-def _subtract_busy(base_intervals: List[Tuple[datetime, datetime]],
-                  busy_intervals: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
-  # наивный вычитатель занятостей (можно улучшать)
-  result = base_intervals[:]
-  for b_start, b_end in busy_intervals:
-    new_res = []
-    for a_start, a_end in result:
-      if b_end <= a_start or b_start >= a_end:
-        new_res.append((a_start, a_end))
-      else:
-        if a_start < b_start:
-          new_res.append((a_start, b_start))
-        if b_end < a_end:
-          new_res.append((b_end, a_end))
-    result = new_res
+def working_intervals(schedule: dict, date_from: date, date_to: date) -> List[Interval]:
+  """Рабочие окна по дням: разовый день перекрывает недельное расписание"""
+  weekly = {
+    ws["day_of_week"]: ws
+    for ws in schedule.get("weekly_schedules", [])
+    if ws.get("is_available")
+  }
+  special = {sd["date"]: sd for sd in schedule.get("special_days", [])}
+
+  result: List[Interval] = []
+  day = date_from
+  while day <= date_to:
+    window = special.get(day.isoformat())
+    if window is not None and not window.get("is_active", True):
+      window = None
+    elif window is None:
+      window = weekly.get(day.weekday())
+
+    if window:
+      start, end = _hours_range(window["start_time"], window["end_time"], day)
+      if start < end:
+        result.append((start, end))
+    day += timedelta(days=1)
   return result
 
+def unavailable_intervals(schedule: dict) -> List[Interval]:
+  return [
+    (_parse_ts(x["start_time"]), _parse_ts(x["end_time"]))
+    for x in schedule.get("unavailable_periods", [])
+  ]
+
+def _merge(intervals: Iterable[Interval]) -> List[Interval]:
+  merged: List[Interval] = []
+  for start, end in sorted(intervals):
+    if merged and start <= merged[-1][1]:
+      if end > merged[-1][1]:
+        merged[-1] = (merged[-1][0], end)
+    else:
+      merged.append((start, end))
+  return merged
+
+def subtract_busy(base_intervals: List[Interval], busy_intervals: List[Interval]) -> List[Interval]:
+  """
+  Вычитает занятости из рабочих окон одним проходом по отсортированным спискам:
+  O((n + m) log(n + m)) вместо перестроения списка на каждую занятость
+  """
+  base = _merge(base_intervals)
+  busy = _merge(busy_intervals)
+
+  result: List[Interval] = []
+  j = 0
+  for a_start, a_end in base:
+    # занятости, закончившиеся до начала окна, больше не понадобятся
+    while j < len(busy) and busy[j][1] <= a_start:
+      j += 1
+
+    cur = a_start
+    k = j
+    while k < len(busy) and busy[k][0] < a_end:
+      b_start, b_end = busy[k]
+      if b_start > cur:
+        result.append((cur, b_start))
+      cur = max(cur, b_end)
+      k += 1
+
+    if cur < a_end:
+      result.append((cur, a_end))
+  return result
+
+def split_into_slots(free_intervals: List[Interval], slot: timedelta, step: timedelta) -> List[TimeSlot]:
+  if slot <= timedelta(0) or step <= timedelta(0):
+    # Иначе cur не растет и цикл не завершается
+    raise ValueError("slot and step must be positive")
+  slots: List[TimeSlot] = []
+  for start, end in free_intervals:
+    cur = start
+    while cur + slot <= end:
+      slots.append(TimeSlot(start=cur, end=cur + slot, available=True))
+      cur += step
+  return slots
+
 async def compute_free_slots(
   *,
   teacher_telegram_id: int,
-  the_date: date,
-  existing_sessions: List[Tuple[datetime, datetime]],
+  date_from: date,
+  date_to: Optional[date] = None,
+  existing_sessions: List[Interval],
+  slot_minutes: Optional[int] = None,
+  step_minutes: Optional[int] = None,
+  buffer_minutes: Optional[int] = None,
+  schedule: Optional[dict] = None,
 ) -> List[TimeSlot]:
-  # 1) недельное окно
-  dow = the_date.weekday()  # 0-6
-  ws = await get_week_schedule(teacher_telegram_id, dow)
-  if not ws or not ws.get("is_available"):
+  date_to = date_to or date_from
+  slot = timedelta(minutes=slot_minutes or settings.AVAILABILITY_SLOT_MINUTES)
+  step = timedelta(minutes=step_minutes or settings.AVAILABILITY_STEP_MINUTES)
+  buffer = timedelta(minutes=settings.AVAILABILITY_BUFFER_MINUTES if buffer_minutes is None else buffer_minutes)
+
+  # 1) рабочие окна и недоступности за весь диапазон
+  if schedule is None:
+    schedule = await get_full_schedule(teacher_telegram_id, date_from, date_to)
+  base = working_intervals(schedule, date_from, date_to)
+  if not base:
     return []
 
-  day_start, day_end = _hours_range(ws["start_time"], ws["end_time"], the_date)
-  base = [(day_start, day_end)]
+  # 2) занятости: недоступности + сессии с буфером до и после
+  busy = unavailable_intervals(schedule)
+  busy.extend((start - buffer, end + buffer) for start, end in existing_sessions)
 
-  # 2) недоступности
-  unavailable = await get_unavailable(teacher_telegram_id, day_start, day_end)
-  busy_from_unavail = [(datetime.fromisoformat(x["start_time"]), datetime.fromisoformat(x["end_time"])) for x in unavailable]
+  # 3) вычитаем занятости и режем на слоты
+  free_intervals = subtract_busy(base, busy)
+  return split_into_slots(free_intervals, slot, step)
 
-  # 3) занятые сессии
-  busy_from_sessions = existing_sessions
+def _in_window(slot: TimeSlot, weekdays: Optional[set], time_from: Optional[time], time_to: Optional[time]) -> bool:
+  if weekdays is not None and slot.start.weekday() not in weekdays:
+    return False
+  if time_from and slot.start.timetz().replace(tzinfo=None) < time_from:
+    return False
+  if time_to and slot.end.timetz().replace(tzinfo=None) > time_to:
+    return False
+  return True
 
-  # 4) вычитаем занятости
-  free_intervals = _subtract_busy(base, busy_from_unavail + busy_from_sessions)
+async def search_availability(
+  *,
+  teacher_telegram_ids: List[int],
+  date_from: date,
+  date_to: date,
+  busy_by_teacher: Dict[int, List[Interval]],
+  time_from: Optional[time] = None,
+  time_to: Optional[time] = None,
+  weekdays: Optional[List[int]] = None,
+  slot_minutes: Optional[int] = None,
+  step_minutes: Optional[int] = None,
+  buffer_minutes: Optional[int] = None,
+  limit: int = 20,
+) -> List[TeacherAvailability]:
+  """
+  Свободные слоты сразу для многих преподавателей: расписания приходят одним пакетным
+  запросом, сессии — одним SQL-запросом (busy_by_teacher). Выше в выдаче те, у кого
+  больше подходящих слотов, при равенстве — у кого слот раньше
+  """
+  schedules = await get_full_schedules(teacher_telegram_ids, date_from, date_to)
+  weekday_set = set(weekdays) if weekdays else None
 
-  # 5) собираем поквартально/почасово — для простоты почасовые слоты
-  slots: List[TimeSlot] = []
-  for start, end in free_intervals:
-    cur = start
-    while cur + timedelta(hours=1) <= end:
-      slots.append(TimeSlot(start=cur, end=cur + timedelta(hours=1), available=True))
-      cur += timedelta(hours=1)
-  return slots
+  results: List[TeacherAvailability] = []
+  for teacher_id in teacher_telegram_ids:
+    schedule = schedules.get(teacher_id)
+    if not schedule:
+      continue
+    slots = await compute_free_slots(
+      teacher_telegram_id=teacher_id,
+      date_from=date_from,
+      date_to=date_to,
+      existing_sessions=busy_by_teacher.get(teacher_id, []),
+      slot_minutes=slot_minutes,
+      step_minutes=step_minutes,
+      buffer_minutes=buffer_minutes,
+      schedule=schedule,
+    )
+    slots = [s for s in slots if _in_window(s, weekday_set, time_from, time_to)]
+    if not slots:
+      continue
+    results.append(TeacherAvailability(
+      teacher_telegram_id=teacher_id,
+      free_slots_count=len(slots),
+      first_slot=slots[0].start,
+      slots=slots,
+    ))
+
+  results.sort(key=lambda r: (-r.free_slots_count, r.first_slot))
+  return results[:limit]
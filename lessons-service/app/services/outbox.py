@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from aio_pika.exceptions import AMQPConnectionError, ChannelInvalidStateError
+from sqlalchemy import Integer, cast, delete, exists, func, or_, select, update
+from sqlalchemy.orm import aliased
+
+from app import models
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.core.rabbitmq import rabbitmq_client
+
+logger = logging.getLogger(__name__)
+
+# Сбои соединения/канала с брокером: событие не виновато, попытка не засчитывается
+CONNECTION_ERRORS = (ConnectionError, AMQPConnectionError, ChannelInvalidStateError)
+
+# Первый ключ advisory-локов relay (второй — aggregate_id), чтобы не пересекаться с другими локами
+OUTBOX_AGGREGATE_LOCK_CLASS = 0x0B0C
+
+class OutboxRelay:
+  """
+  Relay transactional outbox: забирает события пачкой (FOR UPDATE SKIP LOCKED — можно
+  запускать в нескольких репликах), публикует по порядку с publisher confirms и удаляет
+  подтвержденные. События одного урока в каждый момент обрабатывает одна реплика:
+  transaction-level advisory lock на aggregate_id берется в том же запросе. Отклоненное брокером событие повторяется с экспоненциальной паузой
+  (next_attempt_at) до OUTBOX_MAX_ATTEMPTS, после чего остается в таблице и логируется как ERROR.
+  Недоступность RabbitMQ попыткой не считается — relay просто ждет восстановления
+  """
+
+  def __init__(self):
+    self.batch_size = settings.OUTBOX_BATCH_SIZE
+    self.poll_interval = settings.OUTBOX_POLL_INTERVAL
+    self.max_attempts = settings.OUTBOX_MAX_ATTEMPTS
+    self.retry_base_delay = settings.OUTBOX_RETRY_BASE_DELAY
+    self.retry_max_delay = settings.OUTBOX_RETRY_MAX_DELAY
+    self._wakeup = asyncio.Event()
+    self._task: asyncio.Task = None
+
+  def start(self):
+    self._task = asyncio.create_task(self._run())
+
+  def notify(self):
+    """Вызывается после коммита с новыми событиями — relay не ждет конца интервала опроса"""
+    self._wakeup.set()
+
+  async def _run(self):
+    while True:
+      try:
+        if rabbitmq_client.is_connected:
+          while await self.relay_batch() >= self.batch_size:
+            pass
+      except asyncio.CancelledError:
+        raise
+      except Exception as e:
+        logger.error(f"Outbox relay failed: {e}")
+
+      try:
+        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+      except asyncio.TimeoutError:
+        pass
+      self._wakeup.clear()
+
+  async def relay_batch(self) -> int:
+    earlier = aliased(models.OutboxEvent)
+    async with AsyncSessionLocal() as db:
+      result = await db.execute(
+        select(models.OutboxEvent)
+        .where(
+          models.OutboxEvent.attempts < self.max_attempts,
+          models.OutboxEvent.next_attempt_at <= func.now(),
+          # SKIP LOCKED прячет строки, захваченные другой репликой, и без лока на урок она взяла
+          # бы его следующие события раньше захваченных. Лок держится до конца транзакции
+          or_(
+            models.OutboxEvent.aggregate_id.is_(None),
+            func.pg_try_advisory_xact_lock(
+              OUTBOX_AGGREGATE_LOCK_CLASS, cast(models.OutboxEvent.aggregate_id, Integer)
+            )
+          ),
+          # Событие урока не обгоняет более раннее событие того же урока, ждущее повтора
+          ~exists().where(
+            earlier.aggregate_id == models.OutboxEvent.aggregate_id,
+            earlier.id < models.OutboxEvent.id,
+            earlier.attempts < self.max_attempts,
+            earlier.next_attempt_at > func.now()
+          )
+        )
+        .order_by(models.OutboxEvent.id)
+        .limit(self.batch_size)
+        .with_for_update(skip_locked=True)
+      )
+      events: List[models.OutboxEvent] = result.scalars().all()
+      if not events:
+        return 0
+
+      # Публикация строго по порядку: после сбоя события урока остальные события
+      # этого урока в пачке ждут его повтора
+      done_ids = []
+      blocked_aggregates = set()
+      connection_lost = False
+      for event in events:
+        if event.aggregate_id is not None and event.aggregate_id in blocked_aggregates:
+          continue
+        try:
+          await self._publish(event)
+        except CONNECTION_ERRORS as e:
+          # Брокер недоступен — это не вина события, попытка не засчитывается
+          logger.warning(f"RabbitMQ unavailable, outbox relay paused: {e!r}")
+          connection_lost = True
+          break
+        except Exception as e:
+          await self._schedule_retry(db, event, e)
+          if event.aggregate_id is not None:
+            blocked_aggregates.add(event.aggregate_id)
+        else:
+          done_ids.append(event.id)
+
+      if done_ids:
+        await db.execute(delete(models.OutboxEvent).where(models.OutboxEvent.id.in_(done_ids)))
+      await db.commit()
+
+    logger.info(f"Relayed {len(done_ids)} of {len(events)} outbox events")
+    # Пока брокер недоступен, следующую пачку не берем — ждем интервал опроса
+    return 0 if connection_lost else len(events)
+
+  async def _schedule_retry(self, db, event: models.OutboxEvent, error: Exception) -> None:
+    attempts = event.attempts + 1
+    delay = min(self.retry_base_delay * 2 ** (attempts - 1), self.retry_max_delay)
+    if attempts >= self.max_attempts:
+      # Дальше событие не выбирается: остается в таблице до ручного разбора (сброс attempts — повтор)
+      logger.error(
+        f"Outbox event {event.id} ({event.routing_key}) dead-lettered after {attempts} attempts: {error!r}"
+      )
+    else:
+      logger.warning(
+        f"Failed to relay outbox event {event.id} ({event.routing_key}), retry in {delay:.0f}s: {error!r}"
+      )
+    await db.execute(
+      update(models.OutboxEvent)
+      .where(models.OutboxEvent.id == event.id)
+      .values(
+        attempts=attempts,
+        next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+        last_error=str(error)[:1000]
+      )
+    )
+
+  async def _publish(self, event: models.OutboxEvent) -> None:
+    await rabbitmq_client.publish_confirmed(event.payload, event.routing_key, message_id=f"outbox-{event.id}")
+
+  async def close(self):
+    if self._task:
+      self._task.cancel()
+
+
+# Глобальный экземпляр
+outbox_relay = OutboxRelay()
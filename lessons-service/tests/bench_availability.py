@@ -0,0 +1,64 @@
+"""
+Бенчмарк расчета свободных слотов: однопроходное вычитание (app/services/availability.py)
+против прежнего расчета по дням с перестроением списка окон на каждую занятость.
+Запуск из lessons-service: python -m tests.bench_availability
+"""
+import random
+import timeit
+from datetime import date, datetime, time, timedelta, timezone
+
+from tests import conftest  # noqa: F401 — заглушки настроек БД для app.config
+from app.services.availability import split_into_slots, subtract_busy, working_intervals
+from tests import legacy_availability as legacy
+
+START = date(2025, 3, 3)
+REPEAT = 5
+SLOT = timedelta(minutes=60)
+STEP = timedelta(minutes=15)
+
+SCHEDULE = {
+  "weekly_schedules": [
+    {"day_of_week": d, "is_available": d < 6, "start_time": "08:00", "end_time": "21:00"} for d in range(7)
+  ],
+  "special_days": [],
+  "unavailable_periods": [],
+}
+
+
+def make_sessions(rng: random.Random, days: int, per_day: int) -> list:
+  """per_day сессий по 45–90 минут в рабочие часы каждого дня"""
+  sessions = []
+  for i in range(days):
+    for _ in range(per_day):
+      start = datetime.combine(START + timedelta(days=i), time(8), tzinfo=timezone.utc) + timedelta(minutes=15 * rng.randrange(48))
+      sessions.append((start, start + timedelta(minutes=rng.choice((45, 60, 90)))))
+  return sessions
+
+
+def sweep(date_to: date, sessions: list) -> int:
+  """То же, что compute_free_slots, без async-обертки"""
+  base = working_intervals(SCHEDULE, START, date_to)
+  return len(split_into_slots(subtract_busy(base, sessions), SLOT, STEP))
+
+
+def per_day(date_to: date, sessions: list) -> int:
+  return len(legacy.free_slots_per_day(SCHEDULE, START, date_to, sessions, SLOT, STEP))
+
+
+def main():
+  rng = random.Random(42)
+  # Один преподаватель на неделю и на максимальный диапазон /free-slots (62 дня)
+  for days, per_day_sessions in ((7, 8), (62, 8), (62, 20)):
+    date_to = START + timedelta(days=days - 1)
+    sessions = make_sessions(rng, days, per_day_sessions)
+    assert sweep(date_to, sessions) == per_day(date_to, sessions)
+
+    results = []
+    for name, fn in (("sweep", sweep), ("per-day", per_day)):
+      best = min(timeit.repeat(lambda: fn(date_to, sessions), number=1, repeat=REPEAT))
+      results.append(f"{name} {best * 1000:.1f} ms")
+    print(f"{days} days, {len(sessions)} sessions: " + ", ".join(results))
+
+
+if __name__ == "__main__":
+  main()
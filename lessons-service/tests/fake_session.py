@@ -0,0 +1,32 @@
+"""Подмена AsyncSession для тестов crud без базы: запоминает выполненные запросы"""
+from sqlalchemy.dialects import postgresql
+
+
+class FakeResult:
+  def __init__(self, rows: list):
+    self._rows = rows
+
+  def all(self) -> list:
+    return list(self._rows)
+
+  def scalar_one_or_none(self):
+    return self._rows[0] if self._rows else None
+
+
+class CapturingSession:
+  def __init__(self, rows: list = None):
+    self.rows = rows or []
+    self.statements = []
+
+  async def execute(self, stmt, *args, **kwargs):
+    self.statements.append(stmt)
+    return FakeResult(self.rows)
+
+
+def compile_pg(stmt, literal_binds: bool = False) -> str:
+  """
+  SQL запроса так, как его отправит asyncpg (диалект postgresql, параметры — плейсхолдерами).
+  literal_binds — значения параметров подставлены в текст, например для EXPLAIN
+  """
+  compile_kwargs = {"literal_binds": True, "render_postcompile": True} if literal_binds else {}
+  return str(stmt.compile(dialect=postgresql.asyncpg.dialect(), compile_kwargs=compile_kwargs))
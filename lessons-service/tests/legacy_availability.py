@@ -0,0 +1,40 @@
+"""
+Прежний расчет свободных слотов (до перехода на однопроходное вычитание) — эталон для
+тестов и бенчмарка: каждая занятость вычитается перестроением всего списка окон, и
+календарь обходится по одному дню. Нарезка на слоты — общая, из app/services/availability.py
+"""
+from datetime import date, timedelta
+from typing import List
+
+from app.services.availability import Interval, split_into_slots, working_intervals
+
+
+def subtract_busy(base_intervals: List[Interval], busy_intervals: List[Interval]) -> List[Interval]:
+  result = base_intervals[:]
+  for b_start, b_end in busy_intervals:
+    new_res = []
+    for a_start, a_end in result:
+      if b_end <= a_start or b_start >= a_end:
+        new_res.append((a_start, a_end))
+      else:
+        if a_start < b_start:
+          new_res.append((a_start, b_start))
+        if b_end < a_end:
+          new_res.append((b_end, a_end))
+    result = new_res
+  return result
+
+
+def free_slots_per_day(schedule: dict, date_from: date, date_to: date, busy: List[Interval],
+                       slot: timedelta, step: timedelta) -> list:
+  """Как раньше: на каждый день — свое окно и вычитание занятостей этого дня"""
+  slots = []
+  day = date_from
+  while day <= date_to:
+    base = working_intervals(schedule, day, day)
+    if base:
+      # Раньше занятости запрашивались отдельно на каждый день
+      day_busy = [b for b in busy if b[0] < base[0][1] and b[1] > base[0][0]]
+      slots.extend(split_into_slots(sorted(subtract_busy(base, day_busy)), slot, step))
+    day += timedelta(days=1)
+  return slots
@@ -0,0 +1,78 @@
+import asyncio
+import random
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.services.availability import compute_free_slots, split_into_slots, subtract_busy
+from tests import legacy_availability as legacy
+
+DAY = datetime(2025, 3, 3, tzinfo=timezone.utc)
+
+
+def _at(hour: float) -> datetime:
+  return DAY + timedelta(hours=hour)
+
+
+def _random_intervals(rng: random.Random, count: int, span_hours: int) -> list:
+  intervals = []
+  for _ in range(count):
+    start = rng.randrange(span_hours * 4) / 4
+    intervals.append((_at(start), _at(start + rng.randrange(1, 12) / 4)))
+  return intervals
+
+
+def test_subtract_busy_cuts_windows():
+  base = [(_at(9), _at(18))]
+  busy = [(_at(8), _at(10)), (_at(12), _at(13)), (_at(12.5), _at(14)), (_at(17), _at(19))]
+
+  assert subtract_busy(base, busy) == [(_at(10), _at(12)), (_at(14), _at(17))]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_subtract_busy_matches_legacy(seed):
+  rng = random.Random(seed)
+  # Непересекающиеся рабочие окна по дням и произвольные, в т.ч. пересекающиеся занятости
+  base = [(_at(24 * d + 9), _at(24 * d + 18)) for d in range(7)]
+  busy = _random_intervals(rng, 60, 24 * 7)
+
+  assert subtract_busy(base, busy) == sorted(legacy.subtract_busy(base, busy))
+
+
+def test_split_into_slots_with_step():
+  slots = split_into_slots([(_at(9), _at(11))], timedelta(minutes=60), timedelta(minutes=30))
+
+  assert [(s.start, s.end) for s in slots] == [(_at(9), _at(10)), (_at(9.5), _at(10.5)), (_at(10), _at(11))]
+
+
+def test_split_into_slots_rejects_non_positive_step():
+  with pytest.raises(ValueError):
+    split_into_slots([(_at(9), _at(11))], timedelta(minutes=60), timedelta(0))
+
+
+def test_compute_free_slots_matches_legacy_per_day():
+  rng = random.Random(1)
+  schedule = {
+    "weekly_schedules": [
+      {"day_of_week": d, "is_available": d < 5, "start_time": "09:00", "end_time": "18:00"} for d in range(7)
+    ],
+    "special_days": [{"date": "2025-03-08", "start_time": "10:00", "end_time": "14:00"}],
+    "unavailable_periods": [],
+  }
+  sessions = _random_intervals(rng, 40, 24 * 14)
+
+  slots = asyncio.run(compute_free_slots(
+    teacher_telegram_id=1,
+    date_from=date(2025, 3, 3),
+    date_to=date(2025, 3, 16),
+    existing_sessions=sessions,
+    slot_minutes=60,
+    step_minutes=30,
+    buffer_minutes=0,
+    schedule=schedule,
+  ))
+
+  expected = legacy.free_slots_per_day(
+    schedule, date(2025, 3, 3), date(2025, 3, 16), sessions, timedelta(minutes=60), timedelta(minutes=30)
+  )
+  assert [(s.start, s.end) for s in slots] == [(s.start, s.end) for s in expected]
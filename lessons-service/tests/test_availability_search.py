@@ -0,0 +1,90 @@
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import MAX_AVAILABILITY_SEARCH_DAYS, AvailabilitySearchRequest
+from app.services import availability
+
+
+def _request(**overrides) -> dict:
+  data = {"language": "en", "date_from": "2025-03-03", "date_to": "2025-03-09"}
+  data.update(overrides)
+  return data
+
+
+def test_search_request_accepts_valid_range():
+  request = AvailabilitySearchRequest(**_request(weekdays=[0, 4], time_from="18:00", time_to="20:00"))
+
+  assert request.limit == 20
+  assert request.time_from == time(18)
+
+
+@pytest.mark.parametrize("overrides", [
+  {"date_to": (date(2025, 3, 3) + timedelta(days=MAX_AVAILABILITY_SEARCH_DAYS + 1)).isoformat()},
+  {"date_to": "2025-03-02"},
+  {"weekdays": [0, 7]},
+  {"time_from": "20:00", "time_to": "18:00"},
+  {"limit": 0},
+  {"limit": 101},
+  {"slot_minutes": 0},
+  {"language": None},
+])
+def test_search_request_rejects_invalid_parameters(overrides):
+  with pytest.raises(ValidationError):
+    AvailabilitySearchRequest(**_request(**overrides))
+
+
+def _schedule(start: str, end: str) -> dict:
+  return {
+    "weekly_schedules": [
+      {"day_of_week": d, "is_available": d < 5, "start_time": start, "end_time": end} for d in range(7)
+    ],
+    "special_days": [],
+    "unavailable_periods": [],
+  }
+
+
+def test_search_ranks_teachers_by_slot_count_then_first_slot(monkeypatch):
+  schedules = {
+    1: _schedule("10:00", "13:00"),
+    2: _schedule("09:00", "12:00"),
+    3: _schedule("09:00", "11:00"),
+    # 4 — нет расписания
+  }
+  requested = []
+
+  async def fake_get_full_schedules(teacher_ids, date_from, date_to):
+    requested.append((list(teacher_ids), date_from, date_to))
+    return schedules
+
+  monkeypatch.setattr(availability, "get_full_schedules", fake_get_full_schedules)
+  monday = datetime(2025, 3, 3, tzinfo=timezone.utc)
+  # Занятие у преподавателя 2 в понедельник 9:00–10:00: два слота, как у 3, но первый — позже
+  busy = {2: [(monday + timedelta(hours=9), monday + timedelta(hours=10))]}
+
+  def search(limit: int):
+    return asyncio.run(availability.search_availability(
+      teacher_telegram_ids=[1, 2, 3, 4],
+      date_from=date(2025, 3, 3),
+      date_to=date(2025, 3, 4),
+      busy_by_teacher=busy,
+      weekdays=[0],
+      slot_minutes=60,
+      step_minutes=60,
+      buffer_minutes=0,
+      limit=limit,
+    ))
+
+  results = search(limit=20)
+
+  # Расписания всех преподавателей — одним пакетным запросом
+  assert requested == [([1, 2, 3, 4], date(2025, 3, 3), date(2025, 3, 4))]
+  # Вторник отфильтрован по weekdays
+  assert [(r.teacher_telegram_id, r.free_slots_count, r.first_slot) for r in results] == [
+    (1, 3, monday + timedelta(hours=10)),
+    (3, 2, monday + timedelta(hours=9)),
+    (2, 2, monday + timedelta(hours=10)),
+  ]
+  assert [r.teacher_telegram_id for r in search(limit=2)] == [1, 3]
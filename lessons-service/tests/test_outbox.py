@@ -0,0 +1,91 @@
+import asyncio
+
+from app import models
+from app.services import outbox as outbox_module
+from app.services.outbox import OutboxRelay
+from tests.fake_session import compile_pg
+
+
+class FakeScalars:
+  def __init__(self, rows: list):
+    self._rows = rows
+
+  def all(self) -> list:
+    return list(self._rows)
+
+
+class FakeResult:
+  def __init__(self, rows: list):
+    self._rows = rows
+
+  def scalars(self) -> FakeScalars:
+    return FakeScalars(self._rows)
+
+
+class FakeOutboxSession:
+  """AsyncSessionLocal для relay: первый execute — выборка событий, дальше — delete/update"""
+
+  def __init__(self, events: list):
+    self.events = events
+    self.statements = []
+    self.committed = False
+
+  def __call__(self):
+    return self
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *exc):
+    return False
+
+  async def execute(self, stmt):
+    self.statements.append(stmt)
+    return FakeResult(self.events if len(self.statements) == 1 else [])
+
+  async def commit(self):
+    self.committed = True
+
+
+def _event(event_id: int, aggregate_id) -> models.OutboxEvent:
+  return models.OutboxEvent(id=event_id, routing_key="lesson.updated", aggregate_id=aggregate_id, payload={}, attempts=0)
+
+
+def _relay(monkeypatch, events: list, failing_ids=()):
+  session = FakeOutboxSession(events)
+  published = []
+
+  async def fake_publish(event):
+    if event.id in failing_ids:
+      raise RuntimeError("nack")
+    published.append(event.id)
+
+  relay = OutboxRelay()
+  monkeypatch.setattr(outbox_module, "AsyncSessionLocal", session)
+  monkeypatch.setattr(relay, "_publish", fake_publish)
+  return relay, session, published
+
+
+def test_batch_query_locks_aggregates_in_the_same_statement(monkeypatch):
+  relay, session, _ = _relay(monkeypatch, [])
+
+  asyncio.run(relay.relay_batch())
+
+  sql = compile_pg(session.statements[0])
+  # Лок урока и SKIP LOCKED — в одном запросе: другая реплика не возьмет поздние события урока,
+  # ранние из которых захвачены этой
+  assert "pg_try_advisory_xact_lock($" in sql and "CAST(outbox_events.aggregate_id AS INTEGER)" in sql
+  assert "outbox_events.aggregate_id IS NULL OR pg_try_advisory_xact_lock" in sql
+  assert sql.endswith("FOR UPDATE SKIP LOCKED")
+
+
+def test_failed_event_blocks_later_events_of_its_aggregate(monkeypatch):
+  events = [_event(1, 10), _event(2, 20), _event(3, 10), _event(4, None), _event(5, 20)]
+  relay, session, published = _relay(monkeypatch, events, failing_ids={1})
+
+  assert asyncio.run(relay.relay_batch()) == len(events)
+
+  assert published == [2, 4, 5]
+  delete_stmt = next(s for s in session.statements[1:] if compile_pg(s).startswith("DELETE"))
+  assert sorted(delete_stmt.compile().params["id_1"]) == [2, 4, 5]
+  assert session.committed
@@ -0,0 +1,95 @@
+"""
+Планы запросов сессий и участников из app/crud.py: запросы строятся настоящими функциями crud
+(через подменную сессию) и компилируются диалектом postgresql.
+
+EXPLAIN выполняется только на базе из LESSONS_TEST_DATABASE_URL (после alembic upgrade head),
+без нее эти тесты пропускаются. На маленькой базе планировщику дешевле Seq Scan, поэтому он
+выключается — проверяется, что индекс вообще применим к запросу.
+"""
+import asyncio
+import os
+import re
+from datetime import date, datetime, timezone
+from uuid import UUID
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import crud, models
+from tests.fake_session import CapturingSession, compile_pg
+
+TEST_DATABASE_URL = os.getenv("LESSONS_TEST_DATABASE_URL")
+
+START_DT = datetime(2025, 3, 1, tzinfo=timezone.utc)
+END_DT = datetime(2025, 4, 1, tzinfo=timezone.utc)
+
+# Запрос crud -> индекс, по которому он должен читать таблицу
+QUERIES = {
+  "list_busy_intervals": (
+    lambda db: crud.list_busy_intervals(db, 1, START_DT, END_DT),
+    "ix_lesson_sessions_teacher_telegram_id_start_time",
+  ),
+  "list_busy_intervals_by_teachers": (
+    lambda db: crud.list_busy_intervals_by_teachers(db, [1, 2, 3], START_DT, END_DT),
+    "ix_lesson_sessions_teacher_telegram_id_start_time",
+  ),
+  "list_sessions_by_teacher_and_range": (
+    lambda db: crud.list_sessions_by_teacher_and_range(db, 1, date(2025, 3, 1), date(2025, 3, 31)),
+    "ix_lesson_sessions_teacher_telegram_id_start_time",
+  ),
+  "get_participant_by_lesson_and_student": (
+    lambda db: crud.get_participant_by_lesson_and_student(db, 1, UUID(int=1)),
+    "ix_lesson_participants_lesson_id_student_id",
+  ),
+  "get_participant_by_lesson_and_group": (
+    lambda db: crud.get_participant_by_lesson_and_group(db, 1, 1),
+    "ix_lesson_participants_lesson_id_group_id",
+  ),
+}
+
+
+def _statement(name: str):
+  build, _ = QUERIES[name]
+  db = CapturingSession()
+  asyncio.run(build(db))
+  return db.statements[0]
+
+
+def _index(name: str):
+  return next(
+    index
+    for table in (models.LessonSession.__table__, models.LessonParticipant.__table__)
+    for index in table.indexes
+    if index.name == name
+  )
+
+
+@pytest.mark.parametrize("name", QUERIES)
+def test_query_filters_on_leading_index_column(name):
+  index = _index(QUERIES[name][1])
+  sql = compile_pg(_statement(name))
+  where = sql.rsplit("WHERE", 1)[1]
+
+  # Первая колонка индекса — равенство (или IN), иначе индекс читался бы целиком
+  column = f"{index.table.name}.{index.columns[0].name}"
+  assert re.search(rf"{re.escape(column)} (= \$\d+|IN \(__\[POSTCOMPILE_)", where), where
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="LESSONS_TEST_DATABASE_URL не задан")
+@pytest.mark.parametrize("name", QUERIES)
+def test_query_uses_index(name):
+  index_name = QUERIES[name][1]
+  sql = compile_pg(_statement(name), literal_binds=True)
+
+  async def explain() -> str:
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+      async with engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        rows = (await conn.exec_driver_sql(f"EXPLAIN {sql}")).all()
+    finally:
+      await engine.dispose()
+    return "\n".join(row[0] for row in rows)
+
+  plan = asyncio.run(explain())
+  assert index_name in plan, plan
@@ -0,0 +1,67 @@
+import asyncio
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+from app import crud, models
+from tests.fake_session import CapturingSession, compile_pg
+
+
+def _session(session_id: int, lesson: models.Lesson) -> models.LessonSession:
+  return models.LessonSession(
+    id=session_id,
+    lesson_id=lesson.id,
+    start_time=datetime(2025, 3, 3, 9 + session_id, tzinfo=timezone.utc),
+    end_time=datetime(2025, 3, 3, 10 + session_id, tzinfo=timezone.utc),
+    status=models.LessonStatus.SCHEDULED,
+    teacher_telegram_id=lesson.teacher_telegram_id,
+    lesson=lesson,
+  )
+
+
+def test_participants_are_aggregated_in_lateral_subquery():
+  db = CapturingSession()
+
+  asyncio.run(crud.list_sessions_by_teacher_and_range(db, 42, date(2025, 3, 1), date(2025, 3, 31)))
+
+  sql = compile_pg(db.statements[0])
+  assert "JOIN LATERAL (SELECT count(lesson_participants.id) AS participants_count" in sql
+  # Участник для booked_by — одна строка по first_participant_id, а не join по всем участникам урока
+  assert "LEFT OUTER JOIN lesson_participants AS lesson_participants_1 ON lesson_participants_1.id = participants_agg.first_participant_id" in sql
+  assert "WHERE lesson_sessions.teacher_telegram_id = $1::BIGINT" in sql
+  assert "GROUP BY" not in sql
+
+
+def test_date_bounds_cover_whole_days():
+  db = CapturingSession()
+
+  asyncio.run(crud.list_sessions_by_teacher_and_range(db, 42, date(2025, 3, 1), date(2025, 3, 31)))
+
+  params = db.statements[0].compile().params
+  assert datetime(2025, 3, 31, 23, 59, 59, 999999, tzinfo=timezone.utc) in params.values()
+  assert datetime(2025, 3, 1, tzinfo=timezone.utc) in params.values()
+
+
+def test_rows_are_mapped_one_per_session():
+  lesson = models.Lesson(
+    id=7, title="English", description=None, lesson_type=models.LessonType.GROUP,
+    language="en", level="B1", teacher_telegram_id=42,
+  )
+  student_id = uuid4()
+  db = CapturingSession(rows=[
+    (_session(1, lesson), 3, student_id, None),
+    (_session(2, lesson), 1, None, 5),
+    (_session(3, lesson), 0, None, None),
+  ])
+
+  sessions = asyncio.run(crud.list_sessions_by_teacher_and_range(db, 42, date(2025, 3, 3), date(2025, 3, 3)))
+
+  assert [(s["id"], s["participants_count"], s["booked"], s["booked_by"]) for s in sessions] == [
+    (1, 3, True, {"type": "student", "id": str(student_id)}),
+    (2, 1, True, {"type": "group", "id": "5"}),
+    (3, 0, False, None),
+  ]
+  assert sessions[0]["start_time"] == "2025-03-03T10:00:00+00:00"
+  assert sessions[0]["lesson"] == {
+    "id": 7, "title": "English", "description": None, "lesson_type": "GROUP",
+    "language": "en", "level": "B1", "teacher_telegram_id": 42,
+  }
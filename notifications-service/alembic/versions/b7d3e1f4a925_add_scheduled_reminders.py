@@ -0,0 +1,57 @@
+"""Add scheduled reminders
+
+Revision ID: b7d3e1f4a925
+Revises: 132483303285
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e1f4a925'
+down_revision: Union[str, None] = '132483303285'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduled_reminders',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.Integer(), nullable=False),
+        sa.Column('lesson_id', sa.Integer(), nullable=False),
+        sa.Column('lesson_title', sa.String(length=255), nullable=True),
+        sa.Column('teacher_telegram_id', sa.BigInteger(), nullable=True),
+        sa.Column('student_ids', sa.JSON(), nullable=True),
+        sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('remind_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'SENT', 'CANCELLED', name='reminderstatus'), nullable=False),
+        sa.Column('event_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('students_event_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_id')
+    )
+    op.create_index(op.f('ix_scheduled_reminders_id'), 'scheduled_reminders', ['id'], unique=False)
+    op.create_index(op.f('ix_scheduled_reminders_lesson_id'), 'scheduled_reminders', ['lesson_id'], unique=False)
+    op.create_index(
+        'ix_scheduled_reminders_pending_remind_at',
+        'scheduled_reminders',
+        ['remind_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scheduled_reminders_pending_remind_at', table_name='scheduled_reminders')
+    op.drop_index(op.f('ix_scheduled_reminders_lesson_id'), table_name='scheduled_reminders')
+    op.drop_index(op.f('ix_scheduled_reminders_id'), table_name='scheduled_reminders')
+    op.drop_table('scheduled_reminders')
+    sa.Enum(name='reminderstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,38 @@
+"""Add quiet hours deferral
+
+Revision ID: d2a8c6f1e047
+Revises: b7d3e1f4a925
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8c6f1e047'
+down_revision: Union[str, None] = 'b7d3e1f4a925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('deliver_after', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_notifications_deliver_after',
+        'notifications',
+        ['deliver_after'],
+        unique=False,
+        postgresql_where=sa.text('deliver_after IS NOT NULL')
+    )
+    op.add_column('user_notification_settings', sa.Column('timezone', sa.String(length=50), nullable=True))
+    op.add_column('user_notification_settings', sa.Column('timezone_synced_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('user_notification_settings', 'timezone_synced_at')
+    op.drop_column('user_notification_settings', 'timezone')
+    op.drop_index('ix_notifications_deliver_after', table_name='notifications')
+    op.drop_column('notifications', 'deliver_after')
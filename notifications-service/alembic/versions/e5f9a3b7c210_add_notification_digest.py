@@ -0,0 +1,51 @@
+"""Add notification digest
+
+Revision ID: e5f9a3b7c210
+Revises: d2a8c6f1e047
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f9a3b7c210'
+down_revision: Union[str, None] = 'd2a8c6f1e047'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE notificationtype ADD VALUE IF NOT EXISTS 'DIGEST'")
+
+    op.add_column('user_notification_settings', sa.Column('digest_enabled', sa.Boolean(), nullable=True, server_default=sa.false()))
+    op.add_column('user_notification_settings', sa.Column('digest_window_minutes', sa.Integer(), nullable=True))
+
+    op.create_table(
+        'digest_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('chat_id', sa.BigInteger(), nullable=False),
+        sa.Column('notification_type', sa.String(length=50), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('flush_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_digest_items_id'), 'digest_items', ['id'], unique=False)
+    op.create_index(op.f('ix_digest_items_user_id'), 'digest_items', ['user_id'], unique=False)
+    op.create_index(op.f('ix_digest_items_flush_at'), 'digest_items', ['flush_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_digest_items_flush_at'), table_name='digest_items')
+    op.drop_index(op.f('ix_digest_items_user_id'), table_name='digest_items')
+    op.drop_index(op.f('ix_digest_items_id'), table_name='digest_items')
+    op.drop_table('digest_items')
+    op.drop_column('user_notification_settings', 'digest_window_minutes')
+    op.drop_column('user_notification_settings', 'digest_enabled')
+    # Значение DIGEST из enum notificationtype PostgreSQL удалить не позволяет
@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.crud import NotificationCRUD
-from app.schemas import NotificationCreate, NotificationResponse, UserNotificationSettingsUpdate, ChatIdUpdate, UserNotificationSettingsResponse
+from app.schemas import NotificationCreate, NotificationResponse, UserNotificationSettingsUpdate, ChatIdUpdate, UserNotificationSettingsResponse, NotificationStatusUpdate
 from app.services.notification_service import NotificationService
+from app.core.rabbitmq import rabbitmq_client
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
@@ -31,9 +32,9 @@ async def get_notification_settings(
     user_id: str,
     db: AsyncSession = Depends(get_db)
 ):
-    """Получение настроек уведомлений пользователя"""
+    """Получение настроек уведомлений пользователя (без создания строки: нет настроек — значения по умолчанию)"""
     crud = NotificationCRUD(db)
-    return await crud.get_or_create_user_settings(user_id)
+    return await crud.get_user_settings_or_default(user_id)
 
 @router.patch("/users/{user_id}/settings")
 async def update_notification_settings(
@@ -42,7 +43,22 @@ async def update_notification_settings(
     db: AsyncSession = Depends(get_db)
 ):
     crud = NotificationCRUD(db)
-    return await crud.update_user_settings(user_id, settings_update)
+    settings = await crud.update_user_settings(user_id, settings_update)
+    await rabbitmq_client.publish_settings_changed(user_id, settings.chat_id)
+    return settings
+
+@router.post("/{notification_id}/status", response_model=NotificationResponse)
+async def update_notification_status(
+    notification_id: int,
+    status_update: NotificationStatusUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Ручная установка статуса доставки (бот публикует статусы в notifications.status)"""
+    crud = NotificationCRUD(db)
+    notification = await crud.update_notification_status(notification_id, status_update)
+    if not notification:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    return notification
 
 @router.post("/users/{user_id}/chat-id")
 async def set_user_chat_id(
@@ -51,7 +67,9 @@ async def set_user_chat_id(
     db: AsyncSession = Depends(get_db)
 ):
     crud = NotificationCRUD(db)
-    return await crud.set_user_chat_id(user_id, chat_data.chat_id)
+    settings = await crud.set_user_chat_id(user_id, chat_data.chat_id)
+    await rabbitmq_client.publish_settings_changed(user_id, chat_data.chat_id)
+    return settings
 
 @router.post("/users/{user_id}/notify")
 async def create_user_notification(
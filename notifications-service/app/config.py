@@ -6,6 +6,50 @@ class Settings(BaseSettings):
   POSTGRES_DB: str
   DB_HOST: str
 
+  # Пул соединений и логирование SQL (см. app/database.py)
+  DB_POOL_SIZE: int = 10
+  DB_MAX_OVERFLOW: int = 20
+  DB_POOL_PRE_PING: bool = True
+  DB_POOL_RECYCLE: int = 1800  # сек, -1 — не пересоздавать соединения
+  DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 — без ограничения
+  DB_ECHO: bool = False
+  DB_SLOW_QUERY_MS: int = 0  # порог лога медленных запросов, 0 — выключен
+
+  # Статусы доставки от бота пишутся в БД пачками: по размеру пачки или по таймеру (сек)
+  STATUS_BATCH_SIZE: int = 100
+  STATUS_FLUSH_INTERVAL: float = 1.0
+
+  # Напоминания о занятиях: за сколько минут до начала, как часто опрашивать и сколько брать за раз
+  REMINDER_LEAD_MINUTES: int = 60
+  REMINDER_POLL_INTERVAL: float = 30.0
+  REMINDER_BATCH_SIZE: int = 100
+
+  # Тихие часы: часовой пояс берется из auth-service, отложенные уведомления сбрасываются пачками
+  AUTH_SERVICE_URL: str = "http://auth-service:8002"
+  DEFAULT_TIMEZONE: str = "Europe/Kaliningrad"
+  TIMEZONE_SYNC_TTL_HOURS: int = 24
+  QUIET_HOURS_FLUSH_INTERVAL: float = 60.0
+  QUIET_HOURS_BATCH_SIZE: int = 200
+
+  # Дайджест: окно по умолчанию (мин) и как часто проверять наступившие окна (сек)
+  DIGEST_WINDOW_MINUTES: int = 15
+  DIGEST_FLUSH_INTERVAL: float = 30.0
+  DIGEST_BATCH_SIZE: int = 500
+
+  # Обогащение событий lesson.booked / lesson.cancelled: lessons-service и срок жизни кэша (сек)
+  LESSONS_SERVICE_URL: str = "http://lessons-service:8008"
+  DIRECTORY_CACHE_TTL: float = 300.0
+  # Пауза перед возвратом события в очередь, если auth-/lessons-service или RabbitMQ недоступны (сек)
+  BOOKING_EVENTS_RETRY_DELAY: float = 10.0
+
+  # Кэш telegram_enabled получателей в потребителе шаблонных уведомлений: изменения приходят
+  # событием settings.changed, TTL (сек) — страховка на случай потерянного события; 0 — без кэша
+  NOTIFICATION_SETTINGS_CACHE_TTL: float = 300.0
+  NOTIFICATION_SETTINGS_CACHE_MAX_SIZE: int = 10000
+
+  # Шаблоны уведомлений: локаль, если издатель ее не указал или шаблона для нее нет
+  DEFAULT_LOCALE: str = "ru"
+
   @property
   def DATABASE_URL(self) -> str:
     return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.DB_HOST}:5432/{self.POSTGRES_DB}"
@@ -0,0 +1,81 @@
+import aio_pika
+import json
+import asyncio
+import uuid
+import logging
+
+from app.database import AsyncSessionLocal
+from app.crud import NotificationCRUD
+from app.core.rabbitmq import rabbitmq_client
+
+logger = logging.getLogger(__name__)
+
+CHAT_UNREACHABLE_QUEUE = "notifications_chat_unreachable"
+CHAT_UNREACHABLE_ROUTING_KEY = "chat.unreachable"
+
+
+class ChatEventsConsumer:
+    """
+    Принимает от бота события chat.unreachable и отключает Telegram-уведомления пользователя.
+    Новые уведомления в такой чат отсекаются уже в notifications-service, до очереди бота
+    """
+
+    def __init__(self):
+        self.connection = None
+        self.channel = None
+        self.max_retries = 30
+        self.retry_delay = 5
+
+    async def start(self):
+        for attempt in range(self.max_retries):
+            try:
+                self.connection = await aio_pika.connect_robust(rabbitmq_client.connection_string)
+                self.channel = await self.connection.channel()
+                await self.channel.set_qos(prefetch_count=10)
+
+                exchange = await self.channel.declare_exchange(
+                    "notifications",
+                    aio_pika.ExchangeType.DIRECT,
+                    durable=True
+                )
+                queue = await self.channel.declare_queue(CHAT_UNREACHABLE_QUEUE, durable=True)
+                await queue.bind(exchange, routing_key=CHAT_UNREACHABLE_ROUTING_KEY)
+
+                await queue.consume(self._on_chat_unreachable)
+                logger.info("Chat events consumer started")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to start chat events consumer (attempt {attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(self.retry_delay)
+        logger.error("Chat events consumer was not started")
+
+    async def _on_chat_unreachable(self, message: aio_pika.IncomingMessage):
+        async with message.process(requeue=True):
+            try:
+                event = json.loads(message.body.decode())
+            except Exception as e:
+                logger.warning(f"Skipping invalid chat.unreachable event: {e}")
+                return
+
+            user_id = event.get("user_id")
+            if user_id:
+                try:
+                    user_id = str(uuid.UUID(str(user_id)))
+                except ValueError:
+                    user_id = None
+            chat_id = event.get("chat_id")
+
+            async with AsyncSessionLocal() as db:
+                user_ids = await NotificationCRUD(db).disable_unreachable_chat(user_id=user_id, chat_id=chat_id)
+            for affected_user_id in user_ids:
+                await rabbitmq_client.publish_settings_changed(affected_user_id, chat_id)
+
+            logger.info(f"Telegram notifications disabled for unreachable chat {chat_id} (users: {user_ids})")
+
+    async def close(self):
+        if self.connection:
+            await self.connection.close()
+
+
+# Глобальный экземпляр
+chat_events_consumer = ChatEventsConsumer()
@@ -0,0 +1,103 @@
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+
+
+class ServiceDirectory:
+    """
+    Кэш данных других сервисов для обогащения событий: пользователи из auth-service
+    и уроки из lessons-service. Записи живут DIRECTORY_CACHE_TTL секунд, отсутствующие
+    пользователи запрашиваются одним пакетным запросом.
+    None — только если сервис ответил 404; сетевые ошибки и 5xx пробрасываются (httpx.HTTPError),
+    чтобы событие вернулось в очередь, а не потерялось как "не найдено"
+    """
+
+    def __init__(self, ttl: float, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+
+    def _get(self, key: str) -> Optional[Any]:
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+
+    def _set(self, key: str, value: Any) -> None:
+        if len(self._cache) >= self.max_size:
+            # Сначала выбрасываем истекшие, при нехватке места — самые старые записи
+            now = time.monotonic()
+            for k in [k for k, (expires, _) in self._cache.items() if expires <= now]:
+                del self._cache[k]
+            while len(self._cache) >= self.max_size:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (time.monotonic() + self.ttl, value)
+
+    def _remember_user(self, user: dict) -> None:
+        self._set(f"user:{user['id']}", user)
+        if user.get("telegram_id"):
+            self._set(f"tg:{user['telegram_id']}", user)
+
+    async def get_users(self, user_ids: Iterable[str]) -> Dict[str, dict]:
+        result, missing = {}, []
+        for user_id in {str(uid) for uid in user_ids if uid}:
+            user = self._get(f"user:{user_id}")
+            if user:
+                result[user_id] = user
+            else:
+                missing.append(user_id)
+
+        if missing:
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    f"{settings.AUTH_SERVICE_URL}/auth/users/by-uuids",
+                    json=missing,
+                    timeout=5
+                )
+            response.raise_for_status()
+            for user in response.json():
+                self._remember_user(user)
+                result[str(user["id"])] = user
+        return result
+
+    async def get_user(self, user_id: str) -> Optional[dict]:
+        return (await self.get_users([user_id])).get(str(user_id))
+
+    async def get_user_by_telegram(self, telegram_id: int) -> Optional[dict]:
+        user = self._get(f"tg:{telegram_id}")
+        if user:
+            return user
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{settings.AUTH_SERVICE_URL}/auth/user-by-telegram/{telegram_id}",
+                timeout=5
+            )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        user = response.json()
+        self._remember_user(user)
+        return user
+
+    async def get_lesson(self, lesson_id: int) -> Optional[dict]:
+        lesson = self._get(f"lesson:{lesson_id}")
+        if lesson:
+            return lesson
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{settings.LESSONS_SERVICE_URL}/lessons/{lesson_id}",
+                timeout=5
+            )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        lesson = response.json()
+        self._set(f"lesson:{lesson_id}", lesson)
+        return lesson
+
+
+# Глобальный экземпляр
+directory = ServiceDirectory(ttl=settings.DIRECTORY_CACHE_TTL)
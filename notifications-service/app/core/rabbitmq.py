@@ -1,11 +1,16 @@
 import aio_pika
 import json
 import asyncio
-from typing import Any, Dict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+SETTINGS_CHANGED_ROUTING_KEY = "settings.changed"
+# Ключ в Notification.data с исходным сообщением издателя, отложенным тихими часами
+DEFERRED_PAYLOAD_KEY = "telegram_payload"
+
 class RabbitMQClient:
     def __init__(self):
         self.connection = None
@@ -70,6 +75,32 @@ class RabbitMQClient:
             await self.reconnect()
             return False
 
+    async def publish_settings_changed(self, user_id: Optional[str] = None, chat_id: Optional[int] = None):
+        """Событие об изменении настроек — каждый экземпляр сервиса сбрасывает по нему кэш настроек"""
+        return await self.publish_notification(
+            {"user_id": str(user_id) if user_id else None, "chat_id": chat_id},
+            routing_key=SETTINGS_CHANGED_ROUTING_KEY
+        )
+
+    async def publish_telegram_notification(self, notification, chat_id: int, created_at: Optional[datetime] = None):
+        """
+        Публикация сохраненного уведомления в очередь бота. Отложенное тихими часами сообщение
+        издателя (data[DEFERRED_PAYLOAD_KEY]) уходит со всеми своими полями
+        """
+        payload = {
+            "user_id": str(notification.user_id),
+            "title": notification.title,
+            "message": notification.message,
+            "notification_type": notification.notification_type.value,
+            **((notification.data or {}).get(DEFERRED_PAYLOAD_KEY) or {}),
+        }
+        return await self.publish_notification({
+            **payload,
+            "notification_id": notification.id,
+            "chat_id": chat_id,
+            "created_at": (created_at or datetime.now(timezone.utc)).isoformat()
+        }, routing_key="telegram")
+
     async def reconnect(self):
         """Повторное подключение при разрыве соединения"""
         logger.info("Attempting to reconnect to RabbitMQ...")
@@ -0,0 +1,80 @@
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app.config import settings
+
+
+def user_key(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def chat_key(chat_id: int) -> str:
+    return f"chat:{chat_id}"
+
+
+class RecipientSettings(NamedTuple):
+    """Снимок настроек получателя, нужных для доставки: включен ли Telegram и тихие часы"""
+    user_id: Optional[str]
+    telegram_enabled: bool
+    quiet_hours_start: Optional[str] = None
+    quiet_hours_end: Optional[str] = None
+    timezone: Optional[str] = None
+
+
+class NotificationSettingsCache:
+    """
+    Кэш настроек получателей (по user_id или chat_id) с TTL и счетчиками попаданий.
+    По user_id владельца настроек событие settings.changed сбрасывает и записи по chat_id
+    """
+
+    def __init__(self, ttl: float = settings.NOTIFICATION_SETTINGS_CACHE_TTL, max_size: int = settings.NOTIFICATION_SETTINGS_CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items: Dict[str, Tuple[float, RecipientSettings]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[RecipientSettings]:
+        item = self._items.get(key)
+        if item is not None and item[0] > time.monotonic():
+            self.hits += 1
+            return item[1]
+        if item is not None:
+            del self._items[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, recipient: RecipientSettings):
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        if len(self._items) >= self.max_size and key not in self._items:
+            # Сначала выбрасываем протухшие записи, если не помогло — самую старую
+            for stale in [k for k, (expires_at, _) in self._items.items() if expires_at <= now]:
+                del self._items[stale]
+            if len(self._items) >= self.max_size:
+                del self._items[next(iter(self._items))]
+        self._items[key] = (now + self.ttl, recipient)
+
+    def invalidate(self, user_id: Optional[str] = None, chat_id: Optional[int] = None):
+        """Сбрасывает записи пользователя (по user_id и по его чатам) и записи чата"""
+        keys = {key for key, (_, recipient) in self._items.items() if user_id and recipient.user_id == user_id}
+        if user_id:
+            keys.add(user_key(user_id))
+        if chat_id:
+            keys.add(chat_key(chat_id))
+        for key in keys:
+            if self._items.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,163 @@
+import aio_pika
+import json
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List
+import logging
+
+from sqlalchemy import select, update, insert
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Notification, NotificationLog, NotificationStatus
+from app.core.rabbitmq import rabbitmq_client
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUE = "notifications_status"
+STATUS_ROUTING_KEY = "notifications.status"
+
+
+class DeliveryStatusConsumer:
+    """
+    Принимает от бота результаты доставки (routing_key notifications.status) и пишет их пачками:
+    один bulk UPDATE notifications на статус и один bulk INSERT в notification_logs на пачку
+    """
+
+    def __init__(self):
+        self.connection = None
+        self.channel = None
+        self.batch_size = settings.STATUS_BATCH_SIZE
+        self.flush_interval = settings.STATUS_FLUSH_INTERVAL
+        self.max_retries = 30
+        self.retry_delay = 5
+        self._buffer: List[aio_pika.IncomingMessage] = []
+        self._lock = asyncio.Lock()
+        self._flusher: asyncio.Task = None
+
+    async def start(self):
+        for attempt in range(self.max_retries):
+            try:
+                self.connection = await aio_pika.connect_robust(rabbitmq_client.connection_string)
+                self.channel = await self.connection.channel()
+                # Неподтвержденных сообщений должно хватать на пачку с запасом
+                await self.channel.set_qos(prefetch_count=self.batch_size * 2)
+
+                exchange = await self.channel.declare_exchange(
+                    "notifications",
+                    aio_pika.ExchangeType.DIRECT,
+                    durable=True
+                )
+                queue = await self.channel.declare_queue(STATUS_QUEUE, durable=True)
+                await queue.bind(exchange, routing_key=STATUS_ROUTING_KEY)
+
+                self._flusher = asyncio.create_task(self._flush_periodically())
+                await queue.consume(self._on_message)
+                logger.info("Delivery status consumer started")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to start delivery status consumer (attempt {attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(self.retry_delay)
+        logger.error("Delivery status consumer was not started")
+
+    async def _on_message(self, message: aio_pika.IncomingMessage):
+        self._buffer.append(message)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush delivery statuses: {e}")
+
+    async def flush(self):
+        async with self._lock:
+            if not self._buffer:
+                return
+            messages, self._buffer = self._buffer, []
+
+            try:
+                await self._write_batch(messages)
+            except Exception as e:
+                logger.error(f"Failed to write {len(messages)} delivery statuses, requeueing: {e}")
+                for message in messages:
+                    await message.nack(requeue=True)
+                return
+
+            for message in messages:
+                await message.ack()
+
+    async def _write_batch(self, messages: List[aio_pika.IncomingMessage]):
+        events = []
+        for message in messages:
+            try:
+                event = json.loads(message.body.decode())
+                events.append({
+                    "notification_id": int(event["notification_id"]),
+                    "status": NotificationStatus(event["status"]),
+                    "error_message": event.get("error_message"),
+                    "details": event.get("details"),
+                    "timestamp": datetime.fromisoformat(event["timestamp"]) if event.get("timestamp") else datetime.now(timezone.utc),
+                })
+            except Exception as e:
+                logger.warning(f"Skipping invalid delivery status event: {e}")
+
+        if not events:
+            return
+
+        async with AsyncSessionLocal() as db:
+            # Уведомления могли быть удалены — логи пишем только для существующих
+            result = await db.execute(
+                select(Notification.id).where(Notification.id.in_({e["notification_id"] for e in events}))
+            )
+            existing_ids = set(result.scalars().all())
+            events = [e for e in events if e["notification_id"] in existing_ids]
+            if not events:
+                return
+
+            # Последний статус по каждому уведомлению, сгруппированный по статусу
+            latest: Dict[int, dict] = {}
+            for event in sorted(events, key=lambda e: e["timestamp"]):
+                latest[event["notification_id"]] = event
+
+            by_status: Dict[NotificationStatus, List[dict]] = {}
+            for event in latest.values():
+                row = {"id": event["notification_id"], "status": event["status"]}
+                if event["status"] == NotificationStatus.SENT:
+                    row["sent_at"] = event["timestamp"]
+                elif event["status"] == NotificationStatus.DELIVERED:
+                    row["delivered_at"] = event["timestamp"]
+                by_status.setdefault(event["status"], []).append(row)
+
+            for rows in by_status.values():
+                await db.execute(update(Notification), rows)
+
+            await db.execute(insert(NotificationLog), [
+                {
+                    "notification_id": e["notification_id"],
+                    "event": e["status"].value,
+                    "details": e["details"],
+                    "error_message": e["error_message"],
+                }
+                for e in events
+            ])
+            await db.commit()
+
+        logger.info(f"Stored {len(events)} delivery statuses")
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush delivery statuses on shutdown: {e}")
+        if self.connection:
+            await self.connection.close()
+
+
+# Глобальный экземпляр
+delivery_status_consumer = DeliveryStatusConsumer()
@@ -0,0 +1,154 @@
+import aio_pika
+import json
+import asyncio
+import uuid
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.database import AsyncSessionLocal
+from app.crud import NotificationCRUD
+from app.core.rabbitmq import rabbitmq_client, SETTINGS_CHANGED_ROUTING_KEY
+from app.core.settings_cache import NotificationSettingsCache, RecipientSettings, chat_key, user_key
+from app.services import quiet_hours
+from app.services.templates import template_registry
+
+logger = logging.getLogger(__name__)
+
+TEMPLATED_QUEUE = "notifications_templated"
+TEMPLATED_ROUTING_KEY = "notifications.templated"
+
+
+class TemplatedNotificationsConsumer:
+    """
+    Принимает от сервисов уведомления вида {notification_type, template?, locale?, params, chat_id, ...},
+    собирает title/message по реестру шаблонов и передает в очередь бота. Остальные поля
+    сообщения (user_id, group_id и т.п.) уходят боту как есть.
+
+    Настройки получателя проверяются здесь, по локальной таблице (по user_id, иначе по chat_id):
+    издателям не нужно ходить за ними в notifications-service и auth-service. Настройки кэшируются
+    с TTL, изменения настроек сбрасывают кэш событием settings.changed. В тихие часы получателя
+    уведомление откладывается (notifications.deliver_after) и уходит через QuietHoursFlusher
+    """
+
+    def __init__(self):
+        self.connection = None
+        self.channel = None
+        self.max_retries = 30
+        self.retry_delay = 5
+        self.settings_cache = NotificationSettingsCache()
+
+    async def start(self):
+        for attempt in range(self.max_retries):
+            try:
+                self.connection = await aio_pika.connect_robust(rabbitmq_client.connection_string)
+                self.channel = await self.connection.channel()
+                await self.channel.set_qos(prefetch_count=50)
+
+                exchange = await self.channel.declare_exchange(
+                    "notifications",
+                    aio_pika.ExchangeType.DIRECT,
+                    durable=True
+                )
+                queue = await self.channel.declare_queue(TEMPLATED_QUEUE, durable=True)
+                await queue.bind(exchange, routing_key=TEMPLATED_ROUTING_KEY)
+
+                await queue.consume(self._on_message)
+
+                # Эксклюзивная очередь: событие settings.changed получает каждый экземпляр сервиса
+                changes = await self.channel.declare_queue("", exclusive=True, auto_delete=True)
+                await changes.bind(exchange, routing_key=SETTINGS_CHANGED_ROUTING_KEY)
+                await changes.consume(self._on_settings_changed, no_ack=True)
+
+                logger.info("Templated notifications consumer started")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to start templated notifications consumer (attempt {attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(self.retry_delay)
+        logger.error("Templated notifications consumer was not started")
+
+    async def _on_message(self, message: aio_pika.IncomingMessage):
+        async with message.process(requeue=True):
+            try:
+                data = json.loads(message.body.decode())
+                params = data.pop("params", None) or {}
+                template = data.pop("template", None) or data["notification_type"]
+                data["title"], data["message"] = template_registry.render(template, params, data.pop("locale", None))
+            except (ValueError, KeyError, TypeError) as e:
+                # Битое сообщение или неизвестный шаблон — повтор не поможет
+                logger.warning(f"Skipping templated notification that cannot be rendered: {e}")
+                return
+
+            recipient = await self._recipient(data)
+            if recipient and not recipient.telegram_enabled:
+                logger.info(f"Telegram notifications disabled for chat {data.get('chat_id')}, skipping {data.get('notification_type')}")
+                return
+
+            until = quiet_hours.deliver_after(recipient, datetime.now(timezone.utc)) if recipient and recipient.user_id else None
+            if until:
+                async with AsyncSessionLocal() as db:
+                    db.add(quiet_hours.deferred_notification(recipient.user_id, data, until))
+                    await db.commit()
+                logger.info(f"Templated notification for chat {data.get('chat_id')} deferred until {until.isoformat()} (quiet hours)")
+                return
+
+            if not await rabbitmq_client.publish_notification(data, routing_key="telegram"):
+                raise RuntimeError("Failed to publish rendered notification")
+
+    async def _on_settings_changed(self, message: aio_pika.IncomingMessage):
+        try:
+            event = json.loads(message.body.decode())
+            user_id = str(event["user_id"]) if event.get("user_id") else None
+            chat_id = int(event["chat_id"]) if event.get("chat_id") else None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Invalid settings.changed event: {e}")
+            return
+        self.settings_cache.invalidate(user_id=user_id, chat_id=chat_id)
+
+    async def _recipient(self, data: dict) -> Optional[RecipientSettings]:
+        """
+        Настройки получателя по user_id, иначе по chat_id (None — получатель не указан).
+        Нет настроек — уведомления включены (как у get_or_create_user_settings)
+        """
+        user_id = None
+        try:
+            user_id = str(uuid.UUID(str(data["user_id"]))) if data.get("user_id") else None
+        except ValueError:
+            pass
+        chat_id = int(data["chat_id"]) if not user_id and data.get("chat_id") else None
+        if not user_id and not chat_id:
+            return None
+
+        key = user_key(user_id) if user_id else chat_key(chat_id)
+        recipient = self.settings_cache.get(key)
+        if recipient is not None:
+            return recipient
+
+        async with AsyncSessionLocal() as db:
+            crud = NotificationCRUD(db)
+            if user_id:
+                user_settings = await crud.get_user_settings(user_id)
+            else:
+                user_settings = await crud.get_settings_by_chat_id(chat_id)
+            if user_settings is None:
+                recipient = RecipientSettings(user_id=user_id, telegram_enabled=True)
+            else:
+                await quiet_hours.sync_timezones([user_settings])
+                await db.commit()
+                recipient = RecipientSettings(
+                    user_id=str(user_settings.user_id),
+                    telegram_enabled=bool(user_settings.telegram_enabled),
+                    quiet_hours_start=user_settings.quiet_hours_start,
+                    quiet_hours_end=user_settings.quiet_hours_end,
+                    timezone=user_settings.timezone
+                )
+        self.settings_cache.set(key, recipient)
+        return recipient
+
+    async def close(self):
+        if self.connection:
+            await self.connection.close()
+
+
+# Глобальный экземпляр
+templated_consumer = TemplatedNotificationsConsumer()
@@ -1,7 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models import Notification, UserNotificationSettings
-from app.schemas import NotificationCreate, UserNotificationSettingsUpdate
+from sqlalchemy import select, update, or_, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import func
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+from app.models import Notification, NotificationLog, NotificationStatus, UserNotificationSettings, ScheduledReminder, ReminderStatus, DigestItem
+from app.schemas import NotificationCreate, UserNotificationSettingsUpdate, NotificationStatusUpdate
 
 class NotificationCRUD:
     def __init__(self, db: AsyncSession):
@@ -24,6 +28,28 @@ class NotificationCRUD:
         )
         return result.scalars().all()
 
+    async def update_notification_status(self, notification_id: int, status_update: NotificationStatusUpdate) -> Optional[Notification]:
+        """Обновляет статус доставки уведомления и пишет событие в notification_logs"""
+        notification = await self.db.get(Notification, notification_id)
+        if not notification:
+            return None
+
+        notification.status = status_update.status
+        if status_update.status == NotificationStatus.SENT:
+            notification.sent_at = func.now()
+        elif status_update.status == NotificationStatus.DELIVERED:
+            notification.delivered_at = func.now()
+
+        self.db.add(NotificationLog(
+            notification_id=notification_id,
+            event=status_update.status.value,
+            details=status_update.details,
+            error_message=status_update.error_message
+        ))
+        await self.db.commit()
+        await self.db.refresh(notification)
+        return notification
+
     async def get_or_create_user_settings(self, user_id: str) -> UserNotificationSettings:
         result = await self.db.execute(
             select(UserNotificationSettings)
@@ -55,3 +81,245 @@ class NotificationCRUD:
         await self.db.commit()
         await self.db.refresh(settings)
         return settings
+
+    async def disable_unreachable_chat(self, user_id: Optional[str] = None, chat_id: Optional[int] = None) -> List[str]:
+        """
+        Отключает Telegram-уведомления для недоступного чата (бот заблокирован / чат не найден):
+        telegram_enabled = false, chat_id = NULL. Возвращает user_id затронутых пользователей
+        """
+        conditions = []
+        if user_id:
+            conditions.append(UserNotificationSettings.user_id == user_id)
+        if chat_id:
+            conditions.append(UserNotificationSettings.chat_id == chat_id)
+        if not conditions:
+            return []
+
+        result = await self.db.execute(
+            update(UserNotificationSettings)
+            .where(or_(*conditions))
+            .values(telegram_enabled=False, chat_id=None)
+            .returning(UserNotificationSettings.user_id)
+        )
+        user_ids = [str(uid) for uid in result.scalars().all()]
+
+        # Настроек еще нет — создаем сразу отключенными, чтобы издатели не отправляли повторно
+        if not user_ids and user_id:
+            self.db.add(UserNotificationSettings(user_id=user_id, telegram_enabled=False))
+            user_ids = [str(user_id)]
+
+        await self.db.commit()
+        return user_ids
+
+    async def upsert_session_reminder(
+        self,
+        *,
+        session_id: int,
+        lesson_id: int,
+        lesson_title: Optional[str],
+        teacher_telegram_id: Optional[int],
+        student_ids: List[str],
+        start_time: datetime,
+        remind_at: datetime,
+        cancelled: bool,
+        event_at: datetime
+    ) -> None:
+        """
+        Создает или обновляет напоминание о сессии одним INSERT ... ON CONFLICT.
+        Событие старше уже примененного игнорируется; при переносе времени или
+        восстановлении отмененной сессии напоминание снова становится ожидающим
+        """
+        stmt = pg_insert(ScheduledReminder).values(
+            session_id=session_id,
+            lesson_id=lesson_id,
+            lesson_title=lesson_title,
+            teacher_telegram_id=teacher_telegram_id,
+            student_ids=student_ids,
+            start_time=start_time,
+            remind_at=remind_at,
+            status=ReminderStatus.CANCELLED if cancelled else ReminderStatus.PENDING,
+            event_at=event_at,
+            students_event_at=event_at
+        )
+        reset = or_(
+            stmt.excluded.status == ReminderStatus.CANCELLED,
+            ScheduledReminder.status == ReminderStatus.CANCELLED,
+            ScheduledReminder.remind_at != stmt.excluded.remind_at
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ScheduledReminder.session_id],
+            set_={
+                "lesson_id": stmt.excluded.lesson_id,
+                "lesson_title": stmt.excluded.lesson_title,
+                "teacher_telegram_id": stmt.excluded.teacher_telegram_id,
+                "student_ids": case(
+                    (ScheduledReminder.students_event_at <= stmt.excluded.event_at, stmt.excluded.student_ids),
+                    else_=ScheduledReminder.student_ids
+                ),
+                "students_event_at": func.greatest(ScheduledReminder.students_event_at, stmt.excluded.event_at),
+                "start_time": stmt.excluded.start_time,
+                "remind_at": stmt.excluded.remind_at,
+                "status": case((reset, stmt.excluded.status), else_=ScheduledReminder.status),
+                "sent_at": case((reset, None), else_=ScheduledReminder.sent_at),
+                "event_at": stmt.excluded.event_at,
+                "updated_at": func.now()
+            },
+            where=ScheduledReminder.event_at <= stmt.excluded.event_at
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def set_lesson_reminder_students(self, lesson_id: int, student_ids: List[str], event_at: datetime) -> None:
+        """
+        Обновляет список студентов во всех ожидающих напоминаниях урока. События приходят
+        не по порядку: список, полученный позже event_at, не перезаписывается
+        """
+        await self.db.execute(
+            update(ScheduledReminder)
+            .where(
+                ScheduledReminder.lesson_id == lesson_id,
+                ScheduledReminder.status == ReminderStatus.PENDING,
+                ScheduledReminder.students_event_at <= event_at
+            )
+            .values(student_ids=student_ids, students_event_at=event_at)
+        )
+        await self.db.commit()
+
+    async def claim_due_reminders(self, limit: int) -> List[ScheduledReminder]:
+        """
+        Блокирует пачку наступивших напоминаний (FOR UPDATE SKIP LOCKED):
+        несколько реплик разбирают очередь, не мешая друг другу. Коммит — за вызывающим
+        """
+        result = await self.db.execute(
+            select(ScheduledReminder)
+            .where(
+                ScheduledReminder.status == ReminderStatus.PENDING,
+                ScheduledReminder.remind_at <= func.now()
+            )
+            .order_by(ScheduledReminder.remind_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
+
+    async def get_settings_for_recipients(self, user_ids: Iterable[str], chat_ids: Iterable[int]) -> List[UserNotificationSettings]:
+        """Настройки получателей одним запросом: студенты по user_id, преподаватели по chat_id"""
+        user_ids, chat_ids = list(user_ids), list(chat_ids)
+        conditions = []
+        if user_ids:
+            conditions.append(UserNotificationSettings.user_id.in_(user_ids))
+        if chat_ids:
+            conditions.append(UserNotificationSettings.chat_id.in_(chat_ids))
+        if not conditions:
+            return []
+        result = await self.db.execute(select(UserNotificationSettings).where(or_(*conditions)))
+        return result.scalars().all()
+
+    async def claim_deferred_notifications(self, limit: int):
+        """
+        Пачка уведомлений, у которых закончились тихие часы, вместе с настройками получателя.
+        Строки уведомлений блокируются FOR UPDATE SKIP LOCKED. Коммит — за вызывающим
+        """
+        result = await self.db.execute(
+            select(Notification, UserNotificationSettings)
+            .outerjoin(UserNotificationSettings, UserNotificationSettings.user_id == Notification.user_id)
+            .where(
+                Notification.deliver_after.is_not(None),
+                Notification.deliver_after <= func.now()
+            )
+            .order_by(Notification.deliver_after)
+            .limit(limit)
+            .with_for_update(of=Notification, skip_locked=True)
+        )
+        return result.all()
+
+    async def get_user_settings(self, user_id: str) -> Optional[UserNotificationSettings]:
+        result = await self.db.execute(
+            select(UserNotificationSettings)
+            .where(UserNotificationSettings.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_user_settings_or_default(self, user_id: str) -> UserNotificationSettings:
+        """Настройки только на чтение: если строки нет, возвращается несохраненный объект со значениями по умолчанию"""
+        settings = await self.get_user_settings(user_id)
+        if settings is None:
+            settings = UserNotificationSettings(user_id=user_id)
+            # Column(default=...) применяются только при INSERT — заполняем их сами
+            for column in UserNotificationSettings.__table__.columns:
+                if column.default is not None and column.default.is_scalar:
+                    setattr(settings, column.key, column.default.arg)
+        return settings
+
+    async def add_digest_item(
+        self,
+        *,
+        user_id: str,
+        chat_id: int,
+        notification_type: str,
+        title: str,
+        message: str,
+        window_minutes: int
+    ) -> DigestItem:
+        """Добавляет событие в текущее окно дайджеста получателя (или открывает новое окно)"""
+        result = await self.db.execute(
+            select(func.min(DigestItem.flush_at)).where(DigestItem.user_id == user_id)
+        )
+        flush_at = result.scalar() or datetime.now(timezone.utc) + timedelta(minutes=window_minutes)
+
+        item = DigestItem(
+            user_id=user_id,
+            chat_id=chat_id,
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            flush_at=flush_at
+        )
+        self.db.add(item)
+        await self.db.commit()
+        return item
+
+    async def claim_due_digest_items(self, limit: int) -> List[DigestItem]:
+        """
+        Наступившие события дайджестов, сгруппированные по получателю (FOR UPDATE SKIP LOCKED).
+        limit — число получателей, а не событий: события одного получателя не делятся между пачками
+        """
+        due_users = (
+            select(DigestItem.user_id)
+            .where(DigestItem.flush_at <= func.now())
+            .group_by(DigestItem.user_id)
+            .order_by(func.min(DigestItem.flush_at))
+            .limit(limit)
+        )
+        result = await self.db.execute(
+            select(DigestItem)
+            .where(
+                DigestItem.user_id.in_(due_users.scalar_subquery()),
+                DigestItem.flush_at <= func.now()
+            )
+            .order_by(DigestItem.user_id, DigestItem.id)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
+
+    async def get_lesson_first_start(self, lesson_id: int) -> Optional[datetime]:
+        """
+        Начало ближайшей предстоящей сессии урока по локальной таблице напоминаний (без запроса
+        в lessons-service). Прошедшие сессии не учитываются, даже если напоминание по ним еще не отправлено
+        """
+        result = await self.db.execute(
+            select(func.min(ScheduledReminder.start_time)).where(
+                ScheduledReminder.lesson_id == lesson_id,
+                ScheduledReminder.status != ReminderStatus.CANCELLED,
+                ScheduledReminder.start_time >= func.now()
+            )
+        )
+        return result.scalar()
+
+    async def get_settings_by_chat_id(self, chat_id: int) -> Optional[UserNotificationSettings]:
+        result = await self.db.execute(
+            select(UserNotificationSettings)
+            .where(UserNotificationSettings.chat_id == chat_id)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
@@ -1,17 +1,38 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import AsyncSessionLocal
+from app.database import AsyncSessionLocal, pool_stats
 from app.config import settings
 from app.api.notifications import router
 from app.core.rabbitmq import rabbitmq_client
+from app.core.status_consumer import delivery_status_consumer
+from app.core.chat_events_consumer import chat_events_consumer
+from app.core.templated_consumer import templated_consumer
+from app.services.reminder_scheduler import reminder_scheduler
+from app.services.quiet_hours import quiet_hours_flusher
+from app.services.digest import digest_aggregator
+from app.services.booking_events import booking_events_worker
 import asyncio
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Запускаем подключение к RabbitMQ в фоне, не блокируя запуск приложения
     asyncio.create_task(rabbitmq_client.connect())
+    asyncio.create_task(delivery_status_consumer.start())
+    asyncio.create_task(chat_events_consumer.start())
+    asyncio.create_task(templated_consumer.start())
+    asyncio.create_task(reminder_scheduler.start())
+    quiet_hours_flusher.start()
+    asyncio.create_task(digest_aggregator.start())
+    asyncio.create_task(booking_events_worker.start())
     yield
+    await booking_events_worker.close()
+    await digest_aggregator.close()
+    await quiet_hours_flusher.close()
+    await reminder_scheduler.close()
+    await templated_consumer.close()
+    await chat_events_consumer.close()
+    await delivery_status_consumer.close()
     await rabbitmq_client.close()
 
 app = FastAPI(
@@ -43,4 +64,14 @@ async def health_check():
         "rabbitmq": rabbitmq_status
     }
 
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Состояние пула соединений с базой"""
+    return pool_stats()
+
+@app.get("/metrics/notification-settings-cache")
+async def notification_settings_cache_metrics():
+    """Статистика кэша настроек получателей (hit rate и т.д.)"""
+    return templated_consumer.settings_cache.stats()
+
 app.include_router(router)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, BigInteger, DateTime, Boolean, Text, ForeignKey, Enum, JSON
+from sqlalchemy import Column, Integer, String, BigInteger, DateTime, Boolean, Text, ForeignKey, Enum, JSON, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -16,6 +16,7 @@ class NotificationType(enum.Enum):
   GRADE_RECEIVED = "grade_received"
   SYSTEM_MESSAGE = "system_message"
   TEACHER_MESSAGE = "teacher_message"
+  DIGEST = "digest"
 
 class NotificationStatus(enum.Enum):
   PENDING = "pending"
@@ -24,6 +25,11 @@ class NotificationStatus(enum.Enum):
   READ = "read"
   FAILED = "failed"
 
+class ReminderStatus(enum.Enum):
+  PENDING = "pending"
+  SENT = "sent"
+  CANCELLED = "cancelled"
+
 class NotificationChannel(enum.Enum):
   TELEGRAM = "telegram"
   EMAIL = "email"
@@ -50,6 +56,8 @@ class Notification(Base):
 
   # Время
   scheduled_at = Column(DateTime(timezone=True), nullable=True)
+  # Отложено до конца тихих часов получателя
+  deliver_after = Column(DateTime(timezone=True), nullable=True)
   sent_at = Column(DateTime(timezone=True), nullable=True)
   delivered_at = Column(DateTime(timezone=True), nullable=True)
   read_at = Column(DateTime(timezone=True), nullable=True)
@@ -63,6 +71,15 @@ class Notification(Base):
   group_id = Column(Integer, nullable=True)  # ID группы (если связано с группой)
   sender_telegram_id = Column(BigInteger, nullable=True)  # ID отправителя
 
+  __table_args__ = (
+    # Сброс отложенных уведомлений читает только их, без скана всей таблицы
+    Index(
+      "ix_notifications_deliver_after",
+      "deliver_after",
+      postgresql_where=text("deliver_after IS NOT NULL")
+    ),
+  )
+
 class UserNotificationSettings(Base):
   __tablename__ = "user_notification_settings"
 
@@ -85,6 +102,13 @@ class UserNotificationSettings(Base):
   # Время тишины
   quiet_hours_start = Column(String(5), nullable=True)  # "22:00"
   quiet_hours_end = Column(String(5), nullable=True)  # "08:00"
+  # Часовой пояс пользователя из auth-service (кэш, обновляется раз в TIMEZONE_SYNC_TTL_HOURS)
+  timezone = Column(String(50), nullable=True)
+  timezone_synced_at = Column(DateTime(timezone=True), nullable=True)
+
+  # Дайджест: события записи/отмены копятся digest_window_minutes и уходят одним сообщением
+  digest_enabled = Column(Boolean, default=False)
+  digest_window_minutes = Column(Integer, nullable=True)
 
   # Временные метки
   created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -103,3 +127,54 @@ class NotificationLog(Base):
 
   # Временные метки
   created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ScheduledReminder(Base):
+  """Напоминание о сессии занятия: одна строка на сессию, обновляется событиями lessons-service"""
+  __tablename__ = "scheduled_reminders"
+
+  id = Column(Integer, primary_key=True, index=True)
+  session_id = Column(Integer, unique=True, nullable=False)
+  lesson_id = Column(Integer, nullable=False, index=True)
+  lesson_title = Column(String(255), nullable=True)
+
+  # Получатели: преподаватель по telegram_id, студенты по user_id
+  teacher_telegram_id = Column(BigInteger, nullable=True)
+  student_ids = Column(JSON, nullable=True)
+
+  start_time = Column(DateTime(timezone=True), nullable=False)
+  remind_at = Column(DateTime(timezone=True), nullable=False)
+  status = Column(Enum(ReminderStatus), nullable=False, default=ReminderStatus.PENDING)
+
+  # Время события-источника: более старые события не перезаписывают более новые.
+  # Список студентов меняют и события сессии, и lesson.participants.changed — у него свое время
+  event_at = Column(DateTime(timezone=True), nullable=False)
+  students_event_at = Column(DateTime(timezone=True), nullable=False)
+  sent_at = Column(DateTime(timezone=True), nullable=True)
+
+  created_at = Column(DateTime(timezone=True), server_default=func.now())
+  updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+  __table_args__ = (
+    # Диспетчер выбирает только ожидающие напоминания по времени срабатывания
+    Index(
+      "ix_scheduled_reminders_pending_remind_at",
+      "remind_at",
+      postgresql_where=text("status = 'PENDING'")
+    ),
+  )
+
+class DigestItem(Base):
+  """Событие, ожидающее отправки в составе дайджеста получателя"""
+  __tablename__ = "digest_items"
+
+  id = Column(Integer, primary_key=True, index=True)
+  user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+  chat_id = Column(BigInteger, nullable=False)
+
+  notification_type = Column(String(50), nullable=False)  # "lesson_booking", "lesson_cancellation", ...
+  title = Column(String(255), nullable=False)
+  message = Column(Text, nullable=False)
+
+  # Все события одного окна получателя имеют общий flush_at
+  flush_at = Column(DateTime(timezone=True), nullable=False, index=True)
+  created_at = Column(DateTime(timezone=True), server_default=func.now())
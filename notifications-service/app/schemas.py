@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, Any
 from uuid import UUID
@@ -42,6 +42,8 @@ class UserNotificationSettingsBase(BaseModel):
     marketing_messages: Optional[bool] = None
     quiet_hours_start: Optional[str] = None
     quiet_hours_end: Optional[str] = None
+    digest_enabled: Optional[bool] = None
+    digest_window_minutes: Optional[int] = Field(None, ge=1, le=1440)
 
 class UserNotificationSettingsCreate(BaseModel):
     user_id: UUID
@@ -51,9 +53,9 @@ class UserNotificationSettingsUpdate(UserNotificationSettingsBase):
     pass
 
 class UserNotificationSettingsResponse(UserNotificationSettingsBase):
-    id: int
+    id: Optional[int] = None  # None — настройки еще не сохранялись, значения по умолчанию
     user_id: UUID
-    created_at: datetime
+    created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -76,6 +78,11 @@ class NotificationLogResponse(NotificationLogBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class NotificationStatusUpdate(BaseModel):
+    status: NotificationStatus
+    details: Optional[str] = None
+    error_message: Optional[str] = None
+
 # Схемы для API ответов
 class NotificationSettingsStatus(BaseModel):
     notifications_enabled: bool
@@ -0,0 +1,204 @@
+import aio_pika
+import json
+import asyncio
+import uuid
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.crud import NotificationCRUD
+from app.core.rabbitmq import rabbitmq_client
+from app.core.directory import directory
+from app.services.digest import digest_aggregator
+from app.services.templates import template_registry
+
+logger = logging.getLogger(__name__)
+
+BOOKING_EVENTS_QUEUE = "notifications_booking_events"
+LESSON_BOOKED_ROUTING_KEY = "lesson.booked"
+LESSON_CANCELLED_ROUTING_KEY = "lesson.cancelled"
+
+
+def _date_time_info(start: Optional[datetime]) -> str:
+    if not start:
+        return "дата и время уточняются"
+    return f"{start.strftime('%d.%m.%Y')} в {start.strftime('%H:%M')}"
+
+
+def _render(template: str, params: dict, **notification) -> dict:
+    title, message = template_registry.render(template, params)
+    return {"title": title, "message": message, **notification}
+
+
+def _parse_event(event: dict) -> dict:
+    """Проверка события до обращения к другим сервисам: ValueError / KeyError / TypeError — битое событие"""
+    cancelled_by = event.get("cancelled_by_telegram_id")
+    return {
+        "lesson_id": int(event["lesson_id"]),
+        "student_id": str(uuid.UUID(str(event["student_id"]))),
+        "cancelled_by_telegram_id": int(cancelled_by) if cancelled_by is not None else None,
+    }
+
+
+class BookingEventsWorker:
+    """
+    Обработчик событий lesson.booked / lesson.cancelled из lessons-service. События содержат
+    только идентификаторы: имена и telegram_id берутся из кэша directory, дата первой сессии —
+    из локальной таблицы напоминаний, текст — по реестру шаблонов.
+    Битые события подтверждаются и пишутся в лог; при недоступности auth-/lessons-service
+    или RabbitMQ событие возвращается в очередь через BOOKING_EVENTS_RETRY_DELAY секунд
+    """
+
+    def __init__(self):
+        self.connection = None
+        self.channel = None
+        self.max_retries = 30
+        self.retry_delay = 5
+        self.event_retry_delay = settings.BOOKING_EVENTS_RETRY_DELAY
+
+    async def start(self):
+        for attempt in range(self.max_retries):
+            try:
+                self.connection = await aio_pika.connect_robust(rabbitmq_client.connection_string)
+                self.channel = await self.connection.channel()
+                await self.channel.set_qos(prefetch_count=20)
+
+                exchange = await self.channel.declare_exchange(
+                    "notifications",
+                    aio_pika.ExchangeType.DIRECT,
+                    durable=True
+                )
+                queue = await self.channel.declare_queue(BOOKING_EVENTS_QUEUE, durable=True)
+                await queue.bind(exchange, routing_key=LESSON_BOOKED_ROUTING_KEY)
+                await queue.bind(exchange, routing_key=LESSON_CANCELLED_ROUTING_KEY)
+
+                await queue.consume(self._on_message)
+                logger.info("Booking events worker started")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to start booking events worker (attempt {attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(self.retry_delay)
+        logger.error("Booking events worker was not started")
+
+    async def _on_message(self, message: aio_pika.IncomingMessage):
+        async with message.process(requeue=True):
+            try:
+                event = _parse_event(json.loads(message.body.decode()))
+            except (ValueError, KeyError, TypeError) as e:
+                # Битое событие: повтор не поможет, не возвращаем его в очередь
+                logger.warning(f"Skipping invalid booking event: {e!r}")
+                return
+
+            try:
+                if message.routing_key == LESSON_BOOKED_ROUTING_KEY:
+                    notifications = await self.render_booked(event)
+                else:
+                    notifications = await self.render_cancelled(event)
+
+                for notification in notifications:
+                    await digest_aggregator.deliver(notification)
+            except Exception as e:
+                # Сервис-источник или RabbitMQ недоступны: пауза, чтобы не крутить событие
+                # в очереди вхолостую, затем message.process вернет его в очередь
+                logger.warning(f"Failed to process booking event for lesson {event['lesson_id']}, retrying in {self.event_retry_delay}s: {e!r}")
+                await asyncio.sleep(self.event_retry_delay)
+                raise
+
+    async def _context(self, event: dict):
+        """Урок, студент и параметры шаблона для события"""
+        lesson = await directory.get_lesson(event["lesson_id"])
+        if not lesson:
+            logger.warning(f"Lesson {event['lesson_id']} not found, skipping booking event")
+            return None, None, None
+        if not lesson.get("teacher_telegram_id"):
+            logger.warning(f"Lesson {event['lesson_id']} has no teacher_telegram_id, skipping booking event")
+            return None, None, None
+
+        async with AsyncSessionLocal() as db:
+            first_start = await NotificationCRUD(db).get_lesson_first_start(event["lesson_id"])
+
+        student = await directory.get_user(event["student_id"])
+        params = {
+            "student_name": (student or {}).get("full_name") or "Студент",
+            "lesson_title": lesson.get("title"),
+            "date_time": _date_time_info(first_start),
+            "language": lesson.get("language"),
+            "level": lesson.get("level")
+        }
+        return lesson, student, params
+
+    async def _teacher_user_id(self, teacher_telegram_id: int) -> Optional[str]:
+        # Сначала по локальным настройкам уведомлений (chat_id == telegram_id), затем через auth-service
+        async with AsyncSessionLocal() as db:
+            user_settings = await NotificationCRUD(db).get_settings_by_chat_id(teacher_telegram_id)
+        if user_settings:
+            return str(user_settings.user_id)
+        teacher = await directory.get_user_by_telegram(teacher_telegram_id)
+        return str(teacher["id"]) if teacher else None
+
+    async def render_booked(self, event: dict) -> List[dict]:
+        """Уведомление преподавателю о записи студента"""
+        lesson, student, params = await self._context(event)
+        if not lesson:
+            return []
+
+        teacher_telegram_id = lesson["teacher_telegram_id"]
+        teacher_user_id = await self._teacher_user_id(teacher_telegram_id)
+        if not teacher_user_id:
+            return []
+
+        return [_render(
+            "lesson_booking", params,
+            chat_id=teacher_telegram_id,
+            notification_type="lesson_booking",
+            user_id=teacher_user_id,
+            teacher_telegram_id=teacher_telegram_id
+        )]
+
+    async def render_cancelled(self, event: dict) -> List[dict]:
+        """Уведомление об отмене записи тому, кто ее не отменял (если неизвестно — обоим)"""
+        lesson, student, params = await self._context(event)
+        if not lesson:
+            return []
+
+        teacher_telegram_id = lesson["teacher_telegram_id"]
+        student_telegram_id = (student or {}).get("telegram_id")
+        cancelled_by = event.get("cancelled_by_telegram_id")
+
+        by_teacher = cancelled_by and cancelled_by == teacher_telegram_id
+        by_student = cancelled_by and student_telegram_id and cancelled_by == student_telegram_id
+
+        notifications = []
+        if not by_teacher:
+            teacher_user_id = await self._teacher_user_id(teacher_telegram_id)
+            if teacher_user_id:
+                notifications.append(_render(
+                    "lesson_cancellation.by_student" if by_student else "lesson_cancellation.to_teacher", params,
+                    chat_id=teacher_telegram_id,
+                    notification_type="lesson_cancellation",
+                    user_id=teacher_user_id,
+                    teacher_telegram_id=teacher_telegram_id
+                ))
+
+        if not by_student and student_telegram_id:
+            notifications.append(_render(
+                "lesson_cancellation.by_teacher" if by_teacher else "lesson_cancellation.to_student", params,
+                chat_id=student_telegram_id,
+                notification_type="lesson_cancellation",
+                user_id=event["student_id"],
+                telegram_id=student_telegram_id
+            ))
+
+        if not (by_teacher or by_student):
+            logger.warning(f"Could not determine who cancelled the booking. cancelled_by_telegram_id={cancelled_by}, teacher_telegram_id={teacher_telegram_id}, student_telegram_id={student_telegram_id}")
+        return notifications
+
+    async def close(self):
+        if self.connection:
+            await self.connection.close()
+
+
+# Глобальный экземпляр
+booking_events_worker = BookingEventsWorker()
@@ -0,0 +1,229 @@
+import aio_pika
+import json
+import asyncio
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+import logging
+
+from sqlalchemy import delete
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.crud import NotificationCRUD
+from app.models import DigestItem, Notification, NotificationType
+from app.core.rabbitmq import rabbitmq_client
+from app.services import quiet_hours
+
+logger = logging.getLogger(__name__)
+
+DIGEST_QUEUE = "notifications_digest"
+DIGEST_ROUTING_KEY = "notifications.digest"
+
+# Сколько событий показывать в тексте дайджеста целиком
+DIGEST_MAX_ITEMS = 10
+# Лимит длины сообщения Telegram
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Формы слова для 1, 2-4 и 5+ событий каждого типа
+DIGEST_LABELS = {
+    "lesson_booking": ("новая запись", "новые записи", "новых записей"),
+    "lesson_cancellation": ("отмена записи", "отмены записи", "отмен записи"),
+}
+
+
+def plural(count: int, forms: tuple) -> str:
+    if count % 10 == 1 and count % 100 != 11:
+        return forms[0]
+    if 2 <= count % 10 <= 4 and not 12 <= count % 100 <= 14:
+        return forms[1]
+    return forms[2]
+
+
+def render_digest(items: List[DigestItem]) -> str:
+    """"3 новые записи, 1 отмена записи" и тексты первых DIGEST_MAX_ITEMS событий"""
+    counts = Counter(item.notification_type for item in items)
+    summary = ", ".join(
+        f"{count} {plural(count, DIGEST_LABELS.get(kind, ('уведомление', 'уведомления', 'уведомлений')))}"
+        for kind, count in counts.items()
+    )
+
+    parts = [f"<b>{summary.capitalize()}</b>"]
+    for item in items[:DIGEST_MAX_ITEMS]:
+        parts.append(f"<b>{item.title}</b>\n{item.message}")
+    if len(items) > DIGEST_MAX_ITEMS:
+        parts.append(f"…и еще {len(items) - DIGEST_MAX_ITEMS}")
+
+    text = "\n\n".join(parts)
+    if len(text) > TELEGRAM_MESSAGE_LIMIT:
+        # Обрезаем целыми событиями, чтобы не разорвать HTML-теги
+        while len(parts) > 1 and len("\n\n".join(parts + ["…"])) > TELEGRAM_MESSAGE_LIMIT:
+            parts.pop()
+        text = "\n\n".join(parts + ["…"])
+    return text
+
+
+class DigestAggregator:
+    """
+    Режим дайджеста (по желанию получателя). Издатели отправляют события записи/отмены
+    с routing_key notifications.digest: у кого дайджест выключен — событие уходит в очередь
+    бота (в тихие часы — откладывается до их конца), у остальных копится в digest_items и раз
+    в окно уходит одним сообщением
+    """
+
+    def __init__(self):
+        self.connection = None
+        self.channel = None
+        self.max_retries = 30
+        self.retry_delay = 5
+        self.flush_interval = settings.DIGEST_FLUSH_INTERVAL
+        self.batch_size = settings.DIGEST_BATCH_SIZE
+        self._flusher: asyncio.Task = None
+
+    async def start(self):
+        self._flusher = asyncio.create_task(self._flush_periodically())
+
+        for attempt in range(self.max_retries):
+            try:
+                self.connection = await aio_pika.connect_robust(rabbitmq_client.connection_string)
+                self.channel = await self.connection.channel()
+                await self.channel.set_qos(prefetch_count=50)
+
+                exchange = await self.channel.declare_exchange(
+                    "notifications",
+                    aio_pika.ExchangeType.DIRECT,
+                    durable=True
+                )
+                queue = await self.channel.declare_queue(DIGEST_QUEUE, durable=True)
+                await queue.bind(exchange, routing_key=DIGEST_ROUTING_KEY)
+
+                await queue.consume(self._on_message)
+                logger.info("Digest aggregator started")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to start digest aggregator (attempt {attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(self.retry_delay)
+        logger.error("Digest aggregator was not started")
+
+    async def _on_message(self, message: aio_pika.IncomingMessage):
+        async with message.process(requeue=True):
+            try:
+                data = json.loads(message.body.decode())
+            except Exception as e:
+                logger.warning(f"Skipping invalid digest event: {e}")
+                return
+            await self.deliver(data)
+
+    async def deliver(self, data: dict):
+        """
+        Доставка уведомления ({user_id, chat_id, title, message, notification_type}) с учетом
+        режима дайджеста и тихих часов получателя: в окно дайджеста, в отложенные или в очередь бота
+        """
+        try:
+            user_id = str(uuid.UUID(str(data["user_id"])))
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Skipping notification without valid user_id: {e}")
+            return
+
+        async with AsyncSessionLocal() as db:
+            crud = NotificationCRUD(db)
+            user_settings = await crud.get_user_settings(user_id)
+
+            if user_settings and user_settings.telegram_enabled is False:
+                return
+
+            chat_id = (user_settings.chat_id if user_settings else None) or data.get("chat_id")
+            if user_settings and user_settings.digest_enabled and chat_id:
+                await crud.add_digest_item(
+                    user_id=user_id,
+                    chat_id=chat_id,
+                    notification_type=data.get("notification_type") or "system_message",
+                    title=data.get("title", ""),
+                    message=data.get("message", ""),
+                    window_minutes=user_settings.digest_window_minutes or settings.DIGEST_WINDOW_MINUTES
+                )
+                return
+
+            # Без дайджеста тихие часы соблюдаются так же: уведомление ждет в notifications.deliver_after
+            if user_settings:
+                await quiet_hours.sync_timezones([user_settings])
+                until = quiet_hours.deliver_after(user_settings, datetime.now(timezone.utc))
+                if until:
+                    db.add(quiet_hours.deferred_notification(user_id, data, until))
+                    await db.commit()
+                    logger.info(f"Notification for user {user_id} deferred until {until.isoformat()} (quiet hours)")
+                    return
+
+        # Дайджест выключен — отправляем как есть. Сбой публикации пробрасываем, чтобы
+        # событие-источник вернулось в очередь, а не было подтверждено без уведомления
+        if not await rabbitmq_client.publish_notification(data, routing_key="telegram"):
+            raise RuntimeError("Failed to publish notification")
+
+    async def _flush_periodically(self):
+        while True:
+            try:
+                while await self.flush() >= self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to flush digests: {e}")
+            await asyncio.sleep(self.flush_interval)
+
+    async def flush(self) -> int:
+        """Собирает наступившие окна в сообщения — по одному на получателя. Возвращает число получателей"""
+        async with AsyncSessionLocal() as db:
+            crud = NotificationCRUD(db)
+            items = await crud.claim_due_digest_items(self.batch_size)
+            if not items:
+                return 0
+
+            by_user: Dict[str, List[DigestItem]] = defaultdict(list)
+            for item in items:
+                by_user[str(item.user_id)].append(item)
+
+            recipients = await crud.get_settings_for_recipients([uuid.UUID(uid) for uid in by_user], [])
+            await quiet_hours.sync_timezones(recipients)
+            settings_by_user = {str(s.user_id): s for s in recipients}
+
+            now = datetime.now(timezone.utc)
+            ready = []
+            for user_id, user_items in by_user.items():
+                user_settings = settings_by_user.get(user_id)
+                if user_settings and user_settings.telegram_enabled is False:
+                    continue
+
+                notification = Notification(
+                    user_id=user_items[0].user_id,
+                    notification_type=NotificationType.DIGEST,
+                    title="📬 Сводка уведомлений",
+                    message=render_digest(user_items),
+                    data={"items": len(user_items)}
+                )
+                # Дайджест тоже уважает тихие часы
+                deliver_after = quiet_hours.deliver_after(user_settings, now) if user_settings else None
+                if deliver_after:
+                    notification.deliver_after = deliver_after
+                else:
+                    ready.append((notification, (user_settings and user_settings.chat_id) or user_items[-1].chat_id))
+                db.add(notification)
+
+            await db.execute(delete(DigestItem).where(DigestItem.id.in_([item.id for item in items])))
+            await db.commit()
+
+        for notification, chat_id in ready:
+            await rabbitmq_client.publish_telegram_notification(notification, chat_id, now)
+
+        logger.info(f"Flushed {len(items)} digest items into {len(by_user)} digests")
+        return len(by_user)
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+        if self.connection:
+            await self.connection.close()
+
+
+# Глобальный экземпляр
+digest_aggregator = DigestAggregator()
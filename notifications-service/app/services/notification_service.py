@@ -1,6 +1,12 @@
+from datetime import datetime, timezone
+import logging
+
 from app.core.rabbitmq import rabbitmq_client
 from app.crud import NotificationCRUD
 from app.schemas import NotificationCreate
+from app.services import quiet_hours
+
+logger = logging.getLogger(__name__)
 
 class NotificationService:
     def __init__(self, db):
@@ -17,23 +23,23 @@ class NotificationService:
 
         # Проверяем, включены ли уведомления в Telegram и есть ли chat_id
         if user_chat_id and user_settings and user_settings.telegram_enabled:
-            message_data = {
-                "notification_id": notification.id,
-                "user_id": str(notification.user_id),
-                "chat_id": user_chat_id,
-                "title": notification.title,
-                "message": notification.message,
-                "notification_type": notification.notification_type.value,
-                "created_at": notification.created_at.isoformat()
-            }
-
-            await rabbitmq_client.publish_notification(message_data, routing_key="telegram")
-            print(f"Notification {notification.id} published to RabbitMQ for user {user_chat_id}")
+            # В тихие часы не отправляем, а откладываем до их окончания
+            await quiet_hours.sync_timezones([user_settings])
+            deliver_after = quiet_hours.deliver_after(user_settings, datetime.now(timezone.utc))
+            if deliver_after:
+                notification.deliver_after = deliver_after
+                await self.db.commit()
+                logger.info(f"Notification {notification.id} deferred until {deliver_after.isoformat()} (quiet hours)")
+                return notification
+
+            await self.db.commit()
+            await rabbitmq_client.publish_telegram_notification(notification, user_chat_id, notification.created_at)
+            logger.info(f"Notification {notification.id} published to RabbitMQ for user {user_chat_id}")
         else:
             if not user_chat_id:
-                print(f"Notification {notification.id} not sent: no chat_id for user {notification.user_id}")
+                logger.info(f"Notification {notification.id} not sent: no chat_id for user {notification.user_id}")
             elif not user_settings or not user_settings.telegram_enabled:
-                print(f"Notification {notification.id} not sent: telegram notifications disabled for user {notification.user_id}")
+                logger.info(f"Notification {notification.id} not sent: telegram notifications disabled for user {notification.user_id}")
 
         return notification
 
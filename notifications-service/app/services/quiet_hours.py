@@ -0,0 +1,192 @@
+import asyncio
+import uuid
+from datetime import datetime, time, timedelta, timezone
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import logging
+
+import httpx
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.crud import NotificationCRUD
+from app.models import Notification, NotificationType, UserNotificationSettings
+from app.core.rabbitmq import rabbitmq_client, DEFERRED_PAYLOAD_KEY
+
+logger = logging.getLogger(__name__)
+
+
+def parse_hhmm(value: Optional[str]) -> Optional[time]:
+    """"22:00" -> time(22, 0); пустое или некорректное значение -> None"""
+    if not value:
+        return None
+    try:
+        hours, minutes = value.split(":")
+        return time(int(hours), int(minutes))
+    except ValueError:
+        return None
+
+
+def _zone(tz_name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz_name or settings.DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(settings.DEFAULT_TIMEZONE)
+
+
+def quiet_window_end(start: Optional[str], end: Optional[str], tz_name: Optional[str], now: datetime) -> Optional[datetime]:
+    """
+    Если now попадает в тихие часы [start, end) в часовом поясе пользователя —
+    возвращает конец окна в UTC, иначе None. Окно может переходить через полночь (22:00–08:00)
+    """
+    start_t, end_t = parse_hhmm(start), parse_hhmm(end)
+    if start_t is None or end_t is None or start_t == end_t:
+        return None
+
+    local = now.astimezone(_zone(tz_name))
+    current = local.time().replace(tzinfo=None)
+
+    if start_t < end_t:
+        if not (start_t <= current < end_t):
+            return None
+        end_date = local.date()
+    else:
+        if current >= start_t:
+            end_date = local.date() + timedelta(days=1)
+        elif current < end_t:
+            end_date = local.date()
+        else:
+            return None
+
+    local_end = datetime.combine(end_date, end_t, tzinfo=local.tzinfo)
+    return local_end.astimezone(timezone.utc)
+
+
+def deliver_after(user_settings: UserNotificationSettings, now: datetime) -> Optional[datetime]:
+    """До какого момента отложить уведомление пользователю (None — отправлять сразу)"""
+    return quiet_window_end(
+        user_settings.quiet_hours_start,
+        user_settings.quiet_hours_end,
+        user_settings.timezone,
+        now
+    )
+
+
+def deferred_notification(user_id: str, data: dict, until: datetime) -> Notification:
+    """
+    Уведомление для очереди бота ({chat_id, title, message, notification_type, ...}), отложенное
+    до конца тихих часов: сохраняется в notifications с deliver_after, отправит QuietHoursFlusher
+    """
+    try:
+        notification_type = NotificationType(data.get("notification_type"))
+    except ValueError:
+        notification_type = NotificationType.SYSTEM_MESSAGE
+    return Notification(
+        user_id=uuid.UUID(str(user_id)),
+        notification_type=notification_type,
+        title=data.get("title", ""),
+        message=data.get("message", ""),
+        data={DEFERRED_PAYLOAD_KEY: data},
+        deliver_after=until
+    )
+
+
+async def sync_timezones(rows: Iterable[UserNotificationSettings]) -> None:
+    """
+    Подтягивает часовые пояса из auth-service одним пакетным запросом — только для
+    пользователей с тихими часами, у которых пояс неизвестен или устарел. Коммит — за вызывающим
+    """
+    now = datetime.now(timezone.utc)
+    ttl = timedelta(hours=settings.TIMEZONE_SYNC_TTL_HOURS)
+    stale = [
+        row for row in rows
+        if row.quiet_hours_start and row.quiet_hours_end
+        and (not row.timezone_synced_at or now - row.timezone_synced_at > ttl)
+    ]
+    if not stale:
+        return
+
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{settings.AUTH_SERVICE_URL}/auth/users/by-uuids",
+                json=[str(row.user_id) for row in stale],
+                timeout=5
+            )
+        response.raise_for_status()
+        timezones = {user["id"]: user.get("timezone") for user in response.json()}
+    except Exception as e:
+        # Без auth-service используем ранее сохраненный пояс или пояс по умолчанию
+        logger.warning(f"Failed to fetch user timezones from auth-service: {e}")
+        return
+
+    for row in stale:
+        row.timezone = timezones.get(str(row.user_id)) or row.timezone
+        row.timezone_synced_at = now
+
+
+class QuietHoursFlusher:
+    """
+    Отправляет уведомления, отложенные до конца тихих часов. Раз в QUIET_HOURS_FLUSH_INTERVAL
+    секунд забирает наступившие пачкой по частичному индексу deliver_after (FOR UPDATE SKIP LOCKED)
+    """
+
+    def __init__(self):
+        self.flush_interval = settings.QUIET_HOURS_FLUSH_INTERVAL
+        self.batch_size = settings.QUIET_HOURS_BATCH_SIZE
+        self._task: asyncio.Task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self):
+        while True:
+            try:
+                while await self.flush() >= self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to flush deferred notifications: {e}")
+            await asyncio.sleep(self.flush_interval)
+
+    async def flush(self) -> int:
+        async with AsyncSessionLocal() as db:
+            rows = await NotificationCRUD(db).claim_deferred_notifications(self.batch_size)
+            if not rows:
+                return 0
+
+            # deliver_after снимается только после успешной публикации: если RabbitMQ недоступен,
+            # уведомление остается отложенным и уйдет при следующем проходе (возможен дубль,
+            # если упадет коммит после публикации, но не потеря)
+            released = processed = 0
+            for notification, user_settings in rows:
+                # Пока уведомление ждало, пользователь мог отключить Telegram
+                payload = (notification.data or {}).get(DEFERRED_PAYLOAD_KEY) or {}
+                chat_id = (user_settings.chat_id if user_settings else None) or payload.get("chat_id")
+                if user_settings and user_settings.telegram_enabled and chat_id:
+                    try:
+                        published = await rabbitmq_client.publish_telegram_notification(
+                            notification, chat_id, notification.created_at
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to publish deferred notification {notification.id}: {e}")
+                        published = False
+                    if not published:
+                        break
+                    released += 1
+                notification.deliver_after = None
+                processed += 1
+            await db.commit()
+
+        logger.info(f"Released {released} of {len(rows)} deferred notifications")
+        # Сбой публикации — следующую пачку не берем до следующего интервала
+        return len(rows) if processed == len(rows) else 0
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+
+
+# Глобальный экземпляр
+quiet_hours_flusher = QuietHoursFlusher()
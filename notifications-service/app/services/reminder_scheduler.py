@@ -0,0 +1,220 @@
+import aio_pika
+import json
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+import logging
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.crud import NotificationCRUD
+from app.models import Notification, NotificationType, ReminderStatus, ScheduledReminder
+from app.core.rabbitmq import rabbitmq_client
+from app.services import quiet_hours
+from app.services.templates import template_registry
+
+logger = logging.getLogger(__name__)
+
+LESSON_EVENTS_QUEUE = "notifications_lesson_events"
+SESSION_CHANGED_ROUTING_KEY = "lesson.session.changed"
+PARTICIPANTS_CHANGED_ROUTING_KEY = "lesson.participants.changed"
+
+# Сессии в этих статусах не напоминаем
+INACTIVE_SESSION_STATUSES = {"CANCELLED", "COMPLETED"}
+
+
+def _parse_dt(value: Optional[str]) -> datetime:
+    if not value:
+        return datetime.now(timezone.utc)
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _valid_uuids(values: Optional[List[Any]]) -> List[str]:
+    result = []
+    for value in values or []:
+        try:
+            result.append(str(uuid.UUID(str(value))))
+        except ValueError:
+            continue
+    return result
+
+
+class ReminderScheduler:
+    """
+    Планировщик напоминаний о занятиях.
+
+    События сессий из lessons-service (lesson.session.changed, lesson.participants.changed)
+    ведут таблицу scheduled_reminders — по строке на сессию с временем срабатывания remind_at.
+    Диспетчер раз в REMINDER_POLL_INTERVAL секунд забирает наступившие напоминания пачкой
+    через FOR UPDATE SKIP LOCKED, поэтому его можно запускать в нескольких репликах
+    """
+
+    def __init__(self):
+        self.connection = None
+        self.channel = None
+        self.max_retries = 30
+        self.retry_delay = 5
+        self.lead_time = timedelta(minutes=settings.REMINDER_LEAD_MINUTES)
+        self.poll_interval = settings.REMINDER_POLL_INTERVAL
+        self.batch_size = settings.REMINDER_BATCH_SIZE
+        self._dispatcher: asyncio.Task = None
+
+    async def start(self):
+        self._dispatcher = asyncio.create_task(self._dispatch_periodically())
+
+        for attempt in range(self.max_retries):
+            try:
+                self.connection = await aio_pika.connect_robust(rabbitmq_client.connection_string)
+                self.channel = await self.connection.channel()
+                await self.channel.set_qos(prefetch_count=20)
+
+                exchange = await self.channel.declare_exchange(
+                    "notifications",
+                    aio_pika.ExchangeType.DIRECT,
+                    durable=True
+                )
+                queue = await self.channel.declare_queue(LESSON_EVENTS_QUEUE, durable=True)
+                await queue.bind(exchange, routing_key=SESSION_CHANGED_ROUTING_KEY)
+                await queue.bind(exchange, routing_key=PARTICIPANTS_CHANGED_ROUTING_KEY)
+
+                await queue.consume(self._on_lesson_event)
+                logger.info("Reminder scheduler started")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to start reminder scheduler consumer (attempt {attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(self.retry_delay)
+        logger.error("Reminder scheduler consumer was not started")
+
+    # -------- События lessons-service --------
+
+    async def _on_lesson_event(self, message: aio_pika.IncomingMessage):
+        async with message.process(requeue=True):
+            try:
+                event = json.loads(message.body.decode())
+                lesson_id = int(event["lesson_id"])
+                student_ids = _valid_uuids(event.get("student_ids"))
+                event_at = _parse_dt(event.get("occurred_at"))
+                if message.routing_key != PARTICIPANTS_CHANGED_ROUTING_KEY:
+                    session_id = int(event["session_id"])
+                    start_time = _parse_dt(event["start_time"])
+            except (ValueError, KeyError, TypeError) as e:
+                # Битое событие: повтор не поможет, не возвращаем его в очередь
+                logger.warning(f"Skipping invalid lesson event: {e!r}")
+                return
+
+            async with AsyncSessionLocal() as db:
+                crud = NotificationCRUD(db)
+                if message.routing_key == PARTICIPANTS_CHANGED_ROUTING_KEY:
+                    await crud.set_lesson_reminder_students(lesson_id, student_ids, event_at)
+                    return
+
+                await crud.upsert_session_reminder(
+                    session_id=session_id,
+                    lesson_id=lesson_id,
+                    lesson_title=event.get("lesson_title"),
+                    teacher_telegram_id=event.get("teacher_telegram_id"),
+                    student_ids=student_ids,
+                    start_time=start_time,
+                    remind_at=start_time - self.lead_time,
+                    cancelled=event.get("event") == "deleted" or event.get("status") in INACTIVE_SESSION_STATUSES,
+                    event_at=event_at
+                )
+
+    # -------- Диспетчер --------
+
+    async def _dispatch_periodically(self):
+        while True:
+            try:
+                # Пока пачки полные — разбираем без паузы
+                while await self.dispatch_due() >= self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to dispatch reminders: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def dispatch_due(self) -> int:
+        """Отправляет одну пачку наступивших напоминаний, возвращает размер пачки"""
+        async with AsyncSessionLocal() as db:
+            crud = NotificationCRUD(db)
+            reminders = await crud.claim_due_reminders(self.batch_size)
+            if not reminders:
+                return 0
+
+            now = datetime.now(timezone.utc)
+            # Занятие уже началось (например, сервис был недоступен) — напоминание не нужно
+            active = [r for r in reminders if r.start_time > now]
+            active_ids = {r.id for r in active}
+
+            # Настройки всех получателей пачки — одним запросом
+            student_ids = {sid for r in active for sid in (r.student_ids or [])}
+            teacher_ids = {r.teacher_telegram_id for r in active if r.teacher_telegram_id}
+            recipients = await crud.get_settings_for_recipients(
+                [uuid.UUID(sid) for sid in student_ids], teacher_ids
+            )
+            await quiet_hours.sync_timezones(recipients)
+            by_user_id = {str(s.user_id): s for s in recipients}
+            by_chat_id = {s.chat_id: s for s in recipients if s.chat_id}
+
+            notifications = []
+            deferred = []
+            for reminder in active:
+                targets = [by_user_id.get(sid) for sid in (reminder.student_ids or [])]
+                targets.append(by_chat_id.get(reminder.teacher_telegram_id))
+                seen = set()
+                for target in targets:
+                    if not target or target.user_id in seen:
+                        continue
+                    seen.add(target.user_id)
+                    if not (target.chat_id and target.telegram_enabled and target.lesson_reminders):
+                        continue
+                    notification = self._build_notification(reminder, target.user_id)
+                    deliver_after = quiet_hours.deliver_after(target, now)
+                    if deliver_after is None:
+                        notifications.append((target.chat_id, notification))
+                    elif deliver_after < reminder.start_time:
+                        # Тихие часы закончатся до занятия — напомним сразу после них
+                        notification.deliver_after = deliver_after
+                        deferred.append(notification)
+
+            db.add_all([n for _, n in notifications] + deferred)
+
+            for reminder in reminders:
+                reminder.status = ReminderStatus.SENT if reminder.id in active_ids else ReminderStatus.CANCELLED
+                reminder.sent_at = now
+            await db.commit()
+
+        # Публикуем после коммита: при сбое напоминание не уйдет повторно другой репликой
+        for chat_id, notification in notifications:
+            await rabbitmq_client.publish_telegram_notification(notification, chat_id, now)
+
+        logger.info(f"Dispatched {len(reminders)} reminders, {len(notifications)} notifications, {len(deferred)} deferred by quiet hours")
+        return len(reminders)
+
+    def _build_notification(self, reminder: ScheduledReminder, user_id) -> Notification:
+        title, message = template_registry.render("lesson_reminder", {
+            "lesson_title": reminder.lesson_title or "Занятие",
+            "date_time": reminder.start_time.strftime("%d.%m.%Y в %H:%M")
+        })
+        return Notification(
+            user_id=user_id,
+            notification_type=NotificationType.LESSON_REMINDER,
+            title=title,
+            message=message,
+            data={"session_id": reminder.session_id},
+            lesson_id=reminder.lesson_id,
+            scheduled_at=reminder.remind_at
+        )
+
+    async def close(self):
+        if self._dispatcher:
+            self._dispatcher.cancel()
+        if self.connection:
+            await self.connection.close()
+
+
+# Глобальный экземпляр
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,156 @@
+from string import Template
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LESSON_DETAILS = (
+    "📖 <b>Урок:</b> $lesson_title\n"
+    "📅 <b>Дата и время:</b> $date_time\n"
+    "🌐 <b>Язык:</b> $language\n"
+    "📊 <b>Уровень:</b> $level"
+)
+
+GROUP_DETAILS = (
+    "📚 <b>Группа:</b> $group_name\n"
+    "🌐 <b>Язык:</b> $language\n"
+    "📊 <b>Уровень:</b> $level"
+)
+
+
+class MessageTemplate:
+    """
+    Скомпилированный шаблон уведомления (string.Template). Необязательные блоки подставляются
+    в $<имя>_block, только если параметр <имя> передан и не пустой; derive добавляет вычисляемые
+    параметры (например, форму слова)
+    """
+
+    def __init__(
+        self,
+        title: str,
+        message: str,
+        blocks: Optional[Dict[str, str]] = None,
+        derive: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    ):
+        self.title = Template(title)
+        self.message = Template(message)
+        self.blocks = {name: Template(block) for name, block in (blocks or {}).items()}
+        self.derive = derive
+
+    def render(self, params: Dict[str, Any]) -> Tuple[str, str]:
+        values = dict(params)
+        if self.derive:
+            values.update(self.derive(values))
+        for name, block in self.blocks.items():
+            values[f"{name}_block"] = block.substitute(values) if values.get(name) else ""
+        return self.title.substitute(values), self.message.substitute(values)
+
+
+class TemplateRegistry:
+    """
+    Реестр шаблонов по (имя шаблона, локаль). Имя шаблона — notification_type, для вариантов
+    одного типа (отмена записи преподавателем/студентом) — "<notification_type>.<вариант>".
+    Если для локали шаблона нет, используется DEFAULT_LOCALE
+    """
+
+    def __init__(self, default_locale: str):
+        self.default_locale = default_locale
+        self._templates: Dict[Tuple[str, str], MessageTemplate] = {}
+
+    def register(self, name: str, template: MessageTemplate, locale: Optional[str] = None) -> None:
+        self._templates[(name, locale or self.default_locale)] = template
+
+    def get(self, name: str, locale: Optional[str] = None) -> Optional[MessageTemplate]:
+        return (
+            self._templates.get((name, locale or self.default_locale))
+            or self._templates.get((name, self.default_locale))
+        )
+
+    def render(self, name: str, params: Dict[str, Any], locale: Optional[str] = None) -> Tuple[str, str]:
+        """Возвращает (title, message); KeyError — нет шаблона или не хватает параметра"""
+        template = self.get(name, locale)
+        if not template:
+            raise KeyError(f"Unknown notification template: {name}")
+        return template.render(params)
+
+
+# Глобальный экземпляр
+template_registry = TemplateRegistry(default_locale=settings.DEFAULT_LOCALE)
+
+template_registry.register("lesson_reminder", MessageTemplate(
+    title="⏰ Напоминание о занятии",
+    message="Скоро занятие «$lesson_title»\n\n📅 <b>Дата и время:</b> $date_time"
+))
+
+template_registry.register("lesson_booking", MessageTemplate(
+    title="📚 Новая запись на занятие",
+    message=(
+        "К вам записался студент на занятие!\n\n"
+        "👤 <b>Студент:</b> $student_name\n"
+        f"{LESSON_DETAILS}\n\n"
+        "Вы можете просмотреть более детальную информацию в календаре"
+    )
+))
+
+template_registry.register("lesson_cancellation.by_student", MessageTemplate(
+    title="❌ Отмена записи на занятие",
+    message=f"Студент отменил запись на занятие.\n\n👤 <b>Студент:</b> $student_name\n{LESSON_DETAILS}"
+))
+
+template_registry.register("lesson_cancellation.to_teacher", MessageTemplate(
+    title="❌ Отмена записи на занятие",
+    message=f"Запись на занятие была отменена.\n\n👤 <b>Студент:</b> $student_name\n{LESSON_DETAILS}"
+))
+
+template_registry.register("lesson_cancellation.by_teacher", MessageTemplate(
+    title="❌ Запись отменена",
+    message=f"Ваша запись на занятие была отменена преподавателем.\n\n{LESSON_DETAILS}"
+))
+
+template_registry.register("lesson_cancellation.to_student", MessageTemplate(
+    title="❌ Запись отменена",
+    message=f"Ваша запись на занятие была отменена.\n\n{LESSON_DETAILS}"
+))
+
+template_registry.register("role_switch", MessageTemplate(
+    title="🎓 Приглашение стать преподавателем",
+    message=(
+        "Здравствуйте, $full_name!\n\n"
+        "Ваша ссылка для того, чтобы стать преподавателем в нашей студии иностранных языков:\n"
+        "$switch_url\n\n"
+        "Ссылка действительна для 1 перехода на страницу.\n"
+        "Срок действия: $expires_in_hours $hours_word"
+    ),
+    derive=lambda p: {"hours_word": "час" if int(p["expires_in_hours"]) == 1 else "часов"}
+))
+
+template_registry.register("group_member_removed", MessageTemplate(
+    title="❌ Вас удалили из группы",
+    message=f"Здравствуйте, $student_name!\n\nВас удалили из группы:\n{GROUP_DETAILS}"
+))
+
+template_registry.register("group_invitation", MessageTemplate(
+    title="📩 Приглашение в группу",
+    message=(
+        "Здравствуйте, $student_name!\n\n"
+        "Вас приглашают присоединиться к группе:\n"
+        f"{GROUP_DETAILS}\n"
+        "$invitation_message_block"
+        "\n🔗 <b>Ссылка для присоединения:</b>\n$invite_url"
+    ),
+    blocks={"invitation_message": "\n💬 <b>Сообщение:</b>\n$invitation_message\n"}
+))
+
+template_registry.register("group_invitation_accepted", MessageTemplate(
+    title="✅ Вы присоединились к группе",
+    message=(
+        "Поздравляем, $student_name!\n\n"
+        "Вы успешно присоединились к группе:\n"
+        f"{GROUP_DETAILS}\n"
+        "👥 <b>Участников:</b> $current_students/$max_students"
+        "$invitation_message_block"
+    ),
+    blocks={"invitation_message": "\n💬 <b>Сообщение от преподавателя:</b>\n$invitation_message"}
+))
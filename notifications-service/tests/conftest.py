@@ -0,0 +1,5 @@
+import os
+
+# app.config требует настройки подключения к БД; для тестов без базы хватает заглушек
+for name in ("POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB", "DB_HOST"):
+  os.environ.setdefault(name, "test")
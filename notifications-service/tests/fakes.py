@@ -0,0 +1,68 @@
+"""Подмены сессии БД, CRUD и сообщения RabbitMQ для тестов потребителей без базы и брокера"""
+import json
+import uuid
+from contextlib import asynccontextmanager
+
+
+class FakeSettings:
+    """Строка user_notification_settings"""
+
+    def __init__(self, user_id: str, telegram_enabled: bool, quiet_hours_start=None, quiet_hours_end=None, tz="UTC", chat_id=None):
+        self.user_id = uuid.UUID(user_id)
+        self.telegram_enabled = telegram_enabled
+        self.chat_id = chat_id
+        self.digest_enabled = False
+        self.digest_window_minutes = None
+        self.quiet_hours_start = quiet_hours_start
+        self.quiet_hours_end = quiet_hours_end
+        self.timezone = tz
+        self.timezone_synced_at = None
+
+
+class FakeCRUD:
+    def __init__(self, db):
+        self.db = db
+
+    async def get_user_settings(self, user_id):
+        self.db.lookups.append(("user", user_id))
+        return self.db.by_user.get(user_id)
+
+    async def get_settings_by_chat_id(self, chat_id):
+        self.db.lookups.append(("chat", chat_id))
+        return self.db.by_chat.get(chat_id)
+
+
+class FakeDB:
+    """Подменяет AsyncSessionLocal: одна и та же сессия, настройки — в словарях by_user / by_chat"""
+
+    def __init__(self):
+        self.by_user = {}
+        self.by_chat = {}
+        self.lookups = []
+        self.added = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        pass
+
+
+class FakeMessage:
+    def __init__(self, data: dict):
+        self.body = json.dumps(data).encode()
+        self.processed = False
+
+    @asynccontextmanager
+    async def process(self, requeue: bool = False):
+        yield
+        self.processed = True
@@ -0,0 +1,37 @@
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud import NotificationCRUD
+
+
+class FakeScalars:
+    def all(self):
+        return []
+
+
+class FakeResult:
+    def scalars(self):
+        return FakeScalars()
+
+
+class CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return FakeResult()
+
+
+def test_due_digest_items_are_claimed_per_recipient():
+    db = CapturingSession()
+
+    asyncio.run(NotificationCRUD(db).claim_due_digest_items(50))
+
+    sql = " ".join(str(db.statements[0].compile(dialect=postgresql.asyncpg.dialect())).split())
+    outer, subquery = sql.split("IN (", 1)
+    # LIMIT — на получателей во вложенном запросе, все их события берутся целиком
+    assert "GROUP BY digest_items.user_id ORDER BY min(digest_items.flush_at) LIMIT $" in subquery
+    assert "LIMIT" not in outer
+    assert sql.endswith("ORDER BY digest_items.user_id, digest_items.id FOR UPDATE SKIP LOCKED")
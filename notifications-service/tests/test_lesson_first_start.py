@@ -0,0 +1,30 @@
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud import NotificationCRUD
+
+
+class FakeResult:
+    def scalar(self):
+        return None
+
+
+class CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return FakeResult()
+
+
+def test_lesson_first_start_skips_past_sessions():
+    db = CapturingSession()
+
+    assert asyncio.run(NotificationCRUD(db).get_lesson_first_start(7)) is None
+
+    sql = " ".join(str(db.statements[0].compile(dialect=postgresql.asyncpg.dialect())).split())
+    # Уже прошедшие (в том числе с отправленным напоминанием) сессии не считаются первой
+    assert "scheduled_reminders.start_time >= now()" in sql
+    assert "scheduled_reminders.status != $" in sql
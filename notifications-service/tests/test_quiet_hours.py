@@ -0,0 +1,112 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core import templated_consumer as templated_consumer_module
+from app.core.rabbitmq import DEFERRED_PAYLOAD_KEY, rabbitmq_client
+from app.core.templated_consumer import TemplatedNotificationsConsumer
+from app.models import NotificationType
+from app.services import digest as digest_module
+from app.services.digest import DigestAggregator
+from tests.fakes import FakeCRUD, FakeDB, FakeMessage, FakeSettings
+
+
+def _quiet_now() -> dict:
+    """Тихие часы, в которые попадает текущий момент (UTC)"""
+    now = datetime.now(timezone.utc)
+    return {
+        "quiet_hours_start": (now - timedelta(hours=1)).strftime("%H:%M"),
+        "quiet_hours_end": (now + timedelta(hours=1)).strftime("%H:%M"),
+    }
+
+
+def _capture_published(monkeypatch) -> list:
+    published = []
+
+    async def fake_publish(data, routing_key):
+        published.append((routing_key, data))
+        return True
+
+    monkeypatch.setattr(rabbitmq_client, "publish_notification", fake_publish)
+    return published
+
+
+def _role_switch(user_id: str) -> dict:
+    return {
+        "notification_type": "role_switch",
+        "params": {"full_name": "Анна", "switch_url": "https://t.me/x", "expires_in_hours": 1},
+        "user_id": user_id,
+        "chat_id": 42,
+        "reply_markup": {"inline_keyboard": []},
+    }
+
+
+def test_templated_notification_is_deferred_in_quiet_hours(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(templated_consumer_module, "AsyncSessionLocal", db)
+    monkeypatch.setattr(templated_consumer_module, "NotificationCRUD", FakeCRUD)
+    published = _capture_published(monkeypatch)
+    user_id = str(uuid.uuid4())
+    db.by_user[user_id] = FakeSettings(user_id, True, **_quiet_now())
+    message = FakeMessage(_role_switch(user_id))
+
+    asyncio.run(TemplatedNotificationsConsumer()._on_message(message))
+
+    assert published == [] and message.processed
+    [notification] = db.added
+    assert notification.deliver_after > datetime.now(timezone.utc)
+    assert notification.notification_type == NotificationType.SYSTEM_MESSAGE
+    assert notification.title == "🎓 Приглашение стать преподавателем"
+    # Исходное сообщение хранится целиком — после тихих часов бот получит и reply_markup
+    assert notification.data[DEFERRED_PAYLOAD_KEY]["reply_markup"] == {"inline_keyboard": []}
+
+
+def test_templated_notification_outside_quiet_hours_is_published(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(templated_consumer_module, "AsyncSessionLocal", db)
+    monkeypatch.setattr(templated_consumer_module, "NotificationCRUD", FakeCRUD)
+    published = _capture_published(monkeypatch)
+    user_id = str(uuid.uuid4())
+    db.by_user[user_id] = FakeSettings(user_id, True)
+
+    asyncio.run(TemplatedNotificationsConsumer()._on_message(FakeMessage(_role_switch(user_id))))
+
+    assert db.added == []
+    assert [(key, data["title"]) for key, data in published] == [("telegram", "🎓 Приглашение стать преподавателем")]
+
+
+def test_deferred_payload_is_published_with_all_fields(monkeypatch):
+    published = _capture_published(monkeypatch)
+    user_id = str(uuid.uuid4())
+    data = {"user_id": user_id, "chat_id": 42, "title": "t", "message": "m", "notification_type": "lesson_booking", "lesson_id": 7}
+    notification = digest_module.quiet_hours.deferred_notification(user_id, data, datetime.now(timezone.utc))
+    notification.id = 5
+
+    asyncio.run(rabbitmq_client.publish_telegram_notification(notification, 43))
+
+    [(routing_key, sent)] = published
+    assert routing_key == "telegram"
+    # Тип и поля издателя сохраняются, notification_id и актуальный chat_id — из отложенной записи
+    assert {k: sent[k] for k in ("notification_id", "chat_id", "notification_type", "lesson_id")} == {
+        "notification_id": 5, "chat_id": 43, "notification_type": "lesson_booking", "lesson_id": 7,
+    }
+
+
+def test_digest_deliver_without_digest_respects_quiet_hours(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(digest_module, "AsyncSessionLocal", db)
+    monkeypatch.setattr(digest_module, "NotificationCRUD", FakeCRUD)
+    published = _capture_published(monkeypatch)
+    quiet_user, awake_user = str(uuid.uuid4()), str(uuid.uuid4())
+    db.by_user[quiet_user] = FakeSettings(quiet_user, True, **_quiet_now())
+    db.by_user[awake_user] = FakeSettings(awake_user, True)
+
+    async def scenario():
+        aggregator = DigestAggregator()
+        for user_id in (quiet_user, awake_user):
+            await aggregator.deliver({"user_id": user_id, "chat_id": 42, "title": "t", "message": "m", "notification_type": "lesson_booking"})
+
+    asyncio.run(scenario())
+
+    assert [str(n.user_id) for n in db.added] == [quiet_user]
+    assert [data["user_id"] for _, data in published] == [awake_user]
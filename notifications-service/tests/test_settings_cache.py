@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+
+from app.core import settings_cache as settings_cache_module
+from app.core import templated_consumer as templated_consumer_module
+from app.core.settings_cache import NotificationSettingsCache, RecipientSettings, chat_key, user_key
+from app.core.templated_consumer import TemplatedNotificationsConsumer
+from tests.fakes import FakeCRUD, FakeDB, FakeMessage, FakeSettings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_ttl_and_hit_rate(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(settings_cache_module, "time", clock)
+    cache = NotificationSettingsCache(ttl=60, max_size=10)
+
+    assert cache.get(user_key("u1")) is None
+    cache.set(user_key("u1"), RecipientSettings("u1", False))
+    assert cache.get(user_key("u1")) == RecipientSettings("u1", False)
+
+    clock.now += 61
+    assert cache.get(user_key("u1")) is None
+    assert cache.stats() == {"size": 0, "ttl": 60, "hits": 1, "misses": 2, "invalidations": 0, "hit_rate": 0.3333}
+
+
+def test_size_is_bounded():
+    cache = NotificationSettingsCache(ttl=60, max_size=2)
+
+    for i in range(3):
+        cache.set(chat_key(i), RecipientSettings(None, True))
+
+    # Вытесняется самая старая запись
+    assert cache.get(chat_key(0)) is None
+    assert cache.get(chat_key(1)) and cache.get(chat_key(2))
+
+
+def test_invalidate_drops_user_and_owned_chat_entries():
+    cache = NotificationSettingsCache(ttl=60, max_size=10)
+    cache.set(user_key("u1"), RecipientSettings("u1", True))
+    cache.set(chat_key(100), RecipientSettings("u1", True))
+    cache.set(chat_key(200), RecipientSettings(None, True))
+    cache.set(chat_key(300), RecipientSettings("u2", True))
+
+    # Пользователь u1 сменил чат на 200: сбрасываются его записи и запись нового чата
+    cache.invalidate(user_id="u1", chat_id=200)
+
+    assert [cache.get(k) for k in (user_key("u1"), chat_key(100), chat_key(200), chat_key(300))] == [None, None, None, RecipientSettings("u2", True)]
+    assert cache.invalidations == 3
+
+
+def test_consumer_caches_lookups_until_settings_changed(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(templated_consumer_module, "AsyncSessionLocal", db)
+    monkeypatch.setattr(templated_consumer_module, "NotificationCRUD", FakeCRUD)
+    consumer = TemplatedNotificationsConsumer()
+    user_id = str(uuid.uuid4())
+    db.by_user[user_id] = db.by_chat[42] = FakeSettings(user_id, True)
+
+    async def scenario():
+        results = [(await consumer._recipient({"user_id": user_id})).telegram_enabled for _ in range(3)]
+        results += [(await consumer._recipient({"chat_id": 42})).telegram_enabled for _ in range(3)]
+        # Пользователь отключил уведомления — событие сбрасывает и запись по его чату
+        db.by_user[user_id] = db.by_chat[42] = FakeSettings(user_id, False)
+        await consumer._on_settings_changed(FakeMessage({"user_id": user_id, "chat_id": 42}))
+        results += [(await consumer._recipient(data)).telegram_enabled for data in ({"user_id": user_id}, {"chat_id": 42})]
+        return results
+
+    assert asyncio.run(scenario()) == [True] * 6 + [False, False]
+    assert db.lookups == [("user", user_id), ("chat", 42), ("user", user_id), ("chat", 42)]
+    assert consumer.settings_cache.stats()["hits"] == 4
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import students, groups
+from app.database import pool_stats
 
 app = FastAPI(
   title="students-service",
@@ -28,3 +29,8 @@ async def root():
 @app.get("/health")
 async def health_check():
   return {"status": "healthy", "service": "students-service"}
+
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+  """Состояние пула соединений с базой"""
+  return pool_stats()
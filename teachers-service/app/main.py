@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app import models
 from app.config import settings
 from app.api import teachers, languages
-from app.database import get_db
+from app.database import get_db, pool_stats
 
 
 app = FastAPI(
@@ -29,6 +29,11 @@ async def root():
 async def health_check():
   return {"status": "healthy", "service": "teachers-service"}
 
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+  """Состояние пула соединений с базой"""
+  return pool_stats()
+
 # Подключаем роутеры
 app.include_router(teachers.router, prefix="/teachers", tags=["teachers"])
 app.include_router(languages.router, prefix="/languages", tags=["languages"])
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class TelegramRateLimiter:
+  """
+  Token bucket на общий поток сообщений + минимальный интервал между сообщениями в один чат.
+  Интервал чата не ожидается: потребитель по chat_wait/reserve_chat откладывает сообщение,
+  а воркер сразу берет следующее. Работает в одном event loop, поэтому проверка и списание
+  токена атомарны без блокировок
+  """
+
+  def __init__(self, global_rate: float, per_chat_rate: float, burst: Optional[float] = None):
+    self.global_rate = global_rate
+    self.capacity = burst or global_rate
+    self.per_chat_interval = 1.0 / per_chat_rate
+    self._tokens = self.capacity
+    self._updated_at = time.monotonic()
+    # Ближайшее время, когда в чат снова можно писать
+    self._chat_next: Dict[int, float] = {}
+
+  def _refill(self, now: float):
+    self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.global_rate)
+    self._updated_at = now
+
+  def _global_wait(self, now: float) -> float:
+    self._refill(now)
+    # Допуск на округление: иначе остаток вида 0.999999... дает ожидание, которое уже не меняет часы
+    return 0.0 if self._tokens >= 1 - 1e-9 else (1 - self._tokens) / self.global_rate
+
+  def chat_wait(self, chat_id: int) -> float:
+    """Сколько секунд осталось до момента, когда в чат снова можно писать (0 — можно сейчас)"""
+    return max(0.0, self._chat_next.get(chat_id, 0.0) - time.monotonic())
+
+  def reserve_chat(self, chat_id: int) -> float:
+    """
+    Занимает ближайший свободный слот чата и возвращает, через сколько секунд он наступит.
+    Следующее сообщение в чат получит слот не раньше чем через per_chat_interval после этого
+    """
+    now = time.monotonic()
+    slot = max(now, self._chat_next.get(chat_id, 0.0))
+    self._chat_next[chat_id] = slot + self.per_chat_interval
+    self._prune(now)
+    return slot - now
+
+  async def acquire(self):
+    """
+    Токен общего лимита бота. Ждать приходится доли секунды — это общий темп отправки,
+    ограничение по чату проверяется отдельно и в воркере не ждется
+    """
+    while True:
+      wait = self._global_wait(time.monotonic())
+      if wait <= 0:
+        self._tokens -= 1
+        return
+      await asyncio.sleep(wait)
+
+  def pause_chat(self, chat_id: int, seconds: float):
+    """Telegram ответил RetryAfter — не пишем в чат указанное время"""
+    now = time.monotonic()
+    self._chat_next[chat_id] = max(self._chat_next.get(chat_id, 0.0), now + seconds)
+
+  def _prune(self, now: float):
+    # Чаты, в которые давно не писали, больше не ограничены — убираем их из словаря
+    if len(self._chat_next) > 10000:
+      self._chat_next = {k: v for k, v in self._chat_next.items() if v > now}
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import time
+from collections import defaultdict
+
+import pytest
+
+from src.bot.services import rate_limiter as rate_limiter_module
+from src.bot.services.rate_limiter import TelegramRateLimiter
+
+
+class FakeClock:
+  """Подменяет time.monotonic и asyncio.sleep в модуле лимитера: sleep двигает часы"""
+
+  def __init__(self):
+    self.now = 1000.0
+    self.sleeps = []
+
+  def monotonic(self) -> float:
+    return self.now
+
+  async def sleep(self, seconds: float):
+    self.sleeps.append(seconds)
+    self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+  fake = FakeClock()
+  monkeypatch.setattr(rate_limiter_module, "time", fake)
+  monkeypatch.setattr(rate_limiter_module, "asyncio", fake)
+  return fake
+
+
+def _acquire(limiter: TelegramRateLimiter, count: int):
+  async def scenario():
+    for _ in range(count):
+      await limiter.acquire()
+  asyncio.run(scenario())
+
+
+def test_burst_is_sent_without_waiting(clock):
+  limiter = TelegramRateLimiter(global_rate=30, per_chat_rate=1)
+
+  _acquire(limiter, 30)
+
+  assert clock.sleeps == []
+
+
+def test_global_rate_after_burst(clock):
+  limiter = TelegramRateLimiter(global_rate=30, per_chat_rate=1)
+
+  _acquire(limiter, 90)
+
+  # После 30 токенов запаса — не быстрее 30 сообщений в секунду
+  assert clock.now - 1000.0 == pytest.approx(60 / 30)
+
+
+def test_tokens_refill_over_time(clock):
+  limiter = TelegramRateLimiter(global_rate=10, per_chat_rate=1, burst=5)
+  _acquire(limiter, 5)
+
+  clock.now += 0.3
+  _acquire(limiter, 3)
+  assert clock.sleeps == []
+
+  # Больше capacity не накапливается
+  clock.now += 100
+  _acquire(limiter, 5)
+  assert clock.sleeps == []
+  _acquire(limiter, 1)
+  assert clock.sleeps == [pytest.approx(0.1)]
+
+
+def test_chat_messages_are_serialized(clock):
+  limiter = TelegramRateLimiter(global_rate=30, per_chat_rate=2)
+
+  assert limiter.chat_wait(1) == 0
+  # Слоты одного чата идут через 1 / per_chat_rate, другие чаты не затрагиваются
+  assert [limiter.reserve_chat(1) for _ in range(3)] == [0, 0.5, 1.0]
+  assert limiter.reserve_chat(2) == 0
+  assert limiter.chat_wait(1) == pytest.approx(1.5)
+
+  clock.now += 1.5
+  assert limiter.chat_wait(1) == 0
+  assert limiter.reserve_chat(1) == 0
+
+
+def test_pause_chat_after_retry_after(clock):
+  limiter = TelegramRateLimiter(global_rate=30, per_chat_rate=1)
+  limiter.reserve_chat(1)
+
+  limiter.pause_chat(1, 10)
+
+  assert limiter.chat_wait(1) == pytest.approx(10)
+  # Более короткая пауза не сокращает уже назначенную
+  limiter.pause_chat(1, 2)
+  assert limiter.chat_wait(1) == pytest.approx(10)
+
+
+# -------- Потребитель с подменным Bot --------
+
+class FakeBot:
+  def __init__(self):
+    self.sent = defaultdict(list)
+
+  async def send_message(self, chat_id, text, parse_mode=None):
+    self.sent[chat_id].append(time.monotonic())
+
+
+class FakeMessage:
+  def __init__(self, data: dict):
+    self.body = json.dumps(data).encode()
+    self.headers = {}
+    self.content_type = "application/json"
+    self.processed = False
+
+  async def ack(self):
+    self.processed = True
+
+  async def nack(self, requeue: bool = True):
+    self.processed = True
+
+
+def test_consumer_respects_global_and_per_chat_limits():
+  from src.bot.consumers.telegram_consumer import TelegramConsumer
+
+  bot = FakeBot()
+  consumer = TelegramConsumer(bot)
+  consumer.workers_count = 8
+  consumer.rate_limiter = TelegramRateLimiter(global_rate=100, per_chat_rate=20, burst=10)
+  # Паузы чата в тесте короткие — все ждут в боте, очередь задержки RabbitMQ не нужна
+  consumer.local_hold_max = 1000
+
+  chats, per_chat = 5, 8
+  messages = [FakeMessage({"chat_id": chat, "title": "t", "message": "m"}) for _ in range(per_chat) for chat in range(1, chats + 1)]
+
+  async def scenario():
+    consumer.start_workers()
+    started = time.monotonic()
+    for message in messages:
+      await consumer.process_message(message)
+    while not all(m.processed for m in messages):
+      await asyncio.sleep(0.01)
+    elapsed = time.monotonic() - started
+    for task in consumer.workers:
+      task.cancel()
+    return started, elapsed
+
+  started, elapsed = asyncio.run(scenario())
+
+  assert sum(len(times) for times in bot.sent.values()) == chats * per_chat
+  # Один чат — не чаще 20 сообщений в секунду (небольшой допуск на таймер event loop)
+  for times in bot.sent.values():
+    assert all(b - a >= 0.05 - 0.005 for a, b in zip(times, times[1:]))
+  # Общий поток: к моменту t от старта отправлено не больше burst + rate * t (+1 — допуск на таймер)
+  all_times = sorted(t - started for times in bot.sent.values() for t in times)
+  assert all(sent <= 10 + 100 * t + 1 for sent, t in enumerate(all_times, start=1))
+  # Узкое место — интервал чата: (per_chat - 1) * 0.05 с, без лишнего простоя
+  assert elapsed < (per_chat - 1) * 0.05 + 0.5